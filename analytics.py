@@ -0,0 +1,214 @@
+"""Per-attempt log of every judged question and accuracy / buzz-point reports over it.
+
+Each attempt is one fixed-size 32-byte record appended to attempts.log: when, which question,
+seconds from the start of the reveal to the answer, how many characters had been revealed
+and out of how many, the year, a category code, whether the answer was right, and which
+clue of how many was being read (0 in records from before clues were logged). Category
+codes index (difficulty, primary subject) pairs listed one per line in attempts.labels, so a
+report never needs the question bank and questions deleted since still count.
+
+Reports read the whole log as columns and aggregate with NumPy when it is installed, which
+stays well under a second for millions of attempts; without it they fall back to struct.
+Nothing here imports Tk.
+"""
+import json
+import math
+import os
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional; reports are just slower without it
+    np = None
+
+RECORD = struct.Struct("<dQfHHHHBBBx")  # time, question, latency, position, length, year, category, correct, clue, clues
+assert RECORD.size == 32
+FIELDS = ("time", "question", "latency", "position", "length", "year", "category", "correct", "clue", "clues")
+GROUPINGS = ("subject", "difficulty", "year")
+SHORT_MAX = 0xFFFF
+BYTE_MAX = 0xFF
+
+
+def question_key(question_id: str) -> int:
+    """A question ID as 64 bits: the hex IDs Question.make_id produces fit exactly."""
+    try:
+        return int(question_id, 16) & 0xFFFFFFFFFFFFFFFF
+    except ValueError:
+        return int.from_bytes(question_id.encode("utf-8")[:8].ljust(8, b"\0"), "little")
+
+
+class AttemptLog:
+    """Append-only binary log of attempts; opened lazily, flushed after every record."""
+
+    def __init__(self, path: str = "attempts.log"):
+        self.path = path
+        self.labels_path = os.path.splitext(path)[0] + ".labels"
+        self.labels: List[Tuple[str, str]] = []
+        self.codes: Dict[Tuple[str, str], int] = {}
+        if os.path.exists(self.labels_path):
+            with open(self.labels_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        difficulty, subject = json.loads(line)
+                    except ValueError:
+                        break  # A torn final write
+                    self.codes[(difficulty, subject)] = len(self.labels)
+                    self.labels.append((difficulty, subject))
+        self.file = None
+
+    def category(self, difficulty: str, subject: str) -> int:
+        code = self.codes.get((difficulty, subject))
+        if code is None:
+            # The label goes to disk before any record that uses its code
+            with open(self.labels_path, "a", encoding="utf-8") as file:
+                file.write(json.dumps([difficulty, subject]) + "\n")
+            code = self.codes[(difficulty, subject)] = len(self.labels)
+            self.labels.append((difficulty, subject))
+        return code
+
+    def record(self, question, correct: bool, latency: float = math.nan, position: int = 0, now: Optional[float] = None):
+        """Append one attempt; latency is NaN when the answer wasn't timed (a mark without a submit)."""
+        now = time.time() if now is None else now
+        subject = question.subjects[0] if question.subjects else ""
+        length = min(len(question.text), SHORT_MAX)
+        plan = question.reveal_plan
+        record = RECORD.pack(now, question_key(question.id), latency, min(position, length), length,
+                             min(max(question.year, 0), SHORT_MAX), self.category(question.difficulty, subject), int(correct),
+                             min(plan.clue_at(position), BYTE_MAX), min(plan.clue_count, BYTE_MAX))
+        if self.file is None:
+            self.file = open(self.path, "ab")
+            # A record torn by a crash would shift every later one; drop it before appending
+            torn = self.file.tell() % RECORD.size
+            if torn:
+                self.file.truncate(self.file.tell() - torn)
+                self.file.seek(0, os.SEEK_END)
+        self.file.write(record)
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class GroupStats:
+    """One row of a report."""
+
+    __slots__ = ("label", "attempts", "correct", "buzz_point", "latency", "clue")
+
+    def __init__(self, label: str, attempts: int, correct: int, buzz_point: float, latency: float, clue: float = math.nan):
+        self.label = label
+        self.attempts = attempts
+        self.correct = correct
+        self.buzz_point = buzz_point  # Mean fraction of the question revealed at timed correct answers
+        self.latency = latency  # Mean seconds from the start of the reveal to a timed answer
+        self.clue = clue  # Mean clue number, counting from 1, at timed correct answers that logged one
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.attempts if self.attempts else 0.0
+
+
+def read_columns(path: str):
+    """The log as a NumPy structured array, or a dict of lists without NumPy."""
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    count = size // RECORD.size
+    if np is not None:
+        dtype = np.dtype({"names": FIELDS, "formats": ["<f8", "<u8", "<f4", "<u2", "<u2", "<u2", "<u2", "u1", "u1", "u1"],
+                          "offsets": [0, 8, 16, 20, 22, 24, 26, 28, 29, 30], "itemsize": RECORD.size})
+        return np.fromfile(path, dtype=dtype, count=count) if count else np.zeros(0, dtype)
+    with open(path, "rb") as file:
+        data = file.read(count * RECORD.size) if count else b""
+    return dict(zip(FIELDS, map(list, zip(*RECORD.iter_unpack(data))))) if count else {field: [] for field in FIELDS}
+
+
+def group_labels(labels: List[Tuple[str, str]], by: str, codes: int) -> List[str]:
+    """Name of each of the first codes category codes under a grouping (year groups don't use codes)."""
+    names = [difficulty if by == "difficulty" else subject or "(no subject)" for difficulty, subject in labels]
+    return names + ["(unknown)"] * (codes - len(names))  # Only if attempts.labels was lost
+
+
+def summarize(log: AttemptLog, by: str = "subject") -> List[GroupStats]:
+    """Attempts, accuracy, mean buzz point, clue and latency per subject, difficulty or year."""
+    if by not in GROUPINGS:
+        raise ValueError(f"can't group by {by!r}")
+    columns = read_columns(log.path)
+    if np is None:
+        codes = max(columns["category"], default=-1) + 1
+        return _summarize_lists(columns, group_labels(log.labels, by, codes), by)
+    if not len(columns):
+        return []
+
+    if by == "year":
+        keys = columns["year"].astype(np.intp)
+        labels = None
+    else:
+        # Collapse category codes onto their subject or difficulty, then aggregate per name
+        names = group_labels(log.labels, by, int(columns["category"].max()) + 1)
+        labels, name_codes = np.unique(np.array(names, dtype=object), return_inverse=True)
+        keys = name_codes.reshape(-1)[columns["category"]]
+    # Keys are small integers, so every sum is one bincount pass with no sorting
+    correct = columns["correct"].astype(bool)
+    attempts = np.bincount(keys)
+    size = len(attempts)
+    right = np.bincount(keys, weights=correct, minlength=size)
+    latency = columns["latency"].astype(np.float64)
+    timed = ~np.isnan(latency)
+    latency_sum = np.bincount(keys[timed], weights=latency[timed], minlength=size)
+    timed_count = np.bincount(keys[timed], minlength=size)
+    # An untimed mark says nothing about when the player knew the answer
+    buzzed = correct & timed
+    fraction = columns["position"] / np.maximum(columns["length"], 1)
+    buzz = np.bincount(keys[buzzed], weights=fraction[buzzed], minlength=size)
+    buzzed_count = np.bincount(keys[buzzed], minlength=size)
+    clued = buzzed & (columns["clue"] > 0)
+    clue_sum = np.bincount(keys[clued], weights=columns["clue"][clued], minlength=size)
+    clued_count = np.bincount(keys[clued], minlength=size)
+
+    rows = []
+    for key in np.flatnonzero(attempts):
+        buzzed_total, timed_total, clued_total = int(buzzed_count[key]), int(timed_count[key]), int(clued_count[key])
+        rows.append(GroupStats(str(key) if labels is None else labels[key], int(attempts[key]), int(right[key]),
+                               float(buzz[key]) / buzzed_total if buzzed_total else math.nan,
+                               float(latency_sum[key]) / timed_total if timed_total else math.nan,
+                               float(clue_sum[key]) / clued_total if clued_total else math.nan))
+    return sorted(rows, key=lambda row: row.label)
+
+
+def _summarize_lists(columns: Dict[str, list], names: List[str], by: str) -> List[GroupStats]:
+    totals: Dict[str, list] = {}  # label -> [attempts, correct, buzz sum, latency sum, timed, clue sum, clued, buzzed]
+    for category, year, correct, position, length, latency, clue in zip(columns["category"], columns["year"], columns["correct"],
+                                                                         columns["position"], columns["length"], columns["latency"], columns["clue"]):
+        label = str(year) if by == "year" else names[category]
+        total = totals.get(label)
+        if total is None:
+            total = totals[label] = [0, 0, 0.0, 0.0, 0, 0, 0, 0]
+        total[0] += 1
+        if correct:
+            total[1] += 1
+        if not math.isnan(latency):
+            total[3] += latency
+            total[4] += 1
+            if correct:
+                total[2] += position / max(length, 1)
+                total[7] += 1
+                if clue:
+                    total[5] += clue
+                    total[6] += 1
+    return [GroupStats(label, attempts, right, buzz / buzzed if buzzed else math.nan, seconds / timed if timed else math.nan,
+                       clues / clued if clued else math.nan)
+            for label, (attempts, right, buzz, seconds, timed, clues, clued, buzzed) in sorted(totals.items())]
+
+
+def format_report(rows: List[GroupStats], by: str) -> str:
+    lines = [f"{by.capitalize():<24}{'Attempts':>10}{'Accuracy':>10}{'Buzz point':>12}{'Clue':>6}{'Latency':>10}"]
+    for row in rows:
+        buzz = "-" if math.isnan(row.buzz_point) else f"{row.buzz_point:.0%}"
+        clue = "-" if math.isnan(row.clue) else f"{row.clue:.1f}"
+        latency = "-" if math.isnan(row.latency) else f"{row.latency:.1f} s"
+        lines.append(f"{row.label[:23]:<24}{row.attempts:>10}{row.accuracy:>10.0%}{buzz:>12}{clue:>6}{latency:>10}")
+    total = sum(row.attempts for row in rows)
+    lines.append(f"{total} attempts" if rows else "No attempts recorded yet.")
+    return "\n".join(lines)
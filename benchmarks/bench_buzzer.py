@@ -0,0 +1,84 @@
+"""Measure buzzer broadcast latency and buzz arbitration with many players over loopback.
+
+Starts a BuzzerServer on a free port, connects simulated players to it, reveals a question
+a chunk at a time the way ContentView does, and reports how long each reveal takes to reach
+every player. Then every player buzzes in turn a few milliseconds apart, and the buzz
+the server accepts must be the first one sent.
+
+Run from the repository root:  python benchmarks/bench_buzzer.py [players] [chunks]
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from buzzer import BuzzerServer  # noqa: E402
+from quiz_engine import Question  # noqa: E402
+
+QUESTION = Question("This physicist's uncertainty principle limits how precisely position and momentum can be known. " * 3,
+                    "Werner Heisenberg [accept Heisenberg]", ["Science"], "State", 2024)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def connect(port: int, name: str):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write((json.dumps({"type": "join", "name": name}) + "\n").encode())
+    while json.loads(await reader.readline())["type"] != "welcome":
+        pass
+    return reader, writer
+
+
+async def receive(reader, kind: str, count: int, arrivals: list):
+    """Record the arrival time of the next count messages of the given kind."""
+    while count:
+        message = json.loads(await reader.readline())
+        if message["type"] == kind:
+            arrivals.append((time.perf_counter(), message))
+            count -= 1
+
+
+async def run(players: int, chunks: int):
+    server = BuzzerServer("127.0.0.1", 0)
+    port = server.start()
+    clients = [await connect(port, f"Player {number}") for number in range(players)]
+    await asyncio.sleep(0.1)
+    print(f"{players} players connected")
+
+    server.start_question(QUESTION, 1)
+    arrivals = [[] for _ in clients]
+    listeners = [asyncio.ensure_future(receive(reader, "reveal", chunks, got)) for (reader, _), got in zip(clients, arrivals)]
+    sent = []
+    for _ in range(chunks):
+        sent.append(time.perf_counter())
+        server.reveal("x")
+        await asyncio.sleep(0.005)  # 200 chunks per second, four times the default reading speed
+    await asyncio.gather(*listeners)
+    latencies = [(arrived - sent[index]) * 1000 for got in arrivals for index, (arrived, _) in enumerate(got)]
+    print(f"reveal broadcast latency over {len(latencies)} deliveries: "
+          f"p50 {percentile(latencies, 0.5):.2f} ms  p99 {percentile(latencies, 0.99):.2f} ms  max {max(latencies):.2f} ms")
+
+    buzzes = [[] for _ in clients]
+    listeners = [asyncio.ensure_future(receive(reader, "buzz", 1, got)) for (reader, _), got in zip(clients, buzzes)]
+    for _, writer in reversed(clients):  # The last player buzzes first
+        writer.write(b'{"type": "buzz"}\n')
+        await writer.drain()
+        await asyncio.sleep(0.002)
+    await asyncio.gather(*listeners)
+    winner = buzzes[0][0][1]["player"]
+    print(f"first buzz sent by Player {players - 1}, accepted: {winner} "
+          f"({'OK' if winner == f'Player {players - 1}' else 'WRONG'})")
+
+    for _, writer in clients:
+        writer.close()
+    server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 50, int(sys.argv[2]) if len(sys.argv) > 2 else 200))
@@ -0,0 +1,53 @@
+"""Measure bytes per Question for the compact layout against the original plain class.
+
+Question text itself is the same in both layouts, so the difference is object overhead,
+the subjects container and duplicated difficulty/subject strings.
+
+Run from the repository root:  python benchmarks/bench_memory.py [count]
+"""
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz_engine import Question  # noqa: E402
+
+
+class PlainQuestion:
+    """The original Question layout: a per-instance __dict__ and a subjects list."""
+
+    def __init__(self, text, answer, subjects, difficulty, year):
+        self.text = text
+        self.answer = answer
+        self.subjects = subjects
+        self.difficulty = difficulty
+        self.year = year
+
+
+def sample_json(count: int) -> str:
+    with open("questions.json", "r", encoding="utf-8") as file:
+        seed = json.load(file)
+    return json.dumps([dict(seed[i % len(seed)], text=f"{seed[i % len(seed)]['text']} #{i}") for i in range(count)])
+
+
+def bytes_per_question(cls, encoded: str, count: int) -> float:
+    """Memory retained by a bank decoded from JSON, just like load_questions builds it."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    questions = [cls(r["text"], r["answer"], r["subjects"], r["difficulty"], r["year"]) for r in json.loads(encoded)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del questions
+    return (after - before) / count
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    encoded = sample_json(count)
+    plain = bytes_per_question(PlainQuestion, encoded, count)
+    compact = bytes_per_question(Question, encoded, count)
+    print(f"{count} questions")
+    print(f"  plain class: {plain:8.1f} bytes/question")
+    print(f"  __slots__:   {compact:8.1f} bytes/question ({(1 - compact / plain) * 100:.0f}% smaller)")
@@ -0,0 +1,61 @@
+"""Measure per-tick cost of the question reveal: full re-insert versus appending new text.
+
+Needs a display (Tk). Run from the repository root:  python benchmarks/bench_reveal.py [repeat]
+"""
+import json
+import statistics
+import sys
+import time
+import tkinter as tk
+
+
+def full_rewrite_tick(widget: tk.Text, text: str, index: int):
+    """The old reveal: rebuild the string and replace the whole widget contents every tick."""
+    widget.config(state=tk.NORMAL)
+    widget.delete(1.0, tk.END)
+    widget.insert(tk.END, text[:index + 1])
+    widget.config(state=tk.DISABLED)
+
+
+def append_tick(widget: tk.Text, text: str, index: int):
+    """The new reveal: insert only the newly due character at the end."""
+    widget.config(state=tk.NORMAL)
+    widget.insert(tk.END, text[index])
+    widget.config(state=tk.DISABLED)
+
+
+def frame_costs(root: tk.Tk, widget: tk.Text, tick, text: str):
+    """Per-tick cost in microseconds, including the redraw Tk does before the next tick."""
+    widget.config(state=tk.NORMAL)
+    widget.delete(1.0, tk.END)
+    widget.config(state=tk.DISABLED)
+    costs = []
+    for index in range(len(text)):
+        start = time.perf_counter()
+        tick(widget, text, index)
+        root.update_idletasks()
+        costs.append((time.perf_counter() - start) * 1e6)
+    return costs
+
+
+def report(name: str, costs):
+    costs = sorted(costs)
+    p99 = costs[int(len(costs) * 0.99) - 1]
+    print(f"  {name:14} mean {statistics.mean(costs):8.1f} us   p99 {p99:8.1f} us   max {costs[-1]:8.1f} us")
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    with open("questions.json", "r", encoding="utf-8") as file:
+        # Long questions make the quadratic behaviour of the old reveal obvious
+        text = " ".join(q["text"] for q in json.load(file)[:repeat])
+
+    root = tk.Tk()
+    widget = tk.Text(root, height=10, width=80, wrap=tk.WORD, state=tk.DISABLED)
+    widget.pack()
+    root.update()
+
+    print(f"{len(text)} characters revealed one tick at a time")
+    report("full rewrite", frame_costs(root, widget, full_rewrite_tick, text))
+    report("append", frame_costs(root, widget, append_tick, text))
+    root.destroy()
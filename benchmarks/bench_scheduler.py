@@ -0,0 +1,98 @@
+"""Measure timer drift of fixed-delay after() chains against TkScheduler deadlines under load.
+
+Runs on a simulated event loop with a virtual clock, so it needs no display and is
+deterministic for a given seed. Each callback costs some work and the loop occasionally
+stalls, the way it does while Tk redraws or a dialog opens.
+
+Run from the repository root:  python benchmarks/bench_scheduler.py [ticks] [seed]
+"""
+import heapq
+import itertools
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import TkScheduler  # noqa: E402
+
+
+class SimulatedLoop:
+    """Just enough of the Tk after()/after_cancel() API, driven by a virtual clock."""
+
+    def __init__(self, seed: int, work=(0.0005, 0.004), stall_chance=0.02, stall=(0.02, 0.25)):
+        self.now = 0.0
+        self.random = random.Random(seed)
+        self.work = work
+        self.stall_chance = stall_chance
+        self.stall = stall
+        self.queue = []
+        self.ids = itertools.count()
+        self.cancelled = set()
+
+    def clock(self) -> float:
+        return self.now
+
+    def after(self, delay_ms: int, callback, *args) -> str:
+        after_id = f"after#{next(self.ids)}"
+        heapq.heappush(self.queue, (self.now + delay_ms / 1000, after_id, callback, args))
+        return after_id
+
+    def after_cancel(self, after_id: str):
+        self.cancelled.add(after_id)
+
+    def run(self):
+        while self.queue:
+            due, after_id, callback, args = heapq.heappop(self.queue)
+            if after_id in self.cancelled:
+                continue
+            self.now = max(self.now, due)
+            if self.random.random() < self.stall_chance:
+                self.now += self.random.uniform(*self.stall)  # The loop was busy elsewhere
+            callback(*args)
+            self.now += self.random.uniform(*self.work)  # The callback's own cost
+
+
+def fixed_delay_chain(loop: SimulatedLoop, ticks: int, interval: float):
+    """The old pattern: each tick re-arms after(interval), so lateness accumulates."""
+    fired = []
+
+    def tick():
+        fired.append(loop.now)
+        if len(fired) < ticks:
+            loop.after(int(interval * 1000), tick)
+
+    loop.after(int(interval * 1000), tick)
+    loop.run()
+    return fired
+
+
+def deadline_chain(loop: SimulatedLoop, ticks: int, interval: float):
+    """TkScheduler: each tick targets start + n * interval."""
+    scheduler = TkScheduler(loop, clock=loop.clock)
+    start = loop.clock()
+    fired = []
+
+    def tick():
+        fired.append(loop.now)
+        if len(fired) < ticks:
+            scheduler.call_at("tick", start + (len(fired) + 1) * interval, tick)
+
+    scheduler.call_at("tick", start + interval, tick)
+    loop.run()
+    return fired
+
+
+def report(name: str, fired, interval: float):
+    lateness = sorted(t - (n + 1) * interval for n, t in enumerate(fired))
+    print(f"  {name:12} final drift {(fired[-1] - len(fired) * interval) * 1000:9.1f} ms"
+          f"   median lateness {lateness[len(lateness) // 2] * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    interval = 0.05  # The default reading speed
+    print(f"{ticks} ticks every {interval * 1000:.0f} ms under simulated load (seed {seed})")
+    report("fixed delay", fixed_delay_chain(SimulatedLoop(seed), ticks, interval), interval)
+    report("deadlines", deadline_chain(SimulatedLoop(seed), ticks, interval), interval)
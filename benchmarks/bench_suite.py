@@ -0,0 +1,238 @@
+"""Headless benchmarks for the question bank hot paths: load, filter, list, reveal, delete and save.
+
+A synthetic bank from generate_bank.py is written to a temporary directory and driven through
+JsonQuestionStore and QuizEngine the way ContentView drives them, without Tk. Each phase
+reports throughput, latency percentiles and the peak memory it allocated. Results can be saved
+as JSON and a later run compared against them; any regression beyond the tolerance makes the
+run exit with status 1, so it can gate changes on a machine without a display.
+
+Run from the repository root:
+    python benchmarks/bench_suite.py [--sizes 1000 100000] [--save base.json] [--baseline base.json]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_bank import DIFFICULTIES, YEARS, write_bank  # noqa: E402
+from question_store import JsonQuestionStore  # noqa: E402
+from quiz_engine import QuizEngine, TextSearchIndex  # noqa: E402
+
+PAGE_SIZE = 200  # gui.MANAGE_PAGE_SIZE; gui imports Tk, so it isn't imported here
+DELETES = 1000
+REVEALS = 200
+
+
+class Phase:
+    """Timings of one benchmark phase: operations done, wall time and per-operation latencies."""
+
+    def __init__(self, name: str, unit: str):
+        self.name = name
+        self.unit = unit
+        self.count = 0
+        self.seconds = 0.0
+        self.latencies: List[float] = []
+        self.peak_bytes = None
+
+    def time(self, operation: Callable, *args, count: int = 1):
+        start = time.perf_counter()
+        result = operation(*args)
+        elapsed = time.perf_counter() - start
+        self.latencies.append(elapsed)
+        self.count += count
+        self.seconds += elapsed
+        return result
+
+    def percentile(self, fraction: float) -> float:
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+    def summary(self) -> Dict:
+        return {
+            "unit": self.unit,
+            "count": self.count,
+            "throughput": self.count / self.seconds if self.seconds else 0.0,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": max(self.latencies),
+            "peak_bytes": self.peak_bytes,
+        }
+
+
+def bench_load(store: JsonQuestionStore) -> Phase:
+    """Stream the bank in; latencies are the per-batch merges that run on the Tk thread."""
+    phase = Phase("load", "questions")
+    start = time.perf_counter()
+    loader = store.open_loader()
+    loader.start()
+    while not loader.done:
+        for batch in loader.drain():
+            phase.time(store.ingest, batch, count=len(batch))
+        time.sleep(0.001)
+    store.finish_loading()
+    phase.seconds = time.perf_counter() - start  # Throughput over wall time, parsing included
+    store.search_builder.join()  # The list phase should hit the index, not the fallback scan
+    return phase
+
+
+def bench_filter(engine: QuizEngine, subjects: List[str], rounds: int = 3) -> Phase:
+    phase = Phase("filter", "filters")
+    for _ in range(rounds):
+        for year in YEARS:
+            for difficulty in DIFFICULTIES:
+                for selected in [set()] + [{subject} for subject in subjects]:
+                    engine.selected_year = year
+                    engine.selected_difficulty = difficulty
+                    engine.selected_subjects = selected
+                    phase.time(engine.filter_questions)
+    return phase
+
+
+def bench_list(store: JsonQuestionStore, rng: random.Random) -> Phase:
+    """What update_question_dropdown does: search, then take the first page of rows."""
+    phase = Phase("list", "queries")
+    queries = [""]
+    for question in rng.sample(list(store.index), min(100, len(store))):
+        words = TextSearchIndex.tokenize(question.text)
+        queries.append(rng.choice(words)[:4])  # A word still being typed
+        queries.append(" ".join(rng.sample(words, min(2, len(words)))))
+    for query in queries:
+        phase.time(lambda: store.search(query)[:PAGE_SIZE])
+    return phase
+
+
+def bench_reveal(engine: QuizEngine, rng: random.Random) -> Phase:
+    """Every tick of update_reading_text for a sample of questions, on a virtual clock."""
+    phase = Phase("reveal", "ticks")
+    engine.filtered_questions = rng.sample(list(engine.store.index), min(REVEALS, len(engine.store)))
+    for position in range(len(engine.filtered_questions)):
+        engine.question_index = position
+        engine.start_reveal(0.0)
+        while not engine.reveal_finished:
+            phase.time(engine.reveal_due, engine.next_reveal_time())
+    engine.filtered_questions = []
+    return phase
+
+
+def bench_delete(store: JsonQuestionStore, engine: QuizEngine, rng: random.Random) -> Phase:
+    """Journaled deletes, each also dropped from the current filter like drop_filtered_question."""
+    phase = Phase("delete", "deletes")
+    engine.filter_questions()
+    question_ids = [question.id for question in rng.sample(list(store.index), min(DELETES, len(store) // 2))]
+    for question_id in question_ids:
+        phase.time(lambda: (store.delete(question_id), engine.drop_question(question_id)))
+    if store.journal.compactor is not None:
+        store.journal.compactor.join()
+    return phase
+
+
+def bench_save(store: JsonQuestionStore, rounds: int = 3) -> Phase:
+    """A full compaction into a fresh snapshot, waiting for the background writer."""
+    phase = Phase("save", "questions")
+    for _ in range(rounds):
+        phase.time(lambda: (store.save(), store.journal.compactor.join()), count=len(store))
+    return phase
+
+
+def run_suite(bank_path: str, seed: int, trace_memory: bool) -> List[Phase]:
+    """Run every phase against the bank in order; with trace_memory, record each phase's peak."""
+    rng = random.Random(seed)
+    store = JsonQuestionStore(bank_path, bank_path + ".journal")
+    engine = QuizEngine(store)
+    steps = [
+        lambda: bench_load(store),
+        lambda: bench_filter(engine, sorted({s for q in store.index for s in q.subjects})),
+        lambda: bench_list(store, rng),
+        lambda: bench_reveal(engine, rng),
+        lambda: bench_delete(store, engine, rng),
+        lambda: bench_save(store),
+    ]
+    phases = []
+    for step in steps:
+        if trace_memory:
+            tracemalloc.start()
+            start = tracemalloc.get_traced_memory()[0]
+        phase = step()
+        if trace_memory:
+            phase.peak_bytes = tracemalloc.get_traced_memory()[1] - start
+            tracemalloc.stop()
+        phases.append(phase)
+    store.journal.file.close()
+    return phases
+
+
+def benchmark(size: int, seed: int, memory: bool) -> Dict[str, Dict]:
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "bank.json")
+        write_bank(source, size, seed)
+        passes = [False, True] if memory else [False]
+        results: Dict[str, Dict] = {}
+        # Tracing allocations slows the timed code down several times, so memory gets its own pass
+        for trace_memory in passes:
+            bank_path = os.path.join(directory, f"questions-{trace_memory:d}.json")
+            shutil.copyfile(source, bank_path)
+            for phase in run_suite(bank_path, seed, trace_memory):
+                if trace_memory:
+                    results[phase.name]["peak_bytes"] = phase.peak_bytes
+                else:
+                    results[phase.name] = phase.summary()
+    return results
+
+
+def report(size: int, results: Dict[str, Dict]):
+    print(f"{size} questions")
+    for name, result in results.items():
+        memory = f"{result['peak_bytes'] / 2 ** 20:8.1f} MB" if result["peak_bytes"] is not None else "       -"
+        print(f"  {name:7} {result['throughput']:12.0f} {result['unit']}/s"
+              f"   p50 {result['p50'] * 1e3:9.3f} ms   p95 {result['p95'] * 1e3:9.3f} ms"
+              f"   p99 {result['p99'] * 1e3:9.3f} ms   peak {memory}")
+
+
+def regressions(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """Phases whose throughput dropped or p95 latency grew by more than tolerance."""
+    found = []
+    for size, phases in results.items():
+        for name, result in phases.items():
+            before = baseline.get(size, {}).get(name)
+            if before is None:
+                continue
+            if result["throughput"] < before["throughput"] * (1 - tolerance):
+                found.append(f"{size} {name}: throughput {before['throughput']:.0f} -> {result['throughput']:.0f} {result['unit']}/s")
+            if result["p95"] > before["p95"] * (1 + tolerance):
+                found.append(f"{size} {name}: p95 {before['p95'] * 1e3:.3f} -> {result['p95'] * 1e3:.3f} ms")
+    return found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark load, filter, list, reveal, delete and save")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-memory", action="store_true", help="skip the slower pass that traces peak memory")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved earlier and exit 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before it counts as a regression")
+    args = parser.parse_args()
+
+    all_results = {}
+    for size in args.sizes:
+        all_results[str(size)] = benchmark(size, args.seed, not args.no_memory)
+        report(size, all_results[str(size)])
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(all_results, file, indent=4)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            found = regressions(all_results, json.load(file), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if found else 0)
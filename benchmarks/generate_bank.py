@@ -0,0 +1,61 @@
+"""Generate a synthetic question bank shaped like questions.json.
+
+Words, text lengths and answers are sampled from the real questions.json, so tokenizing,
+parsing and matching costs are realistic. Output is deterministic for a given seed.
+
+Run from the repository root:  python benchmarks/generate_bank.py 100000 bank.json [--seed 1]
+"""
+import argparse
+import json
+import random
+from typing import Dict, Iterator, List
+
+DIFFICULTIES = ["District", "Regional", "State"]
+YEARS = list(range(2017, 2025))
+
+
+def load_seed(path: str = "questions.json") -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def generate_questions(count: int, seed: int = 1, sample: List[Dict] = None) -> Iterator[Dict]:
+    """Yield count question dicts with text lengths, words and subjects drawn from the sample."""
+    sample = sample or load_seed()
+    rng = random.Random(seed)
+    words = [word for q in sample for word in q["text"].split()]
+    lengths = [len(q["text"].split()) for q in sample]
+    answer_words = [word for q in sample for word in q["answer"].split()]
+    subjects = sorted({subject for q in sample for subject in q["subjects"]})
+    for number in range(count):
+        length = max(10, int(rng.choice(lengths) * rng.uniform(0.8, 1.2)))
+        text = " ".join(rng.choice(words) for _ in range(length))
+        yield {
+            # The number keeps every text unique, like a real bank
+            "text": f"{text} ({number})?",
+            "answer": " ".join(rng.choice(answer_words) for _ in range(rng.randint(1, 4))),
+            "subjects": [rng.choice(subjects)],
+            "difficulty": rng.choice(DIFFICULTIES),
+            "year": rng.choice(YEARS),
+        }
+
+
+def write_bank(path: str, count: int, seed: int = 1):
+    """Write a bank in the same layout JsonQuestionStore.save produces, one record at a time."""
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[\n")
+        for number, question in enumerate(generate_questions(count, seed)):
+            if number:
+                file.write(",\n")
+            file.write(json.dumps(question, indent=4, ensure_ascii=False))
+        file.write("\n]\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic question bank")
+    parser.add_argument("count", type=int)
+    parser.add_argument("path")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    write_bank(args.path, args.count, args.seed)
+    print(f"Wrote {args.count} questions to {args.path}")
@@ -0,0 +1,314 @@
+"""Local multi-player buzzer: the reader's app drives the reveal and players buzz in over TCP.
+
+The protocol is JSON Lines, one object per line in each direction. Players send
+{"type": "join", "name": ...}, then {"type": "buzz"} and {"type": "answer", "text": ...}.
+The server sends "welcome", "question", "reveal", "buzz", "judged", "answer" and "scores".
+
+BuzzerServer runs an asyncio loop on its own thread. The Tk side calls its public methods,
+which hand the work to that loop, and polls events() for buzzes and judgements. Buzzes are
+stamped with time.monotonic() the moment their bytes arrive, and the first one wins.
+Nothing here imports Tk. Run this file to join a game from a terminal.
+"""
+import argparse
+import asyncio
+import json
+import queue
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+DEFAULT_PORT = 8765
+ANSWER_SECONDS = 7.0  # A player who buzzes and then says nothing is judged wrong after this
+MAX_LINE = 4096  # Longest message a player may send
+MAX_BACKLOG = 256 * 1024  # Unsent bytes after which a stalled player is dropped, not buffered forever
+
+
+class Player:
+    __slots__ = ("name", "score")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.score = 0
+
+
+class PlayerConnection(asyncio.Protocol):
+    """One player's socket: splits incoming bytes into JSON lines, stamped on arrival."""
+
+    def __init__(self, server: "BuzzerServer"):
+        self.server = server
+        self.transport: Optional[asyncio.Transport] = None
+        self.buffer = b""
+
+    def connection_made(self, transport: asyncio.Transport):
+        self.transport = transport
+        self.server.connections.add(self)
+
+    def connection_lost(self, exc):
+        self.server.drop(self)
+
+    def data_received(self, data: bytes):
+        stamp = time.monotonic()  # Before any parsing, so a player's own message size costs nothing
+        self.buffer += data
+        *lines, self.buffer = self.buffer.split(b"\n")
+        if len(self.buffer) > MAX_LINE:
+            self.transport.close()
+            return
+        for line in lines:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(message, dict):
+                self.server.handle(self, message, stamp)
+
+    def send(self, data: bytes):
+        if self.transport.is_closing():
+            return  # Gone, but connection_lost hasn't run yet
+        if self.transport.get_write_buffer_size() > MAX_BACKLOG:
+            self.transport.close()
+        else:
+            self.transport.write(data)
+
+
+class BuzzerServer:
+    """Buzz-in arbitration and judging for the question on the reader's screen.
+
+    A player who answers wrong is locked out for the rest of that question; the others may
+    still buzz. Correct answers score a point. Only the loop thread touches the game state.
+    """
+
+    def __init__(self, host: str = "0.0.0.0", port: int = DEFAULT_PORT, answer_seconds: float = ANSWER_SECONDS):
+        self.host = host
+        self.port = port
+        self.answer_seconds = answer_seconds
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.connections: Set[PlayerConnection] = set()
+        self.players: Dict[PlayerConnection, Player] = {}
+        self.queue: "queue.Queue[Tuple]" = queue.Queue()  # ("buzz", name) and ("judged", name, correct) for the UI
+
+        self.question = None
+        self.header: Dict = {}
+        self.revealed = 0  # Characters of the question sent so far
+        self.started = 0.0  # Monotonic time the question started
+        self.open = False  # Whether buzzing is allowed
+        self.buzzed: Optional[PlayerConnection] = None
+        self.locked_out: Set[PlayerConnection] = set()
+        self.answer_timer: Optional[asyncio.TimerHandle] = None
+
+    # Called from the UI thread
+
+    def start(self) -> int:
+        """Start listening; returns the port, which is useful when asked for port 0. Raises OSError."""
+        self.thread.start()
+        future = asyncio.run_coroutine_threadsafe(self.loop.create_server(lambda: PlayerConnection(self), self.host, self.port), self.loop)
+        try:
+            self.server = future.result()
+        except OSError:
+            self.close()
+            raise
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    def close(self):
+        async def shutdown():
+            self.server.close()
+            for connection in list(self.connections):
+                connection.transport.close()
+            await self.server.wait_closed()
+
+        if self.server is not None:
+            asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    def start_question(self, question, number: int = 0):
+        self.loop.call_soon_threadsafe(self._start_question, question, number)
+
+    def reveal(self, chunk: str):
+        if chunk:
+            self.loop.call_soon_threadsafe(self._reveal, chunk)
+
+    def show_answer(self):
+        self.loop.call_soon_threadsafe(self._show_answer)
+
+    def events(self) -> List[Tuple]:
+        drained = []
+        while True:
+            try:
+                drained.append(self.queue.get_nowait())
+            except queue.Empty:
+                return drained
+
+    @property
+    def player_count(self) -> int:
+        return len(self.players)
+
+    # Loop thread
+
+    def broadcast(self, message: Dict):
+        data = (json.dumps(message) + "\n").encode()  # Encoded once, however many players there are
+        for connection in list(self.players):
+            connection.send(data)
+
+    def handle(self, connection: PlayerConnection, message: Dict, stamp: float):
+        kind = message.get("type")
+        if kind == "join" and connection not in self.players:
+            self.join(connection, str(message.get("name") or "Player").strip()[:32] or "Player")
+        elif kind == "buzz":
+            self.buzz(connection, stamp)
+        elif kind == "answer" and connection is self.buzzed:
+            self.judge(connection, str(message.get("text", "")))
+
+    def join(self, connection: PlayerConnection, name: str):
+        taken = {player.name for player in self.players.values()}
+        unique, number = name, 2
+        while unique in taken:
+            unique, number = f"{name} {number}", number + 1
+        self.players[connection] = Player(unique)
+        connection.send((json.dumps({"type": "welcome", "name": unique}) + "\n").encode())
+        if self.question is not None:
+            # Catch a late joiner up on the question being read
+            connection.send((json.dumps(self.header) + "\n" + json.dumps({"type": "reveal", "text": self.question.text[:self.revealed]}) + "\n").encode())
+        self.broadcast_scores()
+
+    def drop(self, connection: PlayerConnection):
+        self.connections.discard(connection)
+        player = self.players.pop(connection, None)
+        if connection is self.buzzed:
+            self.judge(connection, "", player)  # Leaving mid-answer counts as a wrong answer
+        elif player is not None:
+            self.broadcast_scores()
+        self.locked_out.discard(connection)
+
+    def buzz(self, connection: PlayerConnection, stamp: float):
+        if not self.open or self.buzzed is not None or connection not in self.players or connection in self.locked_out:
+            return
+        self.buzzed = connection
+        name = self.players[connection].name
+        self.broadcast({"type": "buzz", "player": name, "position": self.revealed, "clue": self.question.reveal_plan.clue_at(self.revealed),
+                        "seconds": round(stamp - self.started, 3)})
+        self.queue.put(("buzz", name))
+        self.answer_timer = self.loop.call_later(self.answer_seconds, self.judge, connection, "")
+
+    def judge(self, connection: PlayerConnection, text: str, player: Optional[Player] = None):
+        if self.answer_timer is not None:
+            self.answer_timer.cancel()
+            self.answer_timer = None
+        self.buzzed = None
+        player = player or self.players[connection]
+        name = player.name
+        # AnswerKey.matches is what QuizEngine.check_answer judges with
+        correct = bool(text) and self.question.answer_key.matches(text)
+        if correct:
+            player.score += 1
+            self.open = False
+        else:
+            self.locked_out.add(connection)
+        self.broadcast({"type": "judged", "player": name, "correct": correct, "text": text})
+        if correct:
+            self.broadcast({"type": "answer", "text": self.question.answer})
+        self.broadcast_scores()
+        self.queue.put(("judged", name, correct))
+
+    def broadcast_scores(self):
+        self.broadcast({"type": "scores", "scores": {player.name: player.score for player in self.players.values()}})
+
+    def _start_question(self, question, number: int):
+        if self.answer_timer is not None:
+            self.answer_timer.cancel()
+            self.answer_timer = None
+        self.question = question
+        self.header = {"type": "question", "number": number, "subjects": question.subjects,
+                       "difficulty": question.difficulty, "year": question.year, "length": len(question.text),
+                       "clues": question.reveal_plan.clue_count}
+        self.revealed = 0
+        self.started = time.monotonic()
+        self.open = True
+        self.buzzed = None
+        self.locked_out = set()
+        self.broadcast(self.header)
+
+    def _reveal(self, chunk: str):
+        self.revealed += len(chunk)
+        self.broadcast({"type": "reveal", "text": chunk})
+
+    def _show_answer(self):
+        if self.question is None or not self.open:
+            return
+        if self.answer_timer is not None:
+            self.answer_timer.cancel()
+            self.answer_timer = None
+        self.open = False
+        self.buzzed = None
+        self.broadcast({"type": "answer", "text": self.question.answer})
+
+
+async def play(host: str, port: int, name: str):
+    """Terminal client: press Enter to buzz, or type an answer and press Enter to buzz and answer."""
+    reader, writer = await asyncio.open_connection(host, port)
+    me = name
+    holding = False
+
+    def send(message: Dict):
+        writer.write((json.dumps(message) + "\n").encode())
+
+    async def listen():
+        nonlocal me, holding
+        clues = 0
+        while True:
+            line = await reader.readline()
+            if not line:
+                print("\nDisconnected.")
+                return
+            message = json.loads(line)
+            kind = message["type"]
+            if kind == "welcome":
+                me = message["name"]
+                print(f"Joined as {me}. Press Enter to buzz; type your answer and press Enter to answer.")
+            elif kind == "question":
+                clues = message["clues"]
+                print(f"\n\nQuestion {message['number']} ({', '.join(message['subjects'])}, {message['difficulty']} {message['year']})")
+            elif kind == "reveal":
+                print(message["text"], end="", flush=True)
+            elif kind == "buzz":
+                holding = message["player"] == me
+                print(f"\n>> {'You' if holding else message['player']} buzzed on clue {message['clue']} of {clues} after {message['seconds']:.2f} s"
+                      f"{' - answer now' if holding else ''}")
+            elif kind == "judged":
+                holding = False
+                verdict = "correct" if message["correct"] else "incorrect"
+                print(f">> {message['player']}: {message['text'] or '(no answer)'} - {verdict}")
+            elif kind == "answer":
+                print(f"\nANSWER: {message['text']}")
+            elif kind == "scores":
+                print("\nScores: " + ", ".join(f"{player} {score}" for player, score in message["scores"].items()))
+
+    send({"type": "join", "name": name})
+    listener = asyncio.ensure_future(listen())
+    loop = asyncio.get_running_loop()
+    while not listener.done():
+        line = await loop.run_in_executor(None, sys.stdin.readline)
+        if not line:
+            break
+        text = line.strip()
+        if not holding:
+            send({"type": "buzz"})
+        if text or holding:
+            send({"type": "answer", "text": text})
+        await writer.drain()
+    writer.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Join a Quiz Parserinator buzzer game")
+    parser.add_argument("host", help="address of the computer running the quiz with --host-buzzer")
+    parser.add_argument("name", help="your name on the scoreboard")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(play(args.host, args.port, args.name))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,212 @@
+"""Near-duplicate detection over question text with MinHash signatures and LSH banding.
+
+Each question's normalized text is cut into overlapping word shingles and summarized by a
+fixed-size MinHash signature. Signatures are split into bands and every band is a bucket key,
+so texts with a high Jaccard similarity almost surely share a bucket while unrelated texts
+almost never do. Checking one question only compares it with its bucket mates, which keeps
+both a single check and a scan of the whole bank far from quadratic. Nothing here imports Tk.
+"""
+import array
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from quiz_engine import fold_text
+
+MASK64 = (1 << 64) - 1
+WORD = re.compile(r"\w+")
+MAX_BUCKET_COMPARISONS = 200  # Bucket mates compared per band; huge buckets are boilerplate, not duplicates
+
+
+def shingle_hashes(text: str) -> Iterable[int]:
+    """Hashes of every run of three consecutive folded words; a shorter text is one shingle."""
+    words = WORD.findall(fold_text(text))
+    if len(words) <= 3:
+        return [hash(tuple(words))] if words else []
+    # zip builds the word triples and map hashes them without a Python-level loop
+    return map(hash, zip(words, words[1:], words[2:]))
+
+
+class NearDuplicateIndex:
+    """LSH buckets of question-text MinHash signatures, keyed by question ID.
+
+    Signatures use one-permutation hashing: each shingle is hashed once and only lowers the
+    minimum of the slot its hash falls in, and empty slots borrow from the next filled one.
+    That costs one hash per shingle instead of one per shingle per slot. The fraction of
+    equal slots between two signatures estimates the Jaccard similarity of their shingles.
+    Python's string hash is used, so signatures are only comparable within one process.
+    """
+
+    def __init__(self, bands: int = 16, rows: int = 4, threshold: float = 0.6):
+        self.bands = bands
+        self.rows = rows
+        self.slots = bands * rows
+        self.threshold = threshold
+        self.signatures: Dict[str, array.array] = {}
+        self.buckets: Dict[Tuple[int, int], List[str]] = {}
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def __contains__(self, question_id: str):
+        return question_id in self.signatures
+
+    def signature(self, text: str) -> Optional[array.array]:
+        slots = self.slots
+        minimums = [MASK64] * slots
+        for value in shingle_hashes(text):
+            value &= MASK64
+            slot = value % slots
+            if value < minimums[slot]:
+                minimums[slot] = value
+        if min(minimums) == MASK64:
+            return None
+        # Densify: an empty slot takes the value of the next filled slot to its right, wrapping around
+        donor = next(value for value in minimums if value != MASK64)
+        for slot in range(slots - 1, -1, -1):
+            if minimums[slot] == MASK64:
+                minimums[slot] = donor
+            else:
+                donor = minimums[slot]
+        # The low bits chose the slot; keeping only the high 32 halves the memory per signature
+        return array.array("I", [value >> 32 for value in minimums])
+
+    def band_keys(self, signature: array.array) -> List[Tuple[int, int]]:
+        rows = self.rows
+        return [(band, hash(tuple(signature[band * rows:(band + 1) * rows]))) for band in range(self.bands)]
+
+    @staticmethod
+    def similarity(first: array.array, second: array.array) -> float:
+        return sum(a == b for a, b in zip(first, second)) / len(first)
+
+    def add(self, question_id: str, text: str):
+        signature = self.signature(text)
+        if signature is None or question_id in self.signatures:
+            return
+        self.signatures[question_id] = signature
+        for key in self.band_keys(signature):
+            self.buckets.setdefault(key, []).append(question_id)
+
+    def remove(self, question_id: str):
+        signature = self.signatures.pop(question_id, None)
+        if signature is None:
+            return
+        for key in self.band_keys(signature):
+            bucket = self.buckets[key]
+            bucket.remove(question_id)
+            if not bucket:
+                del self.buckets[key]
+
+    def _candidates(self, signature: array.array, exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        seen = set()
+        matches = []
+        for key in self.band_keys(signature):
+            for question_id in self.buckets.get(key, ())[:MAX_BUCKET_COMPARISONS]:
+                if question_id == exclude or question_id in seen:
+                    continue
+                seen.add(question_id)
+                score = self.similarity(signature, self.signatures[question_id])
+                if score >= self.threshold:
+                    matches.append((question_id, score))
+        return sorted(matches, key=lambda match: -match[1])
+
+    def similar(self, text: str) -> List[Tuple[str, float]]:
+        """(question ID, estimated similarity) of indexed questions close to text, closest first."""
+        signature = self.signature(text)
+        return self._candidates(signature) if signature is not None else []
+
+    def clusters(self) -> List[List[str]]:
+        """Groups of two or more indexed questions that are near duplicates of each other."""
+        parent: Dict[str, str] = {}
+
+        def root(question_id: str) -> str:
+            parent.setdefault(question_id, question_id)
+            while parent[question_id] != question_id:
+                parent[question_id] = parent[parent[question_id]]
+                question_id = parent[question_id]
+            return question_id
+
+        for question_id, signature in self.signatures.items():
+            for other_id, _ in self._candidates(signature, exclude=question_id):
+                first, second = root(question_id), root(other_id)
+                if first != second:
+                    parent[second] = first
+
+        groups: Dict[str, List[str]] = {}
+        for question_id in parent:
+            groups.setdefault(root(question_id), []).append(question_id)
+        return sorted((group for group in groups.values() if len(group) > 1), key=len, reverse=True)
+
+
+def build_index(entries: Iterable[Tuple[str, str]], threshold: float = 0.6) -> NearDuplicateIndex:
+    """Index (id, text) pairs, as returned by a store's entries()."""
+    index = NearDuplicateIndex(threshold=threshold)
+    for question_id, text in entries:
+        index.add(question_id, text)
+    return index
+
+
+def duplicate_report(store, threshold: float = 0.6, excerpt: int = 90) -> str:
+    """A printable list of near-duplicate clusters in the store's bank."""
+    start = time.perf_counter()
+    entries = store.entries()
+    texts = dict(entries)
+    index = build_index(entries, threshold)
+    clusters = index.clusters()
+    lines = [f"{len(clusters)} clusters of near-duplicate questions among {len(entries)} "
+             f"(similarity >= {threshold:.0%}, {time.perf_counter() - start:.2f} s)"]
+    for number, cluster in enumerate(clusters, 1):
+        lines.append(f"\nCluster {number} ({len(cluster)} questions)")
+        for question_id in cluster:
+            text = texts[question_id]
+            lines.append(f"  {question_id}  {text[:excerpt]}{'...' if len(text) > excerpt else ''}")
+    return "\n".join(lines)
+
+
+class DuplicateChecker:
+    """A NearDuplicateIndex built on a background thread from (id, text) entries.
+
+    The entries are read on that thread too, through a store's entries_reader(), so even
+    listing a large bank stays off the Tk thread. Edits made while it builds are queued and
+    replayed once it is ready, so callers can keep it in step with the bank from the Tk
+    thread without waiting for the build.
+    """
+
+    def __init__(self, read_entries: Callable[[], Iterable[Tuple[str, str]]], threshold: float = 0.6):
+        self.index = NearDuplicateIndex(threshold=threshold)
+        self.backlog: List[Tuple[str, str, str]] = []  # (op, question ID, text)
+        self.thread = threading.Thread(target=self._build, args=(read_entries,), daemon=True)
+        self.thread.start()
+
+    def _build(self, read_entries: Callable[[], Iterable[Tuple[str, str]]]):
+        for question_id, text in read_entries():
+            self.index.add(question_id, text)
+
+    def ready(self, wait: bool = False) -> Optional[NearDuplicateIndex]:
+        """The index once built (waiting for it with wait), with queued edits applied."""
+        if self.thread.is_alive():
+            if not wait:
+                return None
+            self.thread.join()
+        for op, question_id, text in self.backlog:
+            if op == "add":
+                self.index.add(question_id, text)
+            else:
+                self.index.remove(question_id)
+        self.backlog = []
+        return self.index
+
+    def add(self, question_id: str, text: str):
+        index = self.ready()
+        if index is None:
+            self.backlog.append(("add", question_id, text))
+        else:
+            index.add(question_id, text)
+
+    def remove(self, question_id: str):
+        index = self.ready()
+        if index is None:
+            self.backlog.append(("remove", question_id, ""))
+        else:
+            index.remove(question_id)
@@ -0,0 +1,920 @@
+"""Tkinter front-end: ContentView drives a QuizEngine and a question store from the Tk event loop."""
+import json
+import math
+import os
+import time
+import tkinter as tk
+from tkinter import filedialog, messagebox
+from typing import Optional
+
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+from analytics import GROUPINGS, AttemptLog, summarize
+from buzzer import BuzzerServer
+from duplicates import DuplicateChecker
+from packet_import import PacketParser
+from profiling import Profiler
+from question_store import open_question_store
+from quiz_engine import Question, QuizEngine
+from review import ReviewHistory
+from scheduler import TkScheduler
+
+LOADER_POLL_MS = 20  # How often the Tk loop picks up batches from the background loader
+MANAGE_PAGE_SIZE = 200  # Rows inserted into the Manage Questions list at a time
+SEARCH_DEBOUNCE_MS = 150  # Pause after the last keystroke before searching
+DEFAULT_DIFFICULTIES = ["District", "Regional", "State"]  # Offered when adding to an empty bank
+DEFAULT_SUBJECTS = ["Arts & Humanities", "Language Arts", "Mathematics", "Science", "Social Studies"]
+RANDOM_BALANCE = {"Any Mix": None, "Balance Subjects": "subject", "Balance Difficulty": "difficulty"}
+PROFILED_CALLBACKS = (
+    "update_reading_text", "update_timer", "filter_questions", "poll_loader",
+    "update_question_dropdown", "check_answer", "next_question", "delete_question",
+)
+
+
+class ContentView:
+    def __init__(self, root: ttk.Window, profiler: Optional[Profiler] = None, profile_summary_every: float = 0.0,
+                 buzzer: Optional[BuzzerServer] = None):
+        self.root = root
+        self.root.title("Quiz Parserinator")
+        self.root.geometry("1200x900")
+
+        # Initialize theme
+        self.current_theme = "cosmo"  # Default to light mode
+        self.root.style.theme_use(self.current_theme)
+
+        # Center the window
+        self.center_window()
+
+        # Every reveal, countdown and cooldown callback goes through one scheduler
+        self.scheduler = TkScheduler(self.root, profiler=profiler)
+
+        # Timing wrappers go on before any callback is handed to Tk; without a profiler nothing changes
+        self.profiler = profiler
+        self.profile_summary_every = profile_summary_every
+        if profiler is not None:
+            profiler.instrument(self, PROFILED_CALLBACKS)
+            if profile_summary_every > 0:
+                self.scheduler.call_later("profile", profile_summary_every, self.print_profile_summary)
+
+        self.user_answer = ""
+        self.show_answer = False
+        self.is_adding_question = False
+        self.timer_running = False
+        self.timer_seconds = 5  # Default timer duration
+        self.timer_deadline = 0.0  # Monotonic time at which the running countdown ends
+        self.timer_enabled = True  # Timer starts enabled
+        self.timer_label = None
+        self.reading_active = False  # Flag to control text display
+        self.next_question_cooldown = False  # Flag to prevent rapid next question clicks
+        self.loader = None  # Background question loader while questions.json is being read
+        self.load_failed = False  # The bank file couldn't be read to the end, so the bank is read-only
+        self.manage_tree = None  # Question list in the Manage Questions window, when open
+        self.packet_parser = None  # Background packet import, while one is parsing
+        self.duplicate_checker = None  # Near-duplicate index, built the first time Add New Question opens
+        self.buzzer = buzzer  # Server for players buzzing in over the network, when hosting a game
+        self.buzzer_label = None
+        self.buzz_paused = False  # The reveal or countdown is paused while a player answers
+        self.load_started = time.perf_counter()
+        self.first_question_reported = False
+
+        # Default keybind settings
+        self.keybinds = {
+            "submit_answer": "<Return>",  # Enter key to submit answer
+        }
+
+        # Load keybinds from file or use defaults
+        self.load_keybinds()
+
+        # Open the question bank; a JSON bank streams in batches once the UI is up
+        self.store = open_question_store()
+        if profiler is not None:
+            # Adds and deletes compact the bank through save(), so this times every save the app makes
+            profiler.instrument(self.store, ("save",))
+        # Filters, score and reveal progress live here; every judged answer goes into the review history and attempt log
+        self.engine = QuizEngine(self.store, ReviewHistory("history.jsonl"), AttemptLog("attempts.log"))
+        self.load_questions()
+
+        # Create a scrollable canvas
+        self.canvas = tk.Canvas(self.root)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Add a scrollbar
+        self.scrollbar_y = ttk.Scrollbar(self.root, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.scrollbar_x = ttk.Scrollbar(self.root, orient=tk.HORIZONTAL, command=self.canvas.xview)
+        self.scrollbar_x.pack(side=tk.BOTTOM, fill=tk.X)
+
+        # Configure the canvas
+        self.canvas.configure(yscrollcommand=self.scrollbar_y.set, xscrollcommand=self.scrollbar_x.set)
+        self.canvas.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+
+        # Create a frame inside the canvas
+        self.main_frame = ttk.Frame(self.canvas)
+        self.canvas.create_window((0, 0), window=self.main_frame, anchor="nw")
+
+        # Bind mouse wheel scrolling
+        self.root.bind_all("<MouseWheel>", self.on_mousewheel)
+        self.root.bind_all("<Button-4>", self.on_mousewheel)  # For Linux, scroll up
+        self.root.bind_all("<Button-5>", self.on_mousewheel)  # For Linux, scroll down
+        self.root.bind_all("<Shift-MouseWheel>", self.on_shift_mousewheel)  # Horizontal scrolling
+
+        self.setup_ui()
+        self.filter_questions()
+        self.start_reading()
+        if self.buzzer is not None:
+            self.scheduler.call_later("buzzer", LOADER_POLL_MS / 1000, self.poll_buzzer)
+
+    def print_profile_summary(self):
+        """Print the callback and lag timings so far, then again after the same interval."""
+        print(self.profiler.format_summary())
+        self.scheduler.call_later("profile", self.profile_summary_every, self.print_profile_summary)
+
+    def center_window(self):
+        """Center the window on the screen."""
+        self.root.update_idletasks()
+        width = self.root.winfo_width()
+        height = self.root.winfo_height()
+        screen_width = self.root.winfo_screenwidth()
+        screen_height = self.root.winfo_screenheight()
+        x = (screen_width // 2) - (width // 2)
+        y = (screen_height // 2) - (height // 2)
+        self.root.geometry(f"+{x}+{y}")
+
+    def on_mousewheel(self, event):
+        """Handle vertical mouse wheel scrolling."""
+        if event.num == 4 or event.delta > 0:
+            self.canvas.yview_scroll(-1, "units")  # Scroll up
+        elif event.num == 5 or event.delta < 0:
+            self.canvas.yview_scroll(1, "units")  # Scroll down
+
+    def on_shift_mousewheel(self, event):
+        """Handle horizontal mouse wheel scrolling."""
+        if event.num == 4 or event.delta > 0:
+            self.canvas.xview_scroll(-1, "units")  # Scroll left
+        elif event.num == 5 or event.delta < 0:
+            self.canvas.xview_scroll(1, "units")  # Scroll right
+
+    def setup_ui(self):
+        # Increase font sizes for better readability
+        title_font = ("Arial", 36, "bold")
+        label_font = ("Arial", 14)
+        button_font = ("Arial", 12)
+        entry_font = ("Arial", 12)
+
+        # Title Label
+        self.title_label = ttk.Label(self.main_frame, text="Quiz Parserinator", font=title_font, bootstyle="primary")
+        self.title_label.pack(pady=20)
+
+        # Theme Switcher (Light/Dark Mode)
+        self.theme_var = tk.StringVar(value="light")
+        self.theme_switcher = ttk.Checkbutton(
+            self.main_frame,
+            text="Dark Mode",
+            variable=self.theme_var,
+            bootstyle="round-toggle",
+            command=self.toggle_theme,
+        )
+        self.theme_switcher.pack(pady=10)
+
+        # Settings Dropdown Menu (Top of the program)
+        settings_frame = ttk.Frame(self.main_frame)
+        settings_frame.pack(pady=10, padx=10, fill=tk.X)
+
+        self.settings_var = tk.StringVar(value="Settings")
+        self.settings_menu = ttk.Combobox(settings_frame, textvariable=self.settings_var, values=["Keybind Settings", "Reading Speed", "Timer Settings", "Manage Questions", "Add New Question", "Import Packets", "Analytics"], state="readonly", font=label_font, width=20)
+        self.settings_menu.grid(row=0, column=0, padx=5, pady=5)
+        self.settings_menu.bind("<<ComboboxSelected>>", lambda e: self.handle_settings_selection())
+
+        # Filters Frame
+        filters_frame = ttk.LabelFrame(self.main_frame, text="Filters")
+        filters_frame.pack(pady=10, padx=10, fill=tk.X)
+
+        # Year Dropdown (Non-Editable); this and the next two list only what the bank has, see refresh_filter_menus
+        ttk.Label(filters_frame, text="Year:", font=label_font).grid(row=0, column=0, padx=5, pady=5)
+        self.year_var = tk.StringVar(value=str(self.engine.selected_year))
+        self.year_menu = ttk.Combobox(filters_frame, textvariable=self.year_var, font=entry_font, state="readonly")
+        self.year_menu.grid(row=0, column=1, padx=5, pady=5)
+        self.year_menu.bind("<<ComboboxSelected>>", lambda e: self.update_year())
+
+        # Difficulty Dropdown (Non-Editable)
+        ttk.Label(filters_frame, text="Difficulty:", font=label_font).grid(row=0, column=2, padx=5, pady=5)
+        self.difficulty_var = tk.StringVar(value=self.engine.selected_difficulty)
+        self.difficulty_menu = ttk.Combobox(filters_frame, textvariable=self.difficulty_var, font=entry_font, state="readonly")
+        self.difficulty_menu.grid(row=0, column=3, padx=5, pady=5)
+        self.difficulty_menu.bind("<<ComboboxSelected>>", lambda e: self.update_difficulty())
+
+        # Subjects Dropdown (Non-Editable)
+        ttk.Label(filters_frame, text="Subjects:", font=label_font).grid(row=0, column=4, padx=5, pady=5)
+        self.subjects_var = tk.StringVar(value="All")
+        self.subjects_menu = ttk.Combobox(filters_frame, textvariable=self.subjects_var, values=["All"], font=entry_font, state="readonly")
+        self.subjects_menu.grid(row=0, column=5, padx=5, pady=5)
+        self.subjects_menu.bind("<<ComboboxSelected>>", lambda e: self.update_subjects())
+
+        # Full-text search over question text and answers; while it has text it replaces the filters
+        ttk.Label(filters_frame, text="Search:", font=label_font).grid(row=1, column=0, padx=5, pady=5)
+        self.quiz_search_var = tk.StringVar()
+        self.quiz_search_entry = ttk.Entry(filters_frame, textvariable=self.quiz_search_var, font=entry_font)
+        self.quiz_search_entry.grid(row=1, column=1, columnspan=5, padx=5, pady=5, sticky=tk.EW)
+        self.quiz_search_var.trace_add("write", lambda *args: self.scheduler.call_later("quiz_search", SEARCH_DEBOUNCE_MS / 1000, self.update_search))
+        # Don't let Enter here fall through to the submit-answer binding on the root window
+        self.quiz_search_entry.bind("<Return>", lambda e: (self.update_search(), "break")[1])
+
+        # Reading Speed Slider
+        speed_frame = ttk.LabelFrame(self.main_frame, text="Reading Speed")
+        speed_frame.pack(pady=10, padx=10, fill=tk.X)
+
+        # Slider: Faster on the right, slower on the left
+        self.speed_slider = ttk.Scale(speed_frame, from_=0.1, to=0.01, orient=tk.HORIZONTAL, command=self.update_speed, length=400)
+        self.speed_slider.set(self.engine.reading_speed)
+        self.speed_slider.pack(pady=10)
+
+        self.reveal_mode_var = tk.StringVar(value=self.engine.reveal_mode)
+        self.reveal_mode_menu = ttk.Combobox(speed_frame, textvariable=self.reveal_mode_var, values=["Characters", "Words"], font=entry_font, state="readonly", width=12)
+        self.reveal_mode_menu.pack(pady=5)
+        self.reveal_mode_menu.bind("<<ComboboxSelected>>", lambda e: self.update_reveal_mode())
+
+        # Question Display (Non-Editable)
+        question_frame = ttk.LabelFrame(self.main_frame, text="Question")
+        question_frame.pack(pady=10, padx=10, fill=tk.X)
+
+        self.question_text = tk.Text(question_frame, height=10, width=80, wrap=tk.WORD, font=entry_font, state=tk.DISABLED)
+        self.question_text.pack(pady=10)
+
+        # Answer Input (Editable)
+        answer_frame = ttk.LabelFrame(self.main_frame, text="Your Answer")
+        answer_frame.pack(pady=10, padx=10, fill=tk.X)
+
+        self.answer_entry = ttk.Entry(answer_frame, width=80, font=entry_font)
+        self.answer_entry.pack(pady=10)
+        self.answer_entry.bind("<Return>", lambda e: self.check_answer())  # Bind Enter key to submit answer
+
+        # Timer Label
+        timer_frame = ttk.LabelFrame(self.main_frame, text="Timer")
+        timer_frame.pack(pady=10, padx=10, fill=tk.X)
+
+        self.timer_label = ttk.Label(timer_frame, text=f"Time Left: {self.timer_seconds}", font=label_font)
+        self.timer_label.pack(pady=10)
+
+        # Buzzer game status, when hosting one
+        if self.buzzer is not None:
+            buzzer_frame = ttk.LabelFrame(self.main_frame, text=f"Buzzer (port {self.buzzer.port})")
+            buzzer_frame.pack(pady=10, padx=10, fill=tk.X)
+            self.buzzer_label = ttk.Label(buzzer_frame, text="Waiting for players to join", font=label_font)
+            self.buzzer_label.pack(pady=10)
+
+        # Buttons Frame
+        buttons_frame = ttk.LabelFrame(self.main_frame, text="Actions")
+        buttons_frame.pack(pady=10, padx=10, fill=tk.X)
+
+        # Submit Button
+        self.submit_button = ttk.Button(buttons_frame, text="Submit", command=self.check_answer, bootstyle="success")
+        self.submit_button.grid(row=0, column=0, padx=5, pady=5)
+
+        # Next Question Button
+        self.next_button = ttk.Button(buttons_frame, text="Next Question", command=self.next_question, bootstyle="primary")
+        self.next_button.grid(row=0, column=1, padx=5, pady=5)
+
+        # Correct/Incorrect Buttons
+        self.correct_button = ttk.Button(buttons_frame, text="I was correct", command=lambda: self.mark_answer(True), bootstyle="success")
+        self.correct_button.grid(row=0, column=2, padx=5, pady=5)
+
+        self.incorrect_button = ttk.Button(buttons_frame, text="I was incorrect", command=lambda: self.mark_answer(False), bootstyle="danger")
+        self.incorrect_button.grid(row=0, column=3, padx=5, pady=5)
+
+        # Randomize Button
+        self.randomize_button = ttk.Button(buttons_frame, text="Randomize", command=self.randomize_questions, bootstyle="warning")
+        self.randomize_button.grid(row=0, column=4, padx=5, pady=5)
+
+        # How Randomize mixes the round: uniformly, or evenly across subjects or difficulties
+        self.balance_var = tk.StringVar(value="Any Mix")
+        self.balance_menu = ttk.Combobox(buttons_frame, textvariable=self.balance_var, values=list(RANDOM_BALANCE), state="readonly", width=18)
+        self.balance_menu.grid(row=1, column=4, padx=5, pady=5)
+
+        # Reset Button
+        self.reset_button = ttk.Button(buttons_frame, text="Reset", command=self.reset_quiz, bootstyle="secondary")
+        self.reset_button.grid(row=0, column=5, padx=5, pady=5)
+
+        # Spaced repetition: ask the question due soonest instead of going down the list
+        self.review_mode_var = tk.BooleanVar(value=self.engine.review_mode)
+        self.review_mode_switch = ttk.Checkbutton(buttons_frame, text="Spaced Repetition", variable=self.review_mode_var, command=self.toggle_review_mode, bootstyle="round-toggle")
+        self.review_mode_switch.grid(row=0, column=6, padx=5, pady=5)
+
+        # Score Display
+        score_frame = ttk.LabelFrame(self.main_frame, text="Score")
+        score_frame.pack(pady=10, padx=10, fill=tk.X)
+
+        self.score_label = ttk.Label(score_frame, text=self.score_text(), font=label_font)
+        self.score_label.pack(pady=10)
+
+        # Keybinds
+        self.setup_keybinds()
+
+    def toggle_theme(self):
+        """Toggle between light and dark mode."""
+        if self.theme_var.get() == "light":
+            self.current_theme = "cosmo"  # Light theme
+        else:
+            self.current_theme = "darkly"  # Dark theme
+
+        # Update the theme
+        self.root.style.theme_use(self.current_theme)
+
+        # Update the background color of the canvas and main frame
+        self.canvas.configure(bg=self.root.style.colors.bg)
+        self.main_frame.configure(bootstyle=self.current_theme)
+
+    def handle_settings_selection(self):
+        """Handle selection from the settings dropdown menu."""
+        selected = self.settings_var.get()
+        if selected == "Keybind Settings":
+            self.show_keybind_settings()
+        elif selected == "Reading Speed":
+            self.show_reading_speed_settings()
+        elif selected == "Timer Settings":
+            self.show_timer_settings()
+        elif selected == "Manage Questions":
+            self.show_manage_questions()
+        elif selected == "Add New Question":
+            self.add_question()
+        elif selected == "Import Packets":
+            self.import_packets()
+        elif selected == "Analytics":
+            self.show_analytics()
+
+    def show_keybind_settings(self):
+        """Display keybind settings."""
+        messagebox.showinfo("Keybind Settings", f"Current Keybind for Submit Answer: {self.keybinds['submit_answer']}")
+
+    def show_reading_speed_settings(self):
+        """Display reading speed settings."""
+        messagebox.showinfo("Reading Speed", f"Current Reading Speed: {self.engine.reading_speed}")
+
+    def show_timer_settings(self):
+        """Display timer settings."""
+        timer_window = ttk.Toplevel(self.root)
+        timer_window.title("Timer Settings")
+        timer_window.geometry("300x200")
+
+        # Enable/Disable Timer
+        ttk.Label(timer_window, text="Enable Timer:", font=("Arial", 12)).pack(pady=5)
+        self.timer_enabled_var = tk.BooleanVar(value=self.timer_enabled)
+        ttk.Checkbutton(timer_window, text="Enabled", variable=self.timer_enabled_var, command=self.update_timer_enabled).pack(pady=5)
+
+        # Set Timer Duration
+        ttk.Label(timer_window, text="Timer Duration (seconds):", font=("Arial", 12)).pack(pady=5)
+        self.timer_duration_var = tk.IntVar(value=self.timer_seconds)
+        ttk.Entry(timer_window, textvariable=self.timer_duration_var, font=("Arial", 12)).pack(pady=5)
+        ttk.Button(timer_window, text="Save", command=self.update_timer_duration, bootstyle="success").pack(pady=10)
+
+    def update_timer_enabled(self):
+        """Update timer enabled state."""
+        self.timer_enabled = self.timer_enabled_var.get()
+
+    def update_timer_duration(self):
+        """Update timer duration."""
+        self.timer_seconds = self.timer_duration_var.get()
+        messagebox.showinfo("Timer Settings", f"Timer duration updated to {self.timer_seconds} seconds.")
+
+    def show_manage_questions(self):
+        """Display manage questions options."""
+        manage_window = ttk.Toplevel(self.root)
+        manage_window.title("Manage Questions")
+        manage_window.geometry("700x500")
+
+        # Search box, re-queried shortly after the user stops typing
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(manage_window, textvariable=self.search_var, font=("Arial", 12))
+        search_entry.pack(pady=10, padx=10, fill=tk.X)
+        self.search_var.trace_add("write", lambda *args: self.schedule_question_search())
+
+        # Only the rows scrolled into view are inserted; more pages load as the list scrolls
+        list_frame = ttk.Frame(manage_window)
+        list_frame.pack(pady=5, padx=10, fill=tk.BOTH, expand=True)
+        self.manage_tree = ttk.Treeview(list_frame, columns=("text",), show="headings", selectmode="browse")
+        self.manage_tree.heading("text", text="Question")
+        manage_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.manage_tree.yview)
+        self.manage_tree.configure(yscrollcommand=lambda first, last: self.on_manage_scroll(manage_scrollbar, first, last))
+        self.manage_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        manage_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.update_question_dropdown()
+
+        ttk.Button(manage_window, text="Delete Selected Question", command=self.delete_question, bootstyle="danger").pack(pady=10)
+
+    def show_analytics(self):
+        """Accuracy, buzz point, buzz clue and answer time over every logged attempt, grouped as chosen."""
+        analytics_window = ttk.Toplevel(self.root)
+        analytics_window.title("Analytics")
+        analytics_window.geometry("700x400")
+
+        group_var = tk.StringVar(value=GROUPINGS[0])
+        group_menu = ttk.Combobox(analytics_window, textvariable=group_var, values=GROUPINGS, state="readonly")
+        group_menu.pack(pady=10)
+
+        columns = ("attempts", "accuracy", "buzz", "clue", "latency")
+        tree = ttk.Treeview(analytics_window, columns=columns, show="tree headings")
+        for column, heading in zip(("#0",) + columns, ("Group", "Attempts", "Accuracy", "Buzz point", "Clue", "Answer time")):
+            tree.heading(column, text=heading)
+        tree.pack(pady=5, padx=10, fill=tk.BOTH, expand=True)
+        total_label = ttk.Label(analytics_window)
+        total_label.pack(pady=5)
+
+        def refresh():
+            tree.delete(*tree.get_children())
+            rows = summarize(self.engine.attempts, group_var.get())
+            for row in rows:
+                buzz = "-" if math.isnan(row.buzz_point) else f"{row.buzz_point:.0%}"
+                clue = "-" if math.isnan(row.clue) else f"{row.clue:.1f}"
+                latency = "-" if math.isnan(row.latency) else f"{row.latency:.1f} s"
+                tree.insert("", tk.END, text=row.label, values=(row.attempts, f"{row.accuracy:.0%}", buzz, clue, latency))
+            total_label.config(text=f"{sum(row.attempts for row in rows)} attempts")
+
+        group_menu.bind("<<ComboboxSelected>>", lambda e: refresh())
+        refresh()
+
+    def setup_keybinds(self):
+        # Bind keys to actions
+        self.root.bind(self.keybinds["submit_answer"], lambda e: self.check_answer())
+
+    def load_keybinds(self):
+        if os.path.exists("keybinds.json"):
+            try:
+                with open("keybinds.json", "r", encoding="utf-8") as file:
+                    self.keybinds = json.load(file)
+            except json.JSONDecodeError:
+                messagebox.showerror("Error", "The keybinds file is corrupted or improperly formatted.")
+        else:
+            self.save_keybinds()  # Save default keybinds if file doesn't exist
+
+    def save_keybinds(self):
+        with open("keybinds.json", "w", encoding="utf-8") as file:
+            json.dump(self.keybinds, file, indent=4)
+
+    def load_questions(self):
+        """Start reading the question bank on a background thread."""
+        self.loader = self.store.open_loader()
+        if self.loader is None:
+            return
+        self.loader.start()
+        self.scheduler.call_later("loader", LOADER_POLL_MS / 1000, self.poll_loader)
+
+    def poll_loader(self):
+        """Merge batches parsed by the loader into the bank without blocking the UI."""
+        if self.loader is None:
+            return
+
+        batches = self.loader.drain()
+        for batch in batches:
+            self.store.ingest(batch)
+
+            if self.engine.filtered_questions:
+                # Keep the current question on screen, just make the new matches reachable
+                self.engine.merge_loaded(batch)
+            else:
+                self.filter_questions()
+        if batches:
+            self.refresh_filter_menus(adjust=False)  # New years and subjects show up as they load
+
+        if not self.loader.done:
+            self.scheduler.call_later("loader", LOADER_POLL_MS / 1000, self.poll_loader)
+            return
+
+        error = self.loader.error
+        self.loader = None
+        if error is not None:
+            # Only part of the bank loaded; an edit would compact it over the whole file, so the
+            # journal is never opened and the questions that did load can only be read
+            self.load_failed = True
+            print(f"Loading stopped after {len(self.store)} questions: {error}")
+            messagebox.showerror("Error", "The questions file is corrupted or improperly formatted. "
+                                          "The questions read before the error can be practiced, but not edited.")
+            return
+        self.store.finish_loading()
+        print(f"Loaded {len(self.store)} questions in {(time.perf_counter() - self.load_started) * 1000:.1f} ms")
+        if not self.engine.filtered_questions:
+            self.filter_questions()  # Replace the loading message
+
+    def bank_loading(self) -> bool:
+        """Warn and return True if questions are still loading or failed to load, so edits can't save a partial bank."""
+        if self.load_failed:
+            messagebox.showwarning("Read-only", "The questions file couldn't be read completely, so the bank can't be edited. "
+                                                "Fix or replace it and restart.")
+            return True
+        if self.loader is None:
+            return False
+        messagebox.showwarning("Loading", "Please wait until all questions have loaded.")
+        return True
+
+    def update_question_dropdown(self):
+        """Refresh the Manage Questions list for the current search, if the window is open."""
+        if self.manage_tree is None or not self.manage_tree.winfo_exists():
+            return
+        self.manage_rows = self.store.search(self.search_var.get())
+        self.manage_loaded = 0
+        self.manage_tree.delete(*self.manage_tree.get_children())
+        self.load_manage_page()
+
+    def load_manage_page(self):
+        """Insert the next page of rows into the question list."""
+        page = self.manage_rows[self.manage_loaded:self.manage_loaded + MANAGE_PAGE_SIZE]
+        for question_id, text in page:
+            self.manage_tree.insert("", tk.END, iid=question_id, values=(text,))
+        self.manage_loaded += len(page)
+
+    def on_manage_scroll(self, scrollbar, first: str, last: str):
+        scrollbar.set(first, last)
+        if float(last) > 0.9 and self.manage_loaded < len(self.manage_rows):
+            self.load_manage_page()
+
+    def schedule_question_search(self):
+        """Debounce typing so only the last keystroke in a burst runs a search."""
+        self.scheduler.call_later("search", SEARCH_DEBOUNCE_MS / 1000, self.update_question_dropdown)
+
+    def delete_question(self):
+        if self.bank_loading():
+            return
+        selection = self.manage_tree.selection()
+        if not selection:
+            messagebox.showwarning("No Selection", "Please select a question to delete.")
+            return
+
+        question = self.store.delete(selection[0])
+        if question is not None:
+            if self.duplicate_checker is not None:
+                self.duplicate_checker.remove(question.id)
+            self.drop_filtered_question(question.id)
+            self.refresh_filter_menus(adjust=False)
+            # Rows are keyed by question ID, so only this row has to go
+            self.manage_tree.delete(question.id)
+            messagebox.showinfo("Deleted", "Question deleted successfully.")
+
+    def drop_filtered_question(self, question_id: str):
+        """Remove a deleted question from the current filter without re-filtering the bank."""
+        if self.engine.drop_question(question_id):
+            # The question being read was deleted, move on to the one that took its place
+            self.stop_reading()
+            if not self.engine.filtered_questions:
+                self.filter_questions()
+                return
+            self.start_reading()
+
+    def update_score(self):
+        self.score_label.config(text=self.score_text())
+
+    def score_text(self) -> str:
+        history = self.engine.history
+        return f"Score: {self.engine.score}/{self.engine.total_questions}    All time: {history.correct}/{history.attempts}"
+
+    def toggle_review_mode(self):
+        self.engine.review_mode = self.review_mode_var.get()
+        self.filter_questions()
+
+    def refresh_filter_menus(self, adjust: bool = True):
+        """Offer only the years, difficulties and subjects the bank has questions for.
+
+        With adjust, a selection with no questions moves to one that has some (the newest
+        year, the first difficulty, all subjects), so an empty combination is never filtered.
+        """
+        facets = self.store.facets
+        engine = self.engine
+        years = facets.years()
+        if adjust and years:
+            if engine.selected_year not in years:
+                engine.selected_year = years[-1]
+            difficulties = facets.difficulties(engine.selected_year)
+            if engine.selected_difficulty not in difficulties:
+                engine.selected_difficulty = difficulties[0]
+            if not facets.count(engine.selected_year, engine.selected_difficulty, engine.selected_subjects):
+                engine.selected_subjects = set()
+        self.year_menu.config(values=[str(year) for year in years])
+        self.difficulty_menu.config(values=facets.difficulties(engine.selected_year))
+        self.subjects_menu.config(values=["All"] + facets.subjects(engine.selected_year, engine.selected_difficulty))
+        self.year_var.set(str(engine.selected_year))
+        self.difficulty_var.set(engine.selected_difficulty)
+        self.subjects_var.set(next(iter(engine.selected_subjects), "All"))
+
+    def update_year(self):
+        self.engine.selected_year = int(self.year_var.get())
+        self.filter_questions()
+
+    def update_difficulty(self):
+        self.engine.selected_difficulty = self.difficulty_var.get()
+        self.filter_questions()
+
+    def update_subjects(self):
+        selected = self.subjects_var.get()
+        if selected == "All":
+            self.engine.selected_subjects = set()
+        else:
+            self.engine.selected_subjects = {selected}
+        self.filter_questions()
+
+    def update_search(self):
+        self.scheduler.cancel("quiz_search")
+        query = self.quiz_search_var.get()
+        if query.strip() == self.engine.search_query.strip():
+            return
+        self.engine.search_query = query
+        self.filter_questions()
+
+    def update_speed(self, value):
+        self.engine.set_reading_speed(float(value), self.scheduler.clock())
+
+    def update_reveal_mode(self):
+        self.engine.reveal_mode = self.reveal_mode_var.get()
+
+    def filter_questions(self):
+        # Until the bank is loaded a selection may only look empty, so it is left alone
+        self.refresh_filter_menus(adjust=self.loader is None)
+        if not self.engine.filter_questions():
+            self.question_text.config(state=tk.NORMAL)
+            self.question_text.delete(1.0, tk.END)
+            if self.loader is not None:
+                self.question_text.insert(tk.END, "Loading questions...")
+            else:
+                self.question_text.insert(tk.END, "No questions match the search." if self.engine.search_query.strip() else "No questions match selected filters.")
+            self.question_text.config(state=tk.DISABLED)
+            return
+        self.start_reading()
+
+    def start_reading(self):
+        if not self.engine.filtered_questions:
+            return
+        self.stop_reading()  # Cancel whatever reveal or countdown the previous question left pending
+        self.buzz_paused = False
+        self.reading_active = True  # Enable text display
+        self.engine.start_reveal(self.scheduler.clock())
+        if self.buzzer is not None:
+            self.buzzer.start_question(self.engine.current_question, self.engine.total_questions + 1)
+        if not self.first_question_reported:
+            self.first_question_reported = True
+            print(f"First question ready in {(time.perf_counter() - self.load_started) * 1000:.1f} ms")
+
+        # Clear the previous question once; after this the reveal only appends
+        self.question_text.config(state=tk.NORMAL)
+        self.question_text.delete(1.0, tk.END)
+        self.question_text.config(state=tk.DISABLED)
+
+        # Start text display
+        self.update_reading_text()
+
+    def update_reading_text(self):
+        if not self.reading_active:
+            # Stop text display if reading is no longer active
+            return
+        if self.engine.reveal_finished:
+            self.start_timer()  # Start the 5-second timer after the question is fully read
+            return
+
+        # Only the newly due characters go into the widget
+        now = self.scheduler.clock()
+        chunk = self.engine.reveal_due(now)
+        self.question_text.config(state=tk.NORMAL)
+        self.question_text.insert(tk.END, chunk)
+        self.question_text.config(state=tk.DISABLED)
+        if self.buzzer is not None:
+            self.buzzer.reveal(chunk)
+
+        # Sleep until the next character is due
+        self.scheduler.call_at("reveal", max(self.engine.next_reveal_time(), now + 0.001), self.update_reading_text)
+
+    def resume_reading(self):
+        """Continue the reveal from where it stopped, at the current speed."""
+        self.reading_active = True
+        self.engine.set_reading_speed(self.engine.reading_speed, self.scheduler.clock())
+        self.update_reading_text()
+
+    def poll_buzzer(self):
+        """Pause the reveal while a player answers, then resume it or show the answer."""
+        for event in self.buzzer.events():
+            if event[0] == "buzz":
+                # A buzz that raced the reader showing the answer leaves nothing to pause
+                self.buzz_paused = self.reading_active or self.timer_running
+                self.stop_reading()
+                self.buzzer_label.config(text=f"{event[1]} buzzed in")
+            elif event[2]:
+                self.buzzer_label.config(text=f"{event[1]} is correct!")
+                self.reveal_question()
+            else:
+                self.buzzer_label.config(text=f"{event[1]} is incorrect")
+                if self.buzz_paused:
+                    self.buzz_paused = False
+                    self.resume_reading()
+        self.scheduler.call_later("buzzer", LOADER_POLL_MS / 1000, self.poll_buzzer)
+
+    def stop_reading(self):
+        """Stop the reveal and the countdown, cancelling their pending callbacks."""
+        self.reading_active = False
+        self.timer_running = False
+        self.scheduler.cancel("reveal")
+        self.scheduler.cancel("timer")
+
+    def start_timer(self):
+        """Start the timer."""
+        if not self.timer_enabled:
+            return
+        self.timer_running = True
+        self.timer_deadline = self.scheduler.clock() + self.timer_seconds  # Always the configured duration
+        self.update_timer()
+
+    def update_timer(self):
+        """Update the timer label on each whole second left until the deadline."""
+        if not self.timer_running:
+            return
+        remaining = self.timer_deadline - self.scheduler.clock()
+        if remaining > 0:
+            seconds_left = math.ceil(remaining)
+            self.timer_label.config(text=f"Time Left: {seconds_left}")
+            # Wake exactly when the displayed number should drop, however late this tick was
+            self.scheduler.call_at("timer", self.timer_deadline - (seconds_left - 1), self.update_timer)
+        else:
+            self.timer_running = False
+            self.timer_label.config(text="Time's up!")
+            self.reveal_question()  # Reveal the question when the timer ends
+
+    def reveal_question(self):
+        """Reveal the full question and correct answer."""
+        question = self.engine.current_question
+        if question is None:
+            return
+
+        # Stop text display
+        self.stop_reading()
+        self.buzz_paused = False
+        if self.buzzer is not None:
+            self.buzzer.show_answer()
+
+        # Display the full question text and correct answer
+        self.question_text.config(state=tk.NORMAL)
+        self.question_text.delete(1.0, tk.END)
+        self.question_text.insert(tk.END, f"Question: {question.text}\n\n")
+        self.question_text.insert(tk.END, f"Correct Answer: {question.answer}\n\n")
+        if self.engine.submitted:  # Only show correctness if the user has submitted an answer
+            if self.engine.is_correct:
+                self.question_text.insert(tk.END, "Your answer was CORRECT!", "correct")
+            else:
+                self.question_text.insert(tk.END, "Your answer was INCORRECT!", "incorrect")
+            clue, clues = self.engine.current_clue()  # The reveal stopped where the answer came in
+            self.question_text.insert(tk.END, f" (answered on clue {clue} of {clues})")
+        self.question_text.config(state=tk.DISABLED)
+
+    def check_answer(self):
+        # Judge and score the answer; None if there are no questions or it was already submitted
+        self.user_answer = self.answer_entry.get()
+        if self.engine.check_answer(self.user_answer, self.scheduler.clock()) is None:
+            return
+
+        # Stop the reading timer and text display
+        self.stop_reading()
+        self.show_answer = True
+        self.update_score()
+
+        # Display the full question text, correct answer, and whether the user was correct
+        self.reveal_question()
+
+        # Clear the answer box
+        self.answer_entry.delete(0, tk.END)
+
+    def next_question(self):
+        """Move to the next question."""
+        if self.next_question_cooldown:
+            return  # Ignore if cooldown is active
+
+        # Start cooldown
+        self.next_question_cooldown = True
+        self.scheduler.call_later("cooldown", 1.5, setattr, self, "next_question_cooldown", False)  # 1.5-second cooldown
+
+        # Stop the reading timer and text display
+        self.stop_reading()
+
+        # Advances the question and the score denominator, resetting the per-question flags
+        if self.engine.next_question():
+            self.user_answer = ""
+            self.show_answer = False
+            self.answer_entry.delete(0, tk.END)  # Clear the answer box
+            self.update_score()
+            self.start_reading()
+
+    def mark_answer(self, correct: bool):
+        # Ignored if there are no questions or the score was already updated for this question.
+        # Only a mark made while the question is still being read or timed counts as a timed answer.
+        timed = self.reading_active or self.timer_running
+        if self.engine.mark_answer(correct, self.scheduler.clock() if timed else None):
+            self.update_score()
+
+    def randomize_questions(self):
+        """Randomize the order of questions."""
+        if self.engine.filtered_questions:
+            seed = self.engine.randomize(balance=RANDOM_BALANCE[self.balance_var.get()])
+            self.start_reading()
+            messagebox.showinfo("Randomized", f"Questions have been randomized! (seed {seed})")
+
+    def reset_quiz(self):
+        """Reset the quiz to start over with the same set of questions."""
+        self.engine.reset()
+        self.update_score()
+        self.start_reading()
+        messagebox.showinfo("Reset", "Quiz has been reset!")
+
+    def import_packets(self):
+        """Parse packet files off the Tk thread, then add them to the bank in one commit."""
+        if self.bank_loading():
+            return
+        if self.packet_parser is not None:
+            messagebox.showwarning("Import", "An import is already running.")
+            return
+        paths = filedialog.askopenfilenames(title="Import Packets", filetypes=[("Question packets", "*.json *.jsonl *.csv *.txt"), ("All files", "*.*")])
+        if not paths:
+            return
+        # Packets that don't say otherwise get the year, difficulty and subject currently selected
+        defaults = {"year": self.engine.selected_year, "difficulty": self.engine.selected_difficulty, "subjects": sorted(self.engine.selected_subjects)}
+        self.packet_parser = PacketParser(paths, defaults)
+        self.packet_parser.start()
+        self.scheduler.call_later("import", LOADER_POLL_MS / 1000, self.poll_packet_import)
+
+    def poll_packet_import(self):
+        if not self.packet_parser.done:
+            self.scheduler.call_later("import", LOADER_POLL_MS / 1000, self.poll_packet_import)
+            return
+        report = self.packet_parser.commit(self.store)
+        if self.duplicate_checker is not None:
+            for question in self.packet_parser.questions:
+                self.duplicate_checker.add(question.id, question.text)
+        self.packet_parser = None
+        print(report)
+        if report.added:
+            self.filter_questions()
+            self.update_question_dropdown()
+        details = "\n".join(report.errors[:10])
+        messagebox.showinfo("Import", f"{report}\n\n{details}" if details else str(report))
+
+    def add_question(self):
+        self.is_adding_question = True
+        if self.duplicate_checker is None and self.loader is None:
+            # Index the bank in the background while the question is being typed
+            self.duplicate_checker = DuplicateChecker(self.store.entries_reader())
+        add_window = ttk.Toplevel(self.root)
+        add_window.title("Add New Question")
+        add_window.geometry("400x300")
+
+        ttk.Label(add_window, text="Question Text:").pack()
+        question_text_entry = ttk.Entry(add_window, width=50)
+        question_text_entry.pack()
+
+        ttk.Label(add_window, text="Answer:").pack()
+        answer_entry = ttk.Entry(add_window, width=50)
+        answer_entry.pack()
+
+        # Choices come from the bank, but a new subject, difficulty or year can be typed in
+        facets = self.store.facets
+        subjects = facets.subjects() or DEFAULT_SUBJECTS
+        ttk.Label(add_window, text="Subjects:").pack()
+        subjects_var = tk.StringVar(value=next(iter(self.engine.selected_subjects), subjects[0]))
+        subjects_menu = ttk.Combobox(add_window, textvariable=subjects_var, values=subjects)
+        subjects_menu.pack()
+
+        ttk.Label(add_window, text="Difficulty:").pack()
+        difficulty_var = tk.StringVar(value=self.engine.selected_difficulty)
+        difficulty_menu = ttk.Combobox(add_window, textvariable=difficulty_var, values=facets.difficulties() or DEFAULT_DIFFICULTIES)
+        difficulty_menu.pack()
+
+        ttk.Label(add_window, text="Year:").pack()
+        year_var = tk.StringVar(value=str(self.engine.selected_year))
+        year_menu = ttk.Combobox(add_window, textvariable=year_var, values=[str(year) for year in facets.years()])
+        year_menu.pack()
+
+        def save_question():
+            if self.bank_loading():
+                return
+            text = question_text_entry.get().strip()
+            answer = answer_entry.get().strip()
+            if not text or not answer:
+                messagebox.showwarning("Input Error", "Question text and answer cannot be empty.")
+                return
+            subjects = [subjects_var.get().strip()]
+            difficulty = difficulty_var.get().strip()
+            if not subjects[0] or not difficulty or not year_var.get().strip().isdigit():
+                messagebox.showwarning("Input Error", "Choose a subject and difficulty, and enter the year as a number.")
+                return
+            year = int(year_var.get())
+            new_question = Question(text, answer, subjects, difficulty, year)
+            if new_question.id in self.store:
+                messagebox.showwarning("Duplicate", "This question is already in the bank.")
+                return
+            if self.duplicate_checker is None:
+                self.duplicate_checker = DuplicateChecker(self.store.entries_reader())
+            for question_id, similarity in self.duplicate_checker.ready(wait=True).similar(text):
+                existing = self.store.get(question_id)
+                if existing is None:
+                    continue
+                if not messagebox.askyesno("Possible Duplicate", f"This looks like a question already in the bank ({similarity:.0%} similar):\n\n{existing.text}\n\nAdd it anyway?"):
+                    return
+                break
+            self.store.add(new_question)
+            self.duplicate_checker.add(new_question.id, text)
+            self.filter_questions()
+            self.update_question_dropdown()
+            add_window.destroy()
+
+        ttk.Button(add_window, text="Save", command=save_question, bootstyle="success").pack()
@@ -1,12 +1,17 @@
+import argparse
+import importlib
+import os
 import subprocess
 import sys
-import tkinter as tk
-from tkinter import ttk, messagebox
-from typing import List, Dict, Set
-import random
-import json
-import os
-import threading
+
+from analytics import GROUPINGS, AttemptLog, format_report, summarize
+from buzzer import DEFAULT_PORT, BuzzerServer
+from profiling import Profiler
+from duplicates import duplicate_report
+from packet_export import FORMATS, generate_packets
+from packet_import import import_packets
+from question_store import compile_json_bank, export_bank_to_json, import_json_to_sqlite, load_all, open_question_store, shard_json_bank
+
 
 # Function to install TTKBootstrap if not installed
 def install_dependencies():
@@ -14,634 +19,129 @@ def install_dependencies():
     required_libraries = ["ttkbootstrap"]  # Removed pyttsx3
 
     for library in required_libraries:
-        try:
-            __import__(library.split(">=")[0])
-        except ImportError:
-            print(f"Installing {library}...")
-            subprocess.check_call([sys.executable, "-m", "pip", "install", library])
-
-# Install dependencies before running the rest of the program
-install_dependencies()
-
-# Now import the libraries
-import ttkbootstrap as ttk
-from ttkbootstrap.constants import *
-
-# Your original code starts here
-class Question:
-    def __init__(self, text: str, answer: str, subjects: List[str], difficulty: str, year: int):
-        self.text = text
-        self.answer = answer
-        self.subjects = subjects
-        self.difficulty = difficulty
-        self.year = year
-
-    def to_dict(self):
-        return {
-            "text": self.text,
-            "answer": self.answer,
-            "subjects": self.subjects,
-            "difficulty": self.difficulty,
-            "year": self.year
-        }
-
-    @classmethod
-    def from_dict(cls, data: Dict):
-        return cls(data["text"], data["answer"], data["subjects"], data["difficulty"], data["year"])
-
-
-class ContentView:
-    def __init__(self, root: ttk.Window):
-        self.root = root
-        self.root.title("Quiz Parserinator")
-        self.root.geometry("1200x900")
-
-        # Initialize theme
-        self.current_theme = "cosmo"  # Default to light mode
-        self.root.style.theme_use(self.current_theme)
-
-        # Center the window
-        self.center_window()
-
-        self.question_index = 0
-        self.user_answer = ""
-        self.is_correct = False
-        self.show_answer = False
-        self.score = 0
-        self.total_questions = 0
-        self.reading_text = ""
-        self.read_index = 0
-        self.selected_subjects: Set[str] = set()
-        self.reading_speed = 0.05
-        self.filtered_questions: List[Question] = []
-        self.selected_difficulty = "District"
-        self.selected_year = 2024
-        self.is_adding_question = False
-        self.timer_running = False
-        self.timer_seconds = 5  # Default timer duration
-        self.timer_enabled = True  # Timer starts enabled
-        self.timer_label = None
-        self.reading_active = False  # Flag to control text display
-        self.next_question_cooldown = False  # Flag to prevent rapid next question clicks
-        self.score_updated = False  # Flag to track if score has been updated for the current question
-        self.submitted = False  # Flag to track if the user has submitted an answer for the current question
-
-        # Default keybind settings
-        self.keybinds = {
-            "submit_answer": "<Return>",  # Enter key to submit answer
-        }
-
-        # Load keybinds from file or use defaults
-        self.load_keybinds()
-
-        # Load questions from file or use default questions
-        self.all_questions = self.load_questions()
-
-        # Create a scrollable canvas
-        self.canvas = tk.Canvas(self.root)
-        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        # Add a scrollbar
-        self.scrollbar_y = ttk.Scrollbar(self.root, orient=tk.VERTICAL, command=self.canvas.yview)
-        self.scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
-
-        self.scrollbar_x = ttk.Scrollbar(self.root, orient=tk.HORIZONTAL, command=self.canvas.xview)
-        self.scrollbar_x.pack(side=tk.BOTTOM, fill=tk.X)
-
-        # Configure the canvas
-        self.canvas.configure(yscrollcommand=self.scrollbar_y.set, xscrollcommand=self.scrollbar_x.set)
-        self.canvas.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
-
-        # Create a frame inside the canvas
-        self.main_frame = ttk.Frame(self.canvas)
-        self.canvas.create_window((0, 0), window=self.main_frame, anchor="nw")
-
-        # Bind mouse wheel scrolling
-        self.root.bind_all("<MouseWheel>", self.on_mousewheel)
-        self.root.bind_all("<Button-4>", self.on_mousewheel)  # For Linux, scroll up
-        self.root.bind_all("<Button-5>", self.on_mousewheel)  # For Linux, scroll down
-        self.root.bind_all("<Shift-MouseWheel>", self.on_shift_mousewheel)  # Horizontal scrolling
-
-        self.setup_ui()
-        self.filter_questions()
-        self.start_reading()
-
-    def center_window(self):
-        """Center the window on the screen."""
-        self.root.update_idletasks()
-        width = self.root.winfo_width()
-        height = self.root.winfo_height()
-        screen_width = self.root.winfo_screenwidth()
-        screen_height = self.root.winfo_screenheight()
-        x = (screen_width // 2) - (width // 2)
-        y = (screen_height // 2) - (height // 2)
-        self.root.geometry(f"+{x}+{y}")
-
-    def on_mousewheel(self, event):
-        """Handle vertical mouse wheel scrolling."""
-        if event.num == 4 or event.delta > 0:
-            self.canvas.yview_scroll(-1, "units")  # Scroll up
-        elif event.num == 5 or event.delta < 0:
-            self.canvas.yview_scroll(1, "units")  # Scroll down
-
-    def on_shift_mousewheel(self, event):
-        """Handle horizontal mouse wheel scrolling."""
-        if event.num == 4 or event.delta > 0:
-            self.canvas.xview_scroll(-1, "units")  # Scroll left
-        elif event.num == 5 or event.delta < 0:
-            self.canvas.xview_scroll(1, "units")  # Scroll right
-
-    def setup_ui(self):
-        # Increase font sizes for better readability
-        title_font = ("Arial", 36, "bold")
-        label_font = ("Arial", 14)
-        button_font = ("Arial", 12)
-        entry_font = ("Arial", 12)
-
-        # Title Label
-        self.title_label = ttk.Label(self.main_frame, text="Quiz Parserinator", font=title_font, bootstyle="primary")
-        self.title_label.pack(pady=20)
-
-        # Theme Switcher (Light/Dark Mode)
-        self.theme_var = tk.StringVar(value="light")
-        self.theme_switcher = ttk.Checkbutton(
-            self.main_frame,
-            text="Dark Mode",
-            variable=self.theme_var,
-            bootstyle="round-toggle",
-            command=self.toggle_theme,
-        )
-        self.theme_switcher.pack(pady=10)
-
-        # Settings Dropdown Menu (Top of the program)
-        settings_frame = ttk.Frame(self.main_frame)
-        settings_frame.pack(pady=10, padx=10, fill=tk.X)
-
-        self.settings_var = tk.StringVar(value="Settings")
-        self.settings_menu = ttk.Combobox(settings_frame, textvariable=self.settings_var, values=["Keybind Settings", "Reading Speed", "Timer Settings", "Manage Questions", "Add New Question"], state="readonly", font=label_font, width=20)
-        self.settings_menu.grid(row=0, column=0, padx=5, pady=5)
-        self.settings_menu.bind("<<ComboboxSelected>>", lambda e: self.handle_settings_selection())
-
-        # Filters Frame
-        filters_frame = ttk.LabelFrame(self.main_frame, text="Filters")
-        filters_frame.pack(pady=10, padx=10, fill=tk.X)
-
-        # Year Dropdown (Non-Editable)
-        ttk.Label(filters_frame, text="Year:", font=label_font).grid(row=0, column=0, padx=5, pady=5)
-        self.year_var = tk.StringVar(value="2024")
-        self.year_menu = ttk.Combobox(filters_frame, textvariable=self.year_var, values=[str(year) for year in range(2017, 2025)], font=entry_font, state="readonly")
-        self.year_menu.grid(row=0, column=1, padx=5, pady=5)
-        self.year_menu.bind("<<ComboboxSelected>>", lambda e: self.update_year())
-
-        # Difficulty Dropdown (Non-Editable)
-        ttk.Label(filters_frame, text="Difficulty:", font=label_font).grid(row=0, column=2, padx=5, pady=5)
-        self.difficulty_var = tk.StringVar(value="District")
-        self.difficulty_menu = ttk.Combobox(filters_frame, textvariable=self.difficulty_var, values=["District", "Regional", "State"], font=entry_font, state="readonly")
-        self.difficulty_menu.grid(row=0, column=3, padx=5, pady=5)
-        self.difficulty_menu.bind("<<ComboboxSelected>>", lambda e: self.update_difficulty())
-
-        # Subjects Dropdown (Non-Editable)
-        ttk.Label(filters_frame, text="Subjects:", font=label_font).grid(row=0, column=4, padx=5, pady=5)
-        self.subjects_var = tk.StringVar(value="All")
-        self.subjects_menu = ttk.Combobox(filters_frame, textvariable=self.subjects_var, values=["Language Arts", "Social Studies", "Arts and Humanities", "Math", "Science"], font=entry_font, state="readonly")
-        self.subjects_menu.grid(row=0, column=5, padx=5, pady=5)
-        self.subjects_menu.bind("<<ComboboxSelected>>", lambda e: self.update_subjects())
-
-        # Reading Speed Slider
-        speed_frame = ttk.LabelFrame(self.main_frame, text="Reading Speed")
-        speed_frame.pack(pady=10, padx=10, fill=tk.X)
-
-        # Slider: Faster on the right, slower on the left
-        self.speed_slider = ttk.Scale(speed_frame, from_=0.1, to=0.01, orient=tk.HORIZONTAL, command=self.update_speed, length=400)
-        self.speed_slider.set(self.reading_speed)
-        self.speed_slider.pack(pady=10)
-
-        # Question Display (Non-Editable)
-        question_frame = ttk.LabelFrame(self.main_frame, text="Question")
-        question_frame.pack(pady=10, padx=10, fill=tk.X)
-
-        self.question_text = tk.Text(question_frame, height=10, width=80, wrap=tk.WORD, font=entry_font, state=tk.DISABLED)
-        self.question_text.pack(pady=10)
-
-        # Answer Input (Editable)
-        answer_frame = ttk.LabelFrame(self.main_frame, text="Your Answer")
-        answer_frame.pack(pady=10, padx=10, fill=tk.X)
-
-        self.answer_entry = ttk.Entry(answer_frame, width=80, font=entry_font)
-        self.answer_entry.pack(pady=10)
-        self.answer_entry.bind("<Return>", lambda e: self.check_answer())  # Bind Enter key to submit answer
-
-        # Timer Label
-        timer_frame = ttk.LabelFrame(self.main_frame, text="Timer")
-        timer_frame.pack(pady=10, padx=10, fill=tk.X)
-
-        self.timer_label = ttk.Label(timer_frame, text=f"Time Left: {self.timer_seconds}", font=label_font)
-        self.timer_label.pack(pady=10)
-
-        # Buttons Frame
-        buttons_frame = ttk.LabelFrame(self.main_frame, text="Actions")
-        buttons_frame.pack(pady=10, padx=10, fill=tk.X)
-
-        # Submit Button
-        self.submit_button = ttk.Button(buttons_frame, text="Submit", command=self.check_answer, bootstyle="success")
-        self.submit_button.grid(row=0, column=0, padx=5, pady=5)
-
-        # Next Question Button
-        self.next_button = ttk.Button(buttons_frame, text="Next Question", command=self.next_question, bootstyle="primary")
-        self.next_button.grid(row=0, column=1, padx=5, pady=5)
-
-        # Correct/Incorrect Buttons
-        self.correct_button = ttk.Button(buttons_frame, text="I was correct", command=lambda: self.mark_answer(True), bootstyle="success")
-        self.correct_button.grid(row=0, column=2, padx=5, pady=5)
-
-        self.incorrect_button = ttk.Button(buttons_frame, text="I was incorrect", command=lambda: self.mark_answer(False), bootstyle="danger")
-        self.incorrect_button.grid(row=0, column=3, padx=5, pady=5)
-
-        # Randomize Button
-        self.randomize_button = ttk.Button(buttons_frame, text="Randomize", command=self.randomize_questions, bootstyle="warning")
-        self.randomize_button.grid(row=0, column=4, padx=5, pady=5)
-
-        # Reset Button
-        self.reset_button = ttk.Button(buttons_frame, text="Reset", command=self.reset_quiz, bootstyle="secondary")
-        self.reset_button.grid(row=0, column=5, padx=5, pady=5)
-
-        # Score Display
-        score_frame = ttk.LabelFrame(self.main_frame, text="Score")
-        score_frame.pack(pady=10, padx=10, fill=tk.X)
-
-        self.score_label = ttk.Label(score_frame, text=f"Score: {self.score}/{self.total_questions}", font=label_font)
-        self.score_label.pack(pady=10)
-
-        # Keybinds
-        self.setup_keybinds()
-
-    def toggle_theme(self):
-        """Toggle between light and dark mode."""
-        if self.theme_var.get() == "light":
-            self.current_theme = "cosmo"  # Light theme
-        else:
-            self.current_theme = "darkly"  # Dark theme
-
-        # Update the theme
-        self.root.style.theme_use(self.current_theme)
-
-        # Update the background color of the canvas and main frame
-        self.canvas.configure(bg=self.root.style.colors.bg)
-        self.main_frame.configure(bootstyle=self.current_theme)
-
-    def handle_settings_selection(self):
-        """Handle selection from the settings dropdown menu."""
-        selected = self.settings_var.get()
-        if selected == "Keybind Settings":
-            self.show_keybind_settings()
-        elif selected == "Reading Speed":
-            self.show_reading_speed_settings()
-        elif selected == "Timer Settings":
-            self.show_timer_settings()
-        elif selected == "Manage Questions":
-            self.show_manage_questions()
-        elif selected == "Add New Question":
-            self.add_question()
-
-    def show_keybind_settings(self):
-        """Display keybind settings."""
-        messagebox.showinfo("Keybind Settings", f"Current Keybind for Submit Answer: {self.keybinds['submit_answer']}")
+        print(f"Installing {library}...")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", library])
 
-    def show_reading_speed_settings(self):
-        """Display reading speed settings."""
-        messagebox.showinfo("Reading Speed", f"Current Reading Speed: {self.reading_speed}")
 
-    def show_timer_settings(self):
-        """Display timer settings."""
-        timer_window = ttk.Toplevel(self.root)
-        timer_window.title("Timer Settings")
-        timer_window.geometry("300x200")
+def load_bank():
+    """The whole question bank, for the command-line tools; exits if it can't be read."""
+    try:
+        return load_all(open_question_store())
+    except (ValueError, KeyError, TypeError, AttributeError, OSError) as error:
+        sys.exit(f"The questions file is corrupted or improperly formatted: {error}")
 
-        # Enable/Disable Timer
-        ttk.Label(timer_window, text="Enable Timer:", font=("Arial", 12)).pack(pady=5)
-        self.timer_enabled_var = tk.BooleanVar(value=self.timer_enabled)
-        ttk.Checkbutton(timer_window, text="Enabled", variable=self.timer_enabled_var, command=self.update_timer_enabled).pack(pady=5)
 
-        # Set Timer Duration
-        ttk.Label(timer_window, text="Timer Duration (seconds):", font=("Arial", 12)).pack(pady=5)
-        self.timer_duration_var = tk.IntVar(value=self.timer_seconds)
-        ttk.Entry(timer_window, textvariable=self.timer_duration_var, font=("Arial", 12)).pack(pady=5)
-        ttk.Button(timer_window, text="Save", command=self.update_timer_duration, bootstyle="success").pack(pady=10)
+def launch_gui(profiler=None, profile_summary_every: float = 0.0, buzzer=None):
+    """Import the Tk front-end only now, so importing this module or the engine stays headless."""
+    try:
+        import ttkbootstrap as ttk
+    except ImportError:
+        # Only pay for pip when the import actually fails, not on every launch
+        install_dependencies()
+        importlib.invalidate_caches()
+        import ttkbootstrap as ttk
+    from gui import ContentView
 
-    def update_timer_enabled(self):
-        """Update timer enabled state."""
-        self.timer_enabled = self.timer_enabled_var.get()
-
-    def update_timer_duration(self):
-        """Update timer duration."""
-        self.timer_seconds = self.timer_duration_var.get()
-        messagebox.showinfo("Timer Settings", f"Timer duration updated to {self.timer_seconds} seconds.")
-
-    def show_manage_questions(self):
-        """Display manage questions options."""
-        manage_window = ttk.Toplevel(self.root)
-        manage_window.title("Manage Questions")
-        manage_window.geometry("400x300")
-
-        self.question_var = tk.StringVar()
-        self.question_dropdown = ttk.Combobox(manage_window, textvariable=self.question_var, width=50, font=("Arial", 12), state="readonly")
-        self.question_dropdown.pack(pady=10)
-        self.update_question_dropdown()
-
-        ttk.Button(manage_window, text="Delete Selected Question", command=self.delete_question, bootstyle="danger").pack(pady=10)
-
-    def setup_keybinds(self):
-        # Bind keys to actions
-        self.root.bind(self.keybinds["submit_answer"], lambda e: self.check_answer())
-
-    def load_keybinds(self):
-        if os.path.exists("keybinds.json"):
-            try:
-                with open("keybinds.json", "r", encoding="utf-8") as file:
-                    self.keybinds = json.load(file)
-            except json.JSONDecodeError:
-                messagebox.showerror("Error", "The keybinds file is corrupted or improperly formatted.")
-        else:
-            self.save_keybinds()  # Save default keybinds if file doesn't exist
-
-    def save_keybinds(self):
-        with open("keybinds.json", "w", encoding="utf-8") as file:
-            json.dump(self.keybinds, file, indent=4)
-
-    def load_questions(self):
-        if os.path.exists("questions.json"):
-            try:
-                with open("questions.json", "r", encoding="utf-8") as file:
-                    questions_data = json.load(file)
-                    return [Question.from_dict(q) for q in questions_data]
-            except json.JSONDecodeError:
-                messagebox.showerror("Error", "The questions file is corrupted or improperly formatted.")
-                return []
-        else:
-            return []  # Return an empty list if the file doesn't exist
-
-    def save_questions(self):
-        with open("questions.json", "w", encoding="utf-8") as file:
-            questions_data = [q.to_dict() for q in self.all_questions]
-            json.dump(questions_data, file, indent=4, ensure_ascii=False)
-
-    def update_question_dropdown(self):
-        self.question_dropdown["values"] = [q.text for q in self.all_questions]
-
-    def delete_question(self):
-        selected_text = self.question_var.get()
-        if not selected_text:
-            messagebox.showwarning("No Selection", "Please select a question to delete.")
-            return
-
-        for question in self.all_questions:
-            if question.text == selected_text:
-                self.all_questions.remove(question)
-                self.save_questions()
-                self.filter_questions()
-                self.update_question_dropdown()
-                messagebox.showinfo("Deleted", "Question deleted successfully.")
-                return
-
-    def update_score(self):
-        self.score_label.config(text=f"Score: {self.score}/{self.total_questions}")
-
-    def update_year(self):
-        self.selected_year = int(self.year_var.get())
-        self.filter_questions()
-
-    def update_difficulty(self):
-        self.selected_difficulty = self.difficulty_var.get()
-        self.filter_questions()
-
-    def update_subjects(self):
-        selected = self.subjects_var.get()
-        if selected == "All":
-            self.selected_subjects = set()
-        else:
-            self.selected_subjects = {selected}
-        self.filter_questions()
-
-    def update_speed(self, value):
-        self.reading_speed = float(value)
-
-    def filter_questions(self):
-        self.filtered_questions = [
-            q for q in self.all_questions
-            if (not self.selected_subjects or any(subject in self.selected_subjects for subject in q.subjects)) and
-               q.difficulty == self.selected_difficulty and
-               q.year == self.selected_year
-        ]
-        if not self.filtered_questions:
-            self.question_text.config(state=tk.NORMAL)
-            self.question_text.delete(1.0, tk.END)
-            self.question_text.insert(tk.END, "No questions match selected filters.")
-            self.question_text.config(state=tk.DISABLED)
-            return
-        self.question_index = 0
-        self.start_reading()
-
-    def start_reading(self):
-        if not self.filtered_questions:
-            return
-        self.reading_text = ""
-        self.read_index = 0
-        self.reading_active = True  # Enable text display
-        question_text = self.filtered_questions[self.question_index].text
-
-        # Start text display
-        self.update_reading_text(question_text)
-
-    def update_reading_text(self, question_text: str):
-        if self.reading_active and self.read_index < len(question_text):
-            self.reading_text += question_text[self.read_index]
-            self.question_text.config(state=tk.NORMAL)
-            self.question_text.delete(1.0, tk.END)
-            self.question_text.insert(tk.END, self.reading_text)
-            self.question_text.config(state=tk.DISABLED)
-            self.read_index += 1
-            self.root.after(int(self.reading_speed * 1000), self.update_reading_text, question_text)
-        elif not self.reading_active:
-            # Stop text display if reading is no longer active
-            return
-        else:
-            self.start_timer()  # Start the 5-second timer after the question is fully read
-
-    def start_timer(self):
-        """Start the timer."""
-        if not self.timer_enabled:
-            return
-        self.timer_running = True
-        self.timer_seconds = self.timer_seconds  # Reset to configured duration
-        self.update_timer()
-
-    def update_timer(self):
-        """Update the timer every second."""
-        if self.timer_running:
-            self.timer_label.config(text=f"Time Left: {self.timer_seconds}")
-            if self.timer_seconds > 0:
-                self.timer_seconds -= 1
-                self.root.after(1000, self.update_timer)
-            else:
-                self.timer_running = False
-                self.timer_label.config(text="Time's up!")
-                self.reveal_question()  # Reveal the question when the timer ends
-
-    def reveal_question(self):
-        """Reveal the full question and correct answer."""
-        if not self.filtered_questions:
-            return
-
-        # Stop text display
-        self.reading_active = False
-
-        # Display the full question text and correct answer
-        self.question_text.config(state=tk.NORMAL)
-        self.question_text.delete(1.0, tk.END)
-        self.question_text.insert(tk.END, f"Question: {self.filtered_questions[self.question_index].text}\n\n")
-        self.question_text.insert(tk.END, f"Correct Answer: {self.filtered_questions[self.question_index].answer}\n\n")
-        if hasattr(self, "is_correct"):  # Only show correctness if the user has submitted an answer
-            if self.is_correct:
-                self.question_text.insert(tk.END, "Your answer was CORRECT!", "correct")
-            else:
-                self.question_text.insert(tk.END, "Your answer was INCORRECT!", "incorrect")
-        self.question_text.config(state=tk.DISABLED)
-
-    def check_answer(self):
-        if not self.filtered_questions or self.submitted:  # Check if already submitted
-            return
-
-        # Stop the reading timer if it's running
-        if self.timer_running:
-            self.timer_running = False
-
-        # Stop text display
-        self.reading_active = False
-
-        # Get the user's answer
-        self.user_answer = self.answer_entry.get()
-        self.is_correct = self.user_answer.lower() == self.filtered_questions[self.question_index].answer.lower()
-        self.show_answer = True
-
-        # Update score (only numerator)
-        if self.is_correct:
-            self.score += 1  # Increment score if the answer is correct
-        self.update_score()
-
-        # Display the full question text, correct answer, and whether the user was correct
-        self.reveal_question()
-
-        # Clear the answer box
-        self.answer_entry.delete(0, tk.END)
-
-        # Mark the question as submitted
-        self.submitted = True  # Set the flag to prevent further submissions
-
-    def next_question(self):
-        """Move to the next question."""
-        if self.next_question_cooldown:
-            return  # Ignore if cooldown is active
-
-        # Start cooldown
-        self.next_question_cooldown = True
-        self.root.after(1500, lambda: setattr(self, "next_question_cooldown", False))  # 1.5-second cooldown
-
-        # Stop the reading timer if it's running
-        if self.timer_running:
-            self.timer_running = False
-
-        # Stop text display
-        self.reading_active = False
-
-        if self.question_index < len(self.filtered_questions) - 1 and self.filtered_questions:
-            self.question_index += 1
-            self.user_answer = ""
-            self.show_answer = False
-            self.answer_entry.delete(0, tk.END)  # Clear the answer box
-            self.score_updated = False  # Reset the score update flag for the new question
-            self.submitted = False  # Reset the submission flag for the new question
-            self.total_questions += 1  # Increment the denominator by 1
-            self.update_score()
-            self.start_reading()
-
-    def mark_answer(self, correct: bool):
-        if not self.filtered_questions or self.score_updated:
-            return  # Ignore if no questions or score already updated for this question
-
-        self.score_updated = True  # Mark score as updated for this question
-        if correct:
-            self.score += 1
-        else:
-            self.score -= 1
-        self.update_score()
-
-    def randomize_questions(self):
-        """Randomize the order of questions."""
-        if self.filtered_questions:
-            random.shuffle(self.filtered_questions)
-            self.question_index = 0
-            self.start_reading()
-            messagebox.showinfo("Randomized", "Questions have been randomized!")
-
-    def reset_quiz(self):
-        """Reset the quiz to start over with the same set of questions."""
-        self.question_index = 0
-        self.score = 0
-        self.total_questions = 0
-        self.update_score()
-        self.start_reading()
-        messagebox.showinfo("Reset", "Quiz has been reset!")
-
-    def add_question(self):
-        self.is_adding_question = True
-        add_window = ttk.Toplevel(self.root)
-        add_window.title("Add New Question")
-        add_window.geometry("400x300")
-
-        ttk.Label(add_window, text="Question Text:").pack()
-        question_text_entry = ttk.Entry(add_window, width=50)
-        question_text_entry.pack()
-
-        ttk.Label(add_window, text="Answer:").pack()
-        answer_entry = ttk.Entry(add_window, width=50)
-        answer_entry.pack()
-
-        ttk.Label(add_window, text="Subjects:").pack()
-        subjects_var = tk.StringVar(value="Language Arts")
-        subjects_menu = ttk.Combobox(add_window, textvariable=subjects_var, values=["Language Arts", "Social Studies", "Arts and Humanities", "Math", "Science"], state="readonly")
-        subjects_menu.pack()
-
-        ttk.Label(add_window, text="Difficulty:").pack()
-        difficulty_var = tk.StringVar(value="District")
-        difficulty_menu = ttk.Combobox(add_window, textvariable=difficulty_var, values=["District", "Regional", "State"], state="readonly")
-        difficulty_menu.pack()
-
-        ttk.Label(add_window, text="Year:").pack()
-        year_var = tk.StringVar(value="2024")
-        year_menu = ttk.Combobox(add_window, textvariable=year_var, values=[str(year) for year in range(2017, 2025)], state="readonly")
-        year_menu.pack()
-
-        def save_question():
-            text = question_text_entry.get().strip()
-            answer = answer_entry.get().strip()
-            if not text or not answer:
-                messagebox.showwarning("Input Error", "Question text and answer cannot be empty.")
-                return
-            subjects = [subjects_var.get()]
-            difficulty = difficulty_var.get()
-            year = int(year_var.get())
-            new_question = Question(text, answer, subjects, difficulty, year)
-            self.all_questions.append(new_question)
-            self.save_questions()
-            self.filter_questions()
-            self.update_question_dropdown()
-            add_window.destroy()
-
-        ttk.Button(add_window, text="Save", command=save_question, bootstyle="success").pack()
-
-
-if __name__ == "__main__":
     # Use TTKBootstrap's themed window
     root = ttk.Window(themename="cosmo")
-    app = ContentView(root)
+    app = ContentView(root, profiler, profile_summary_every, buzzer)
     root.mainloop()
+    app.engine.finish()  # Record the judgement of the question still on screen
+    if buzzer is not None:
+        buzzer.close()
+    if profiler is not None:
+        profiler.export()
+        print(f"Wrote profile trace to {profiler.path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quiz Parserinator")
+    parser.add_argument("--import-sqlite", action="store_true", help="import questions.json into questions.db and exit; the app then uses the SQLite bank")
+    parser.add_argument("--shard", action="store_true", help="split questions.json into one file per year and difficulty under questions/ and exit; the app then loads shards on demand")
+    parser.add_argument("--compile-bank", action="store_true", help="compile questions.json into the memory-mapped questions.bank and exit; the app then opens it instantly")
+    parser.add_argument("--bank-to-json", metavar="PATH", help="write questions.bank, with its pending edits, out as a JSON bank at PATH and exit")
+    parser.add_argument("--import-packets", nargs="+", metavar="PATH", help="add questions from packet files or directories (.json, .jsonl, .csv, .txt) to the bank and exit")
+    parser.add_argument("--generate-packets", type=int, metavar="COUNT", help="write COUNT subject-balanced practice packets, with no question in two packets, and exit")
+    parser.add_argument("--packet-size", type=int, default=20, help="questions per generated packet")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="json", help="file format of generated packets")
+    parser.add_argument("--output", default="packets", help="directory generated packets are written to")
+    parser.add_argument("--seed", type=int, help="random seed, so the same packets can be generated again")
+    parser.add_argument("--year", type=int, help="year for imported questions that don't give one, or of generated packets (default 2024)")
+    parser.add_argument("--difficulty", help="difficulty for imported questions that don't give one, or of generated packets (default District)")
+    parser.add_argument("--subject", action="append", default=[], help="subject for imported questions that don't give one, or to limit generated packets to (repeatable)")
+    parser.add_argument("--workers", type=int, help="processes used to parse or write packets (default: one per CPU)")
+    parser.add_argument("--find-duplicates", action="store_true", help="print clusters of near-duplicate questions in the bank and exit")
+    parser.add_argument("--similarity", type=float, default=0.6, help="estimated shingle overlap from which --find-duplicates groups questions")
+    parser.add_argument("--host-buzzer", type=int, nargs="?", const=DEFAULT_PORT, metavar="PORT", help=f"let players on the local network buzz in with 'python buzzer.py HOST NAME' (port {DEFAULT_PORT} by default)")
+    parser.add_argument("--analytics", nargs="?", const="subject", choices=GROUPINGS, help="print accuracy, buzz point and answer time by subject (default), difficulty or year and exit")
+    parser.add_argument("--profile", metavar="PATH", help="time Tk callbacks and event-loop lag, writing a .json or .csv trace on exit (or set QUIZ_PROFILE)")
+    parser.add_argument("--profile-summary", type=float, default=0.0, metavar="SECONDS", help="with profiling on, also print a timing summary this often")
+    args = parser.parse_args()
+
+    if args.import_sqlite:
+        if os.path.exists("questions.db"):
+            sys.exit("questions.db already exists; remove it first to re-import.")
+        print(f"Imported {import_json_to_sqlite()} questions into questions.db")
+        sys.exit(0)
+
+    if args.shard:
+        if os.path.exists("questions"):
+            sys.exit("questions/ already exists; remove it first to re-shard.")
+        print(f"Split {shard_json_bank()} questions into shards under questions/")
+        sys.exit(0)
+
+    if args.compile_bank:
+        if os.path.exists("questions.bank"):
+            sys.exit("questions.bank already exists; remove it first to recompile.")
+        print(f"Compiled {compile_json_bank()} questions into questions.bank")
+        sys.exit(0)
+
+    if args.bank_to_json:
+        if not os.path.exists("questions.bank"):
+            sys.exit("There is no questions.bank to convert.")
+        print(f"Wrote {export_bank_to_json(args.bank_to_json)} questions to {args.bank_to_json}")
+        sys.exit(0)
+
+    if args.import_packets:
+        store = load_bank()
+        defaults = {"year": args.year, "difficulty": args.difficulty, "subjects": args.subject}
+        report = import_packets(store, args.import_packets, {k: v for k, v in defaults.items() if v}, args.workers)
+        store.save(wait=True)
+        for error in report.errors[:20]:
+            print(error)
+        if len(report.errors) > 20:
+            print(f"... and {len(report.errors) - 20} more rejected")
+        print(report)
+        sys.exit(0)
+
+    if args.generate_packets is not None:
+        if args.generate_packets < 1 or args.packet_size < 1:
+            sys.exit("--generate-packets and --packet-size must be positive.")
+        store = load_bank()
+        # The same filter as the quiz screen: one year and difficulty, any of the chosen subjects
+        questions = store.filter(args.year or 2024, args.difficulty or "District", set(args.subject))
+        written, seconds = generate_packets(questions, args.generate_packets, args.packet_size, args.output,
+                                            args.format, args.seed, workers=args.workers)
+        print(f"Wrote {written} packets of {args.packet_size} questions to {args.output}/ in {seconds:.2f} s")
+        if written < args.generate_packets:
+            print(f"Only {len(questions)} questions match the filters, too few for {args.generate_packets} packets without repeats")
+        sys.exit(0)
+
+    if args.analytics:
+        print(format_report(summarize(AttemptLog("attempts.log"), args.analytics), args.analytics))
+        sys.exit(0)
+
+    if args.find_duplicates:
+        print(duplicate_report(load_bank(), args.similarity))
+        sys.exit(0)
+
+    buzzer = None
+    if args.host_buzzer is not None:
+        buzzer = BuzzerServer(port=args.host_buzzer)
+        try:
+            buzzer.start()
+        except OSError as error:
+            sys.exit(f"Can't host the buzzer on port {args.host_buzzer}: {error}")
+        print(f"Buzzer server listening on port {buzzer.port}")
+
+    launch_gui(Profiler.from_environment(args.profile), args.profile_summary, buzzer)
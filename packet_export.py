@@ -0,0 +1,94 @@
+"""Batch generation of practice packets from the question bank, as JSON or Markdown files.
+
+One random order is drawn over the filtered questions and cut into consecutive packets, so
+no question appears in two packets. Balancing takes the order round-robin across subjects,
+so every packet holds each subject to within one question of the others until one runs out.
+Packets are written by a process pool, each file streamed one question at a time.
+Nothing here imports Tk.
+"""
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sampling import LazyPermutation, Strata
+
+FORMATS = {"json": ".json", "markdown": ".md"}
+ENCODER = json.JSONEncoder(ensure_ascii=False)
+PACKETS_PER_TASK = 64  # Packets handed to a worker at a time; enough to amortize the pickling
+
+
+def round_robin_order(questions: Sequence, seed: Optional[int] = None, balance: Optional[str] = "subject") -> Iterator[int]:
+    """Positions of questions in random order, one from each stratum per round.
+
+    sample_order only balances in expectation, which lets a 20-question packet come out with
+    half of it one subject; here every run of len(strata) positions covers each stratum once.
+    """
+    rng = random.Random(seed)
+    if balance is None:
+        yield from LazyPermutation(len(questions), rng)
+        return
+    orders = [(members, LazyPermutation(len(members), rng)) for members in Strata(questions, balance).members]
+    while orders:
+        rng.shuffle(orders)  # A new stratum order each round, so none is always first or last
+        for members, order in orders:
+            yield members[next(order)]
+        orders = [(members, order) for members, order in orders if len(order)]
+
+
+def write_packet(path: str, title: str, questions: Sequence[Dict], output_format: str):
+    """Write one packet; JSON packets are a list of question records, so they can be imported again."""
+    with open(path, "w", encoding="utf-8") as file:
+        if output_format == "json":
+            file.write("[\n")
+            for number, question in enumerate(questions):
+                if number:
+                    file.write(",\n")
+                # One record per line: json.dumps with indent drops to the pure-Python encoder
+                file.write("    " + ENCODER.encode(question))
+            file.write("\n]\n")
+            return
+        file.write(f"# {title}\n")
+        for number, question in enumerate(questions, 1):
+            subjects = ", ".join(question["subjects"])
+            file.write(f"\n{number}. {question['text']}\n\n"
+                       f"   **ANSWER:** {question['answer']}  \n"
+                       f"   _{subjects} · {question['difficulty']} {question['year']}_\n")
+
+
+def write_packets(batch: List[Tuple[str, str, List[Dict]]], output_format: str) -> int:
+    """Worker entry point: write (path, title, questions) packets and return how many."""
+    for path, title, questions in batch:
+        write_packet(path, title, questions, output_format)
+    return len(batch)
+
+
+def generate_packets(questions: Sequence, count: int, size: int, directory: str, output_format: str = "json",
+                     seed: Optional[int] = None, balance: Optional[str] = "subject", workers: Optional[int] = None) -> Tuple[int, float]:
+    """Write up to count packets of size questions each; returns (packets written, seconds).
+
+    Fewer packets are written if the questions run out, since none is repeated.
+    """
+    start = time.perf_counter()
+    os.makedirs(directory, exist_ok=True)
+    extension = FORMATS[output_format]
+    width = len(str(count))
+
+    order = round_robin_order(questions, seed, balance)
+    packets = []
+    for number in range(1, count + 1):
+        packet = [questions[position].to_dict() for _, position in zip(range(size), order)]
+        if len(packet) < size:
+            break
+        name = f"packet-{number:0{width}d}"
+        packets.append((os.path.join(directory, name + extension), f"Packet {number}", packet))
+
+    batches = [packets[i:i + PACKETS_PER_TASK] for i in range(0, len(packets), PACKETS_PER_TASK)]
+    if len(batches) <= 1 or workers == 1:
+        written = sum(write_packets(batch, output_format) for batch in batches)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            written = sum(pool.map(write_packets, batches, [output_format] * len(batches)))
+    return written, time.perf_counter() - start
@@ -0,0 +1,196 @@
+"""Bulk import of question packets: JSON, JSON Lines, CSV and plain-text "question / ANSWER:" files.
+
+Packets are parsed and validated across a process pool, one file per task, then added to
+the store in a single add_many commit. Nothing here imports Tk.
+"""
+import csv
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from question_store import iter_question_records
+from quiz_engine import Question
+
+PACKET_EXTENSIONS = (".json", ".jsonl", ".csv", ".txt")
+
+TEXT_ANSWER = re.compile(r"^\s*ANSWER\s*:\s*(.*)$", re.IGNORECASE)
+TEXT_SETTING = re.compile(r"^\s*(year|difficulty|subjects?)\s*:\s*(.+)$", re.IGNORECASE)
+QUESTION_NUMBER = re.compile(r"^\s*(?:\d+\s*[.)]|TOSSUP\s*\d*\s*[.:]?)\s*", re.IGNORECASE)
+
+
+def split_subjects(value) -> List[str]:
+    if isinstance(value, str):
+        return [subject.strip() for subject in value.split(";") if subject.strip()]
+    return [str(subject).strip() for subject in value or () if str(subject).strip()]
+
+
+def iter_text_packet(path: str) -> Iterator[Dict]:
+    """Yield records from a plain-text packet.
+
+    Question text runs until a line starting with "ANSWER:". Leading "1." or "TOSSUP 1"
+    numbering is dropped. Lines such as "Year: 2024", "Difficulty: State" or "Subject: Math"
+    between questions apply to every question after them.
+    """
+    settings: Dict = {}
+    lines: List[str] = []
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            answer = TEXT_ANSWER.match(line)
+            if answer:
+                text = QUESTION_NUMBER.sub("", " ".join(lines), count=1)
+                yield dict(settings, text=text, answer=answer.group(1).strip())
+                lines = []
+                continue
+            setting = TEXT_SETTING.match(line)
+            if setting and not lines:
+                name = setting.group(1).lower()
+                settings["subjects" if name.startswith("subject") else name] = setting.group(2).strip()
+            elif line.strip():
+                lines.append(line.strip())
+
+
+def iter_csv_packet(path: str) -> Iterator[Dict]:
+    """Yield records from a CSV packet with a header row; subjects are separated by semicolons."""
+    with open(path, "r", newline="", encoding="utf-8-sig") as file:
+        for row in csv.DictReader(file):
+            yield {key.strip().lower(): value for key, value in row.items() if key and value not in (None, "")}
+
+
+def build_question(record: Dict, defaults: Dict) -> Question:
+    """Validate a packet record, filling gaps from defaults; raises ValueError naming the problem."""
+    if not isinstance(record, dict):
+        raise ValueError("not a question record")
+    record = dict(defaults, **{key: value for key, value in record.items() if value not in (None, "")})
+    text = " ".join(str(record.get("text", "")).split())
+    answer = " ".join(str(record.get("answer", "")).split())
+    if not text or not answer:
+        raise ValueError("missing question text or answer")
+    if not record.get("difficulty"):
+        raise ValueError("no difficulty")
+    try:
+        year = int(record["year"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"bad year {record.get('year')!r}") from None
+    return Question(text, answer, split_subjects(record.get("subjects")), str(record["difficulty"]).strip(), year)
+
+
+def parse_packet(path: str, defaults: Dict) -> Tuple[List[Dict], List[str]]:
+    """Parse and validate one packet file; returns (question dicts with IDs, error messages).
+
+    Runs in a worker process, so it returns plain dicts and never raises for bad input.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        records = iter_csv_packet(path)
+    elif extension == ".txt":
+        records = iter_text_packet(path)
+    else:
+        records = iter_question_records(path)
+
+    questions: List[Dict] = []
+    errors: List[str] = []
+    number = 0
+    try:
+        for number, record in enumerate(records, 1):
+            try:
+                questions.append(build_question(record, defaults).to_dict())
+            except ValueError as error:
+                errors.append(f"{path}: question {number}: {error}")
+    except (OSError, UnicodeDecodeError, ValueError) as error:
+        # ValueError covers malformed JSON; questions parsed before the damage are kept
+        errors.append(f"{path}: after question {number}: {error}")
+    return questions, errors
+
+
+def find_packets(paths: Iterable[str]) -> List[str]:
+    """Expand directories into the packet files they contain, in a stable order."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, names in sorted(os.walk(path)):
+                found.extend(os.path.join(directory, name) for name in sorted(names) if name.lower().endswith(PACKET_EXTENSIONS))
+        else:
+            found.append(path)
+    return found
+
+
+def parse_packets(paths: Sequence[str], defaults: Optional[Dict] = None, workers: Optional[int] = None) -> Tuple[List[Question], List[str]]:
+    """Parse packets in parallel and de-duplicate them among themselves, keeping file order."""
+    defaults = defaults or {}
+    if len(paths) <= 1 or workers == 1:
+        results = [parse_packet(path, defaults) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(parse_packet, paths, [defaults] * len(paths), chunksize=max(1, len(paths) // 32)))
+
+    questions: Dict[str, Question] = {}
+    errors: List[str] = []
+    for records, packet_errors in results:
+        errors.extend(packet_errors)
+        for record in records:
+            questions.setdefault(record["id"], Question.from_dict(record))
+    return list(questions.values()), errors
+
+
+class ImportReport:
+    """Outcome of a bulk import: how many questions were read, added, duplicated or rejected."""
+
+    def __init__(self, packets: int, parsed: int, added: int, errors: List[str], seconds: float):
+        self.packets = packets
+        self.parsed = parsed
+        self.added = added
+        self.duplicates = parsed - added
+        self.errors = errors
+        self.seconds = seconds
+
+    @property
+    def rate(self) -> float:
+        return self.parsed / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"Imported {self.added} new questions from {self.packets} packets "
+                f"({self.duplicates} duplicates, {len(self.errors)} rejected) "
+                f"in {self.seconds:.2f} s, {self.rate:.0f} questions/s")
+
+
+def import_packets(store, paths: Sequence[str], defaults: Optional[Dict] = None, workers: Optional[int] = None) -> ImportReport:
+    start = time.perf_counter()
+    paths = find_packets(paths)
+    questions, errors = parse_packets(paths, defaults, workers)
+    added = store.add_many(questions)  # One commit; the store drops questions it already has
+    return ImportReport(len(paths), len(questions), added, errors, time.perf_counter() - start)
+
+
+class PacketParser:
+    """Run parse_packets on a background thread so the Tk event loop stays responsive.
+
+    The store is not touched here; once done, the caller commits the result on the Tk thread.
+    """
+
+    def __init__(self, paths: Sequence[str], defaults: Optional[Dict] = None):
+        self.paths = find_packets(paths)
+        self.defaults = defaults
+        self.started = time.perf_counter()
+        self.questions: List[Question] = []
+        self.errors: List[str] = []
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def _run(self):
+        try:
+            self.questions, self.errors = parse_packets(self.paths, self.defaults)
+        except Exception as error:  # A crashed worker pool must still end the wait in the UI
+            self.errors = [f"Import failed: {error}"]
+
+    @property
+    def done(self) -> bool:
+        return not self.thread.is_alive()
+
+    def commit(self, store) -> ImportReport:
+        added = store.add_many(self.questions)
+        return ImportReport(len(self.paths), len(self.questions), added, self.errors, time.perf_counter() - self.started)
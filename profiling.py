@@ -0,0 +1,99 @@
+"""Opt-in timing of Tk callbacks and event-loop lag, exported as a JSON or CSV trace.
+
+Nothing here runs unless a Profiler is created: ContentView only wraps its callbacks when
+it is given one, and TkScheduler only measures lag when it has one, so a normal launch
+pays nothing but a None check per scheduled callback.
+"""
+import collections
+import csv
+import functools
+import json
+import os
+import time
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+PROFILE_ENV = "QUIZ_PROFILE"  # Trace path; enables profiling without the --profile flag
+MAX_EVENTS = 200_000  # Oldest events are dropped past this, so a long session can't grow without bound
+
+
+class Profiler:
+    """Records how long instrumented callbacks take and how late scheduled callbacks fire.
+
+    Each event is (kind, name, start, seconds): kind "call" is a callback's own run time,
+    kind "lag" is how long after its deadline an after() callback actually ran.
+    """
+
+    def __init__(self, path: Optional[str] = None, clock: Callable[[], float] = time.perf_counter, max_events: int = MAX_EVENTS):
+        self.path = path
+        self.clock = clock
+        self.origin = clock()
+        self.events: Deque[Tuple[str, str, float, float]] = collections.deque(maxlen=max_events)
+
+    @classmethod
+    def from_environment(cls, path: Optional[str] = None) -> Optional["Profiler"]:
+        """A profiler writing to path or $QUIZ_PROFILE, or None if neither is set."""
+        path = path or os.environ.get(PROFILE_ENV)
+        return cls(path) if path else None
+
+    def record(self, kind: str, name: str, start: float, seconds: float):
+        self.events.append((kind, name, start - self.origin, seconds))
+
+    def wrap(self, name: str, callback: Callable) -> Callable:
+        """callback, timed under name on every call."""
+        @functools.wraps(callback)
+        def timed(*args, **kwargs):
+            start = self.clock()
+            try:
+                return callback(*args, **kwargs)
+            finally:
+                self.record("call", name, start, self.clock() - start)
+        return timed
+
+    def instrument(self, target, method_names: Iterable[str]):
+        """Replace the named methods on one object with timed versions.
+
+        Call it before the methods are handed to Tk as commands or bindings, since those
+        keep the bound method they were given.
+        """
+        for name in method_names:
+            setattr(target, name, self.wrap(name, getattr(target, name)))
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per kind and name: count, total, mean, p95 and max in milliseconds."""
+        grouped: Dict[str, List[float]] = {}
+        for kind, name, _, seconds in self.events:
+            grouped.setdefault(f"{kind}:{name}", []).append(seconds)
+        summary = {}
+        for key, durations in sorted(grouped.items()):
+            durations.sort()
+            summary[key] = {
+                "count": len(durations),
+                "total_ms": sum(durations) * 1000,
+                "mean_ms": sum(durations) / len(durations) * 1000,
+                "p95_ms": durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1000,
+                "max_ms": durations[-1] * 1000,
+            }
+        return summary
+
+    def format_summary(self) -> str:
+        lines = [f"{'event':36} {'count':>7} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+        for key, stats in self.summary().items():
+            lines.append(f"{key:36} {stats['count']:7d} {stats['mean_ms']:9.3f} {stats['p95_ms']:9.3f} {stats['max_ms']:9.3f}")
+        return "\n".join(lines)
+
+    def export(self, path: Optional[str] = None):
+        """Write the trace as CSV if the path ends in .csv, otherwise as JSON with the summary."""
+        path = path or self.path
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="", encoding="utf-8") as file:
+                writer = csv.writer(file)
+                writer.writerow(["kind", "name", "start_s", "duration_ms"])
+                for kind, name, start, seconds in self.events:
+                    writer.writerow([kind, name, f"{start:.6f}", f"{seconds * 1000:.3f}"])
+            return
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({
+                "summary": self.summary(),
+                "events": [{"kind": kind, "name": name, "start_s": start, "duration_ms": seconds * 1000}
+                           for kind, name, start, seconds in self.events],
+            }, file, indent=4)
@@ -0,0 +1,1251 @@
+"""Question bank storage: streaming JSON loading, the edit journal and the JSON, sharded, compiled and SQLite stores."""
+import collections
+import hashlib
+import json
+import mmap
+import os
+import queue
+import sqlite3
+import struct
+import sys
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from quiz_engine import FacetCounts, Question, QuestionIndex, TextSearchIndex
+
+
+def iter_question_records(path: str, chunk_size: int = 64 * 1024) -> Iterator[Dict]:
+    """Yield question dicts from a JSON array or JSON Lines file without parsing it all at once."""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as file:
+        buffer = file.read(chunk_size)
+        pos = 0
+        eof = not buffer
+
+        # Skip the opening bracket of a JSON array; anything else is treated as JSON Lines
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+        if pos < len(buffer) and buffer[pos] == "[":
+            pos += 1
+
+        while True:
+            # Skip separators between records
+            while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == ","):
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            if pos >= len(buffer):
+                if eof:
+                    return
+                buffer = buffer[pos:] + file.read(chunk_size)
+                pos = 0
+                eof = len(buffer) == 0
+                continue
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # The record straddles the chunk boundary, read more and retry
+                more = file.read(chunk_size)
+                eof = not more
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+            yield record
+            pos = end
+
+
+def file_fingerprint(*paths: str) -> Tuple:
+    """(size, mtime) of each path, or None for a missing one; changes whenever any file does."""
+    fingerprint = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            fingerprint.append((stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            fingerprint.append(None)
+    return tuple(fingerprint)
+
+
+def save_search_index(index: TextSearchIndex, path: str, fingerprint: Tuple):
+    """Persist a search index as plain JSON with the fingerprint of the bank it was built from.
+
+    JSON rather than pickle, so a planted or shared questions.search can't run code when loaded.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump({"version": TextSearchIndex.VERSION, "fingerprint": fingerprint, "index": index.to_data()},
+                  file, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+
+def load_search_index(path: str, fingerprint: Tuple) -> Optional[TextSearchIndex]:
+    """The index saved at path if it was built from the same bank files, otherwise None."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            saved = json.load(file)
+        if saved["version"] != TextSearchIndex.VERSION:
+            return None
+        # JSON turns the fingerprint's tuples into lists
+        if tuple(tuple(entry) if entry is not None else None for entry in saved["fingerprint"]) != fingerprint:
+            return None
+        return TextSearchIndex.from_data(saved["index"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+class QuestionJournal:
+    """Append-only log of add/delete records layered on top of the questions.json snapshot.
+
+    Edits append one JSON line and fsync it, so they cost O(1) I/O. Compaction folds the
+    journal into a fresh snapshot on a background thread: the live journal is first renamed
+    aside, the snapshot is written to a temp file and atomically renamed over questions.json,
+    and only then is the renamed journal removed. A crash at any point leaves a snapshot plus
+    journal(s) that replay to the same bank.
+    """
+
+    def __init__(self, snapshot_path: str, journal_path: str, compact_every: int = 500):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.pending_path = journal_path + ".compacting"
+        self.compact_every = compact_every
+        self.records = 0
+        self.file = None
+        self.compactor = None
+
+    def open(self):
+        """Open the journal for appending; call after the bank has been loaded."""
+        self.records = self.count_records(self.journal_path)
+        self.file = open(self.journal_path, "a", encoding="utf-8")
+
+    @staticmethod
+    def count_records(path: str) -> int:
+        if not os.path.exists(path):
+            return 0
+        with open(path, "r", encoding="utf-8") as file:
+            return sum(1 for line in file if line.strip())
+
+    def read_records(self) -> Iterator[Dict]:
+        """Yield journal records oldest first, including a journal left over from an interrupted compaction."""
+        for path in (self.pending_path, self.journal_path):
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # A torn final write from a crash; everything after it is lost anyway
+
+    def pending_changes(self):
+        """Fold the journal into (IDs deleted from the snapshot, questions added after it by ID)."""
+        deleted: Set[str] = set()
+        added: Dict[str, Question] = {}
+        for record in self.read_records():
+            if record["op"] == "add":
+                question = Question.from_dict(record["question"])
+                added[question.id] = question
+            elif record["op"] == "delete":
+                added.pop(record["id"], None)
+                deleted.add(record["id"])
+        return deleted, added
+
+    def record_add(self, question: Question):
+        self.append({"op": "add", "question": question.to_dict()})
+
+    def record_adds(self, questions: Iterable[Question]):
+        """Journal many adds behind a single fsync."""
+        self.append_many({"op": "add", "question": question.to_dict()} for question in questions)
+
+    def record_delete(self, question: Question):
+        self.append({"op": "delete", "id": question.id})
+
+    def append(self, record: Dict):
+        self.append_many([record])
+
+    def append_many(self, records: Iterable[Dict]):
+        count = 0
+        for record in records:
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.records += count
+
+    def needs_compaction(self) -> bool:
+        return self.records >= self.compact_every
+
+    def compacting(self) -> bool:
+        return self.compactor is not None and self.compactor.is_alive()
+
+    def compact(self, questions: List[Question], wait: bool = False):
+        """Write questions as the new snapshot on a background thread and retire the journal."""
+        if self.compacting():
+            if not wait:
+                return
+            self.compactor.join()  # Then compact again, so edits made since it started are folded in too
+        self.file.close()
+        if os.path.exists(self.pending_path):
+            # A previous compaction was interrupted; keep its records ahead of the current ones
+            with open(self.journal_path, "r", encoding="utf-8") as src, open(self.pending_path, "a", encoding="utf-8") as dst:
+                dst.write(src.read())
+            os.remove(self.journal_path)
+        elif os.path.exists(self.journal_path):
+            os.replace(self.journal_path, self.pending_path)
+        self.file = open(self.journal_path, "a", encoding="utf-8")
+        self.records = 0
+
+        # Questions are never mutated in place, so a shallow copy is a consistent snapshot
+        self.compactor = threading.Thread(target=self.write_snapshot, args=(list(questions),), daemon=True)
+        self.compactor.start()
+        if wait:
+            self.compactor.join()
+
+    def write_snapshot(self, questions: List[Question]):
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump([q.to_dict() for q in questions], file, indent=4, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        if os.path.exists(self.pending_path):
+            os.remove(self.pending_path)
+
+
+def read_question_bank(snapshot_path: str, journal: QuestionJournal) -> Iterator[Question]:
+    """Yield the question bank: the snapshot file with the journal replayed on top of it."""
+    deleted, added = journal.pending_changes()
+    records = iter_question_records(snapshot_path) if os.path.exists(snapshot_path) else iter(())
+    for record in records:
+        question = Question.from_dict(record)
+        if question.id in deleted:
+            continue
+        # The snapshot may already contain journal adds if a compaction was interrupted
+        added.pop(question.id, None)
+        yield question
+    yield from added.values()
+
+
+class QuestionLoader:
+    """Parse questions on a background thread and hand them in batches to the Tk event loop.
+
+    The first batch holds a single question so something can be shown right away; later
+    batches grow up to batch_size. The worker never touches Tk, it only fills a queue.
+    """
+
+    def __init__(self, questions: Iterator[Question], batch_size: int = 2000):
+        self.questions = questions
+        self.batch_size = batch_size
+        self.batches: "queue.Queue" = queue.Queue()
+        self.done = False
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def _run(self):
+        batch: List[Question] = []
+        limit = 1
+        try:
+            for question in self.questions:
+                question.answer_key  # Precompute answer matching forms here rather than on the Tk thread
+                batch.append(question)
+                if len(batch) >= limit:
+                    self.batches.put(batch)
+                    batch = []
+                    limit = min(limit * 4, self.batch_size)
+            if batch:
+                self.batches.put(batch)
+        except (ValueError, KeyError, TypeError, AttributeError, OSError) as error:
+            self.error = error  # Malformed JSON or records, or a file that isn't UTF-8
+        finally:
+            self.batches.put(None)  # Sentinel: loading finished, even if it failed
+
+    def drain(self, max_batches: int = 8) -> List[List[Question]]:
+        """Return the batches parsed so far, at most max_batches per call."""
+        batches = []
+        while len(batches) < max_batches:
+            try:
+                batch = self.batches.get_nowait()
+            except queue.Empty:
+                break
+            if batch is None:
+                self.done = True
+                break
+            batches.append(batch)
+        return batches
+
+
+class JsonQuestionStore:
+    """Question bank held in memory and persisted as questions.json plus an edit journal.
+
+    This and SqliteQuestionStore share one small interface so ContentView doesn't care
+    where questions live: open_loader/ingest/finish_loading, filter, get, entries, search,
+    add, delete, save, len() and a facets attribute counting what the filters can match.
+    Questions are addressed by their stable ID.
+    """
+
+    def __init__(self, snapshot_path: str = "questions.json", journal_path: str = "questions.journal", search_path: Optional[str] = None):
+        self.snapshot_path = snapshot_path
+        # The search index is saved here and reused while the snapshot and journal are unchanged
+        self.search_path = search_path or os.path.splitext(snapshot_path)[0] + ".search"
+        self.index = QuestionIndex()  # Also the ID -> question map, in bank order
+        self.facets = FacetCounts()
+        self.journal = QuestionJournal(snapshot_path, journal_path)
+
+        # The search index is built off the Tk thread once loading is done
+        self.search_index: Optional[TextSearchIndex] = None
+        self.search_building: Optional[TextSearchIndex] = None
+        self.search_builder = None
+        self.search_backlog: List[Tuple[str, Question]] = []  # Edits made while it builds
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, question_id: str):
+        return question_id in self.index
+
+    def open_loader(self) -> Optional[QuestionLoader]:
+        """Return a loader that streams the bank from disk, or None if there is nothing to read."""
+        if not os.path.exists(self.snapshot_path) and not os.path.exists(self.journal.journal_path):
+            self.journal.open()
+            return None  # Start with an empty bank if the file doesn't exist
+        return QuestionLoader(read_question_bank(self.snapshot_path, self.journal))
+
+    def ingest(self, batch: List[Question]):
+        """Merge a batch produced by the loader; repeated IDs are dropped."""
+        for question in batch:
+            if self.index.add(question):
+                self.facets.add(question)
+
+    def finish_loading(self):
+        self.journal.open()
+        self.build_search_index()
+
+    def build_search_index(self):
+        """Load the saved search index, or tokenize the whole bank and save it, on a background thread.
+
+        Building takes seconds for large banks. The saved copy is keyed by the size and mtime
+        of the snapshot and journal files, so any edit or compaction makes the next launch
+        rebuild it.
+        """
+        questions = list(self.index)
+        journal = self.journal
+        fingerprint = file_fingerprint(self.snapshot_path, journal.journal_path, journal.pending_path)
+
+        def build():
+            index = load_search_index(self.search_path, fingerprint)
+            if index is None:
+                index = TextSearchIndex()
+                for question in questions:
+                    index.add(question)
+                try:
+                    save_search_index(index, self.search_path, fingerprint)
+                except OSError:
+                    pass  # Only a cache; the next launch rebuilds it
+            self.search_building = index
+
+        self.search_builder = threading.Thread(target=build, daemon=True)
+        self.search_builder.start()
+
+    def ready_search_index(self) -> Optional[TextSearchIndex]:
+        """The search index once the background build has finished, with pending edits applied."""
+        if self.search_index is None and self.search_builder is not None and not self.search_builder.is_alive():
+            self.search_index = self.search_building
+            self.search_builder = self.search_building = None
+            for op, question in self.search_backlog:
+                if op == "add":
+                    self.search_index.add(question)
+                else:
+                    self.search_index.remove(question.id)
+            self.search_backlog = []
+        return self.search_index
+
+    def update_search_index(self, op: str, question: Question):
+        index = self.ready_search_index()
+        if index is None:
+            self.search_backlog.append((op, question))
+        elif op == "add":
+            index.add(question)
+        else:
+            index.remove(question.id)
+
+    def filter(self, year: int, difficulty: str, subjects: Set[str]) -> List[Question]:
+        return self.index.filter(year, difficulty, subjects)
+
+    def get(self, question_id: str) -> Optional[Question]:
+        return self.index.get(question_id)
+
+    def entries(self) -> List[Tuple[str, str]]:
+        """(id, text) for every question in bank order."""
+        return [(q.id, q.text) for q in self.index]
+
+    def entries_reader(self) -> Callable[[], List[Tuple[str, str]]]:
+        """entries() as a function another thread can call while this one keeps editing the bank."""
+        questions = list(self.index)  # References only; the (id, text) pairs are built by the caller
+        return lambda: [(q.id, q.text) for q in questions]
+
+    def search(self, query: str) -> List[Tuple[str, str]]:
+        """(id, text) of questions matching every word of the query as a prefix, best first."""
+        if not query.strip():
+            return self.entries()
+        return [(q.id, q.text) for q in self.find(query)]
+
+    def find(self, query: str, limit: Optional[int] = None) -> List[Question]:
+        """Questions whose text or answer match every word of the query as a prefix, best first."""
+        index = self.ready_search_index()
+        if index is None:
+            # Still indexing; fall back to scanning in bank order so search works right after startup
+            words = TextSearchIndex.tokenize(query)
+            return [q for q in self.index if words and TextSearchIndex.matches(q, words)][:limit]
+        return [self.index.get(question_id) for question_id in index.search(query, limit)]
+
+    def add(self, question: Question) -> bool:
+        """Add a question in O(1); returns False if the same question is already in the bank."""
+        if not self.index.add(question):
+            return False
+        self.facets.add(question)
+        self.update_search_index("add", question)
+        self.journal.record_add(question)
+        self.compact_if_needed()
+        return True
+
+    def add_many(self, questions: Iterable[Question]) -> int:
+        """Add many questions behind one journal fsync, returning how many were new."""
+        added = [question for question in questions if self.index.add(question)]
+        for question in added:
+            self.facets.add(question)
+            self.update_search_index("add", question)
+        self.journal.record_adds(added)
+        self.compact_if_needed()
+        return len(added)
+
+    def delete(self, question_id: str) -> Optional[Question]:
+        """Delete a question by ID in O(1), returning it."""
+        question = self.index.remove(question_id)
+        if question is not None:
+            self.facets.remove(question)
+            self.update_search_index("remove", question)
+            self.journal.record_delete(question)
+            self.compact_if_needed()
+        return question
+
+    def compact_if_needed(self):
+        """Fold the journal into the snapshot once enough edits have piled up."""
+        if self.journal.needs_compaction():
+            self.save()
+
+    def save(self, wait: bool = False):
+        """Compact the journal into a fresh snapshot in the background, or before returning with wait."""
+        self.journal.compact(list(self.index), wait)
+
+
+class SqliteQuestionStore:
+    """Question bank kept in a local SQLite file and queried through indexes.
+
+    Nothing is materialized up front: filtering, lookup and deletion are indexed queries,
+    so memory use doesn't grow with the bank. Subjects live in their own table so a
+    subject filter is an index lookup as well, and search uses an FTS5 table kept in sync
+    by triggers.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS questions (
+            id INTEGER PRIMARY KEY,
+            qid TEXT NOT NULL UNIQUE,
+            text TEXT NOT NULL,
+            answer TEXT NOT NULL,
+            difficulty TEXT NOT NULL,
+            year INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS question_subjects (
+            subject TEXT NOT NULL,
+            question_id INTEGER NOT NULL REFERENCES questions(id) ON DELETE CASCADE,
+            PRIMARY KEY (subject, question_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_questions_year_difficulty ON questions(year, difficulty);
+        CREATE INDEX IF NOT EXISTS idx_question_subjects_question ON question_subjects(question_id);
+        CREATE VIRTUAL TABLE IF NOT EXISTS question_search USING fts5(
+            text, answer, content='questions', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+        );
+        CREATE TRIGGER IF NOT EXISTS questions_search_insert AFTER INSERT ON questions BEGIN
+            INSERT INTO question_search (rowid, text, answer) VALUES (new.id, new.text, new.answer);
+        END;
+        CREATE TRIGGER IF NOT EXISTS questions_search_delete AFTER DELETE ON questions BEGIN
+            INSERT INTO question_search (question_search, rowid, text, answer) VALUES ('delete', old.id, old.text, old.answer);
+        END;
+    """
+
+    SELECT = """
+        SELECT q.qid, q.text, q.answer, q.difficulty, q.year,
+               (SELECT group_concat(s.subject, char(31)) FROM question_subjects s WHERE s.question_id = q.id)
+        FROM questions q
+    """
+
+    def __init__(self, path: str = "questions.db"):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        search_sql = self.connection.execute("SELECT sql FROM sqlite_master WHERE name = 'question_search'").fetchone()
+        if search_sql and "answer" not in search_sql[0]:
+            # Indexed before answers were searchable; recreate the table and its triggers with them
+            self.connection.executescript("""
+                DROP TRIGGER IF EXISTS questions_search_insert;
+                DROP TRIGGER IF EXISTS questions_search_delete;
+                DROP TABLE question_search;
+            """)
+            search_sql = None
+        self.connection.executescript(self.SCHEMA)
+        if not search_sql:
+            # Databases imported before search (or answer search) existed need the FTS table filled once
+            with self.connection:
+                self.connection.execute("INSERT INTO question_search (question_search) VALUES ('rebuild')")
+        self.facets = self.count_facets()
+
+    def count_facets(self) -> FacetCounts:
+        """Two grouped queries at startup; edits keep the counts current after that."""
+        facets = FacetCounts()
+        subjects: Dict[Tuple[int, str], Dict[str, int]] = {}
+        for year, difficulty, subject, count in self.connection.execute(
+                "SELECT q.year, q.difficulty, s.subject, COUNT(*) FROM question_subjects s"
+                " JOIN questions q ON q.id = s.question_id GROUP BY q.year, q.difficulty, s.subject"):
+            subjects.setdefault((year, difficulty), {})[subject] = count
+        for year, difficulty, count in self.connection.execute("SELECT year, difficulty, COUNT(*) FROM questions GROUP BY year, difficulty"):
+            facets.set_group(year, difficulty, count, subjects.get((year, difficulty), {}))
+        return facets
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+
+    def __contains__(self, question_id: str):
+        return self.connection.execute("SELECT 1 FROM questions WHERE qid = ?", (question_id,)).fetchone() is not None
+
+    @staticmethod
+    def _question(row) -> Question:
+        qid, text, answer, difficulty, year, subjects = row
+        return Question(text, answer, subjects.split("\x1f") if subjects else [], difficulty, year, qid)
+
+    def open_loader(self) -> Optional[QuestionLoader]:
+        return None  # Queries go straight to the database, there is nothing to preload
+
+    def ingest(self, batch: List[Question]):
+        pass
+
+    def finish_loading(self):
+        pass
+
+    def filter(self, year: int, difficulty: str, subjects: Set[str]) -> List[Question]:
+        query = self.SELECT + " WHERE q.year = ? AND q.difficulty = ?"
+        params: List = [year, difficulty]
+        if subjects:
+            placeholders = ", ".join("?" * len(subjects))
+            query += f" AND q.id IN (SELECT question_id FROM question_subjects WHERE subject IN ({placeholders}))"
+            params.extend(sorted(subjects))
+        query += " ORDER BY q.id"
+        return [self._question(row) for row in self.connection.execute(query, params)]
+
+    def get(self, question_id: str) -> Optional[Question]:
+        row = self.connection.execute(self.SELECT + " WHERE q.qid = ?", (question_id,)).fetchone()
+        return self._question(row) if row else None
+
+    def entries(self) -> List[Tuple[str, str]]:
+        return self.connection.execute("SELECT qid, text FROM questions ORDER BY id").fetchall()
+
+    def entries_reader(self) -> Callable[[], List[Tuple[str, str]]]:
+        """entries() as a function another thread can call; it reads through a connection of its own."""
+        def read() -> List[Tuple[str, str]]:
+            connection = sqlite3.connect(self.path)
+            try:
+                return connection.execute("SELECT qid, text FROM questions ORDER BY id").fetchall()
+            finally:
+                connection.close()
+        return read
+
+    def search(self, query: str) -> List[Tuple[str, str]]:
+        if not TextSearchIndex.tokenize(query):
+            return self.entries()
+        return [(q.id, q.text) for q in self.find(query)]
+
+    def find(self, query: str, limit: Optional[int] = None) -> List[Question]:
+        """Questions matching every word of the query as a prefix, ranked by bm25 with answers weighted up."""
+        words = TextSearchIndex.tokenize(query)
+        if not words:
+            return []
+        match = " AND ".join('"' + word.replace('"', '""') + '"*' for word in words)
+        rows = self.connection.execute(
+            self.SELECT + " JOIN question_search ON question_search.rowid = q.id"
+            f" WHERE question_search MATCH ? ORDER BY bm25(question_search, 1.0, {TextSearchIndex.ANSWER_WEIGHT:.1f}), q.id LIMIT ?",
+            (match, -1 if limit is None else limit),
+        )
+        return [self._question(row) for row in rows]
+
+    def add(self, question: Question) -> bool:
+        with self.connection:
+            return self._insert(question)
+
+    def add_many(self, questions: Iterable[Question]) -> int:
+        """Insert many questions in a single transaction, returning how many were new."""
+        count = 0
+        with self.connection:
+            for question in questions:
+                count += self._insert(question)
+        return count
+
+    def _insert(self, question: Question) -> bool:
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO questions (qid, text, answer, difficulty, year) VALUES (?, ?, ?, ?, ?)",
+            (question.id, question.text, question.answer, question.difficulty, question.year),
+        )
+        if cursor.rowcount == 0:
+            return False  # Already in the bank
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO question_subjects (subject, question_id) VALUES (?, ?)",
+            [(subject, cursor.lastrowid) for subject in question.subjects],
+        )
+        self.facets.add(question)
+        return True
+
+    def delete(self, question_id: str) -> Optional[Question]:
+        question = self.get(question_id)
+        if question is not None:
+            with self.connection:
+                self.connection.execute("DELETE FROM questions WHERE qid = ?", (question_id,))
+            self.facets.remove(question)
+        return question
+
+    def save(self, wait: bool = False):
+        self.connection.commit()
+
+
+class ShardedQuestionStore:
+    """Question bank split into one JSON file per year and difficulty, plus a small manifest.
+
+    Startup reads only the manifest (per shard: file, question count and count per subject). A filter
+    always names one year and one difficulty, so it parses at most one shard, and parsed shards
+    are kept in a small LRU cache. Which shard holds a question comes from an ID index written
+    next to the manifest, so a lookup by ID reads no shard but its own. Adding or deleting a
+    question rewrites only its shard, the manifest and the ID index. Listing and searching the
+    whole bank stream the shards that aren't cached.
+    """
+
+    MANIFEST = "manifest.json"
+    ID_INDEX = "ids.json"  # {"shards": {shard key: [question IDs]}}, rewritten with the manifest
+
+    def __init__(self, directory: str = "questions", cache_size: int = 8):
+        self.directory = directory
+        self.cache_size = cache_size
+        self.cache: "collections.OrderedDict[str, QuestionIndex]" = collections.OrderedDict()
+        self.shard_of: Dict[str, str] = {}  # question.id -> shard key, from the ID index or read shards
+        self.located_all = False  # Whether shard_of holds every question in the bank
+        self.search_index: Optional[TextSearchIndex] = None  # Built by the first search, then kept up to date
+        with open(os.path.join(directory, self.MANIFEST), "r", encoding="utf-8") as file:
+            self.shards: Dict[str, Dict] = json.load(file)["shards"]
+        legacy = [key for key, manifest in self.shards.items() if isinstance(manifest["subjects"], list)]
+        for key in legacy:
+            # Written before the manifest counted subjects; count them once and keep the counts
+            self.shards[key]["subjects"] = subject_counts(self.shard_questions(key))
+        if legacy:
+            self.write_manifest()
+        self.facets = FacetCounts()
+        for manifest in self.shards.values():
+            self.facets.set_group(manifest["year"], manifest["difficulty"], manifest["count"], manifest["subjects"])
+
+    def __len__(self):
+        return sum(shard["count"] for shard in self.shards.values())
+
+    def __contains__(self, question_id: str):
+        return self.get(question_id) is not None
+
+    @staticmethod
+    def shard_key(year: int, difficulty: str) -> str:
+        return f"{year}-{difficulty}"
+
+    def open_loader(self) -> Optional[QuestionLoader]:
+        return None  # Shards are parsed when a filter first needs them
+
+    def ingest(self, batch: List[Question]):
+        pass
+
+    def finish_loading(self):
+        pass
+
+    def read_shard(self, key: str) -> Iterator[Question]:
+        for record in iter_question_records(os.path.join(self.directory, self.shards[key]["file"])):
+            question = Question.from_dict(record)
+            self.shard_of[question.id] = key
+            yield question
+
+    def shard(self, key: str) -> QuestionIndex:
+        """The parsed shard, from the cache if it is there; evicts the least recently used."""
+        index = self.cache.get(key)
+        if index is not None:
+            self.cache.move_to_end(key)
+            return index
+        return self.cache_shard(key, QuestionIndex(self.read_shard(key)))
+
+    def cache_shard(self, key: str, index: QuestionIndex) -> QuestionIndex:
+        self.cache[key] = index
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return index
+
+    def shard_questions(self, key: str) -> Iterable[Question]:
+        """Every question of a shard without caching it, for whole-bank scans."""
+        index = self.cache.get(key)
+        return index if index is not None else self.read_shard(key)
+
+    def filter(self, year: int, difficulty: str, subjects: Set[str]) -> List[Question]:
+        key = self.shard_key(year, difficulty)
+        manifest = self.shards.get(key)
+        # The manifest alone rules out empty shards and subjects a shard doesn't have
+        if manifest is None or (subjects and not subjects.intersection(manifest["subjects"])):
+            return []
+        return self.shard(key).filter(year, difficulty, subjects)
+
+    def locate(self, question_id: str) -> Optional[str]:
+        """The key of the shard holding a question, or None if no shard does."""
+        key = self.shard_of.get(question_id)
+        if key is None and not self.located_all:
+            self.locate_all()
+            key = self.shard_of.get(question_id)
+        return key if key in self.shards else None
+
+    def locate_all(self):
+        """Learn the shard of every question, once, so an add can reject an ID another shard holds.
+
+        Reads the ID index; only a bank without one, or with one that doesn't match the
+        manifest's counts (say after a crash between the two writes), has every shard
+        scanned, and the index is then written for next time.
+        """
+        if self.located_all:
+            return
+        shard_ids = self.read_id_index()
+        if shard_ids is None:
+            shard_ids = {key: [question.id for question in self.shard_questions(key)] for key in self.shards}
+            self.write_id_index(shard_ids)
+        for key, question_ids in shard_ids.items():
+            for question_id in question_ids:
+                self.shard_of[question_id] = key
+        self.located_all = True
+
+    def read_id_index(self) -> Optional[Dict[str, List[str]]]:
+        """Question IDs per shard from the ID index, or None if it is missing or out of date."""
+        try:
+            with open(os.path.join(self.directory, self.ID_INDEX), "r", encoding="utf-8") as file:
+                shard_ids = json.load(file)["shards"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if not isinstance(shard_ids, dict) or shard_ids.keys() != self.shards.keys():
+            return None
+        if any(len(shard_ids[key]) != manifest["count"] for key, manifest in self.shards.items()):
+            return None
+        return shard_ids
+
+    def write_id_index(self, shard_ids: Optional[Dict[str, List[str]]] = None):
+        if shard_ids is None:
+            shard_ids = {key: [] for key in self.shards}
+            for question_id, key in self.shard_of.items():
+                shard_ids[key].append(question_id)
+        write_json_atomic(os.path.join(self.directory, self.ID_INDEX), {"shards": shard_ids})
+
+    def get(self, question_id: str) -> Optional[Question]:
+        key = self.locate(question_id)
+        return self.shard(key).get(question_id) if key is not None else None
+
+    def entries(self) -> List[Tuple[str, str]]:
+        """(id, text) for every question, shard by shard."""
+        return [(q.id, q.text) for key in sorted(self.shards) for q in self.shard_questions(key)]
+
+    def entries_reader(self) -> Callable[[], List[Tuple[str, str]]]:
+        """entries() as a function another thread can call; it reads shard files without touching the cache."""
+        cached = {key: list(index) for key, index in self.cache.items()}
+        paths = {key: os.path.join(self.directory, manifest["file"]) for key, manifest in self.shards.items()}
+
+        def read() -> List[Tuple[str, str]]:
+            entries = []
+            for key in sorted(paths):
+                if key in cached:
+                    entries.extend((q.id, q.text) for q in cached[key])
+                else:
+                    entries.extend((q.id, q.text) for q in map(Question.from_dict, iter_question_records(paths[key])))
+            return entries
+        return read
+
+    def search(self, query: str) -> List[Tuple[str, str]]:
+        if not query.strip():
+            return self.entries()
+        return [(q.id, q.text) for q in self.find(query)]
+
+    def find(self, query: str, limit: Optional[int] = None) -> List[Question]:
+        """Ranked like the JSON store; the index over every shard is built on the first search."""
+        if self.search_index is None:
+            self.search_index = TextSearchIndex()
+            for key in sorted(self.shards):
+                for question in self.shard_questions(key):
+                    self.search_index.add(question)
+        found = [self.get(question_id) for question_id in self.search_index.search(query, limit)]
+        return [question for question in found if question is not None]
+
+    def add(self, question: Question) -> bool:
+        """Add a question to its shard, creating the shard if it is the first of its year and difficulty."""
+        return self.add_many([question]) == 1
+
+    def add_many(self, questions: Iterable[Question]) -> int:
+        """Add many questions, rewriting each affected shard and the manifest once; returns how many were new."""
+        touched: Dict[str, QuestionIndex] = {}  # Held here so a touched shard can't be evicted before it's written
+        added = 0
+        self.locate_all()  # IDs are unique across the bank, not just within a shard
+        for question in questions:
+            if question.id in self.shard_of:
+                continue
+            key = self.shard_key(question.year, question.difficulty)
+            if key not in self.shards:
+                self.shards[key] = {"file": f"{key}.json", "year": question.year, "difficulty": question.difficulty, "count": 0, "subjects": {}}
+                self.cache_shard(key, QuestionIndex())
+            index = touched[key] if key in touched else self.shard(key)
+            if index.add(question):
+                self.shard_of[question.id] = key
+                touched[key] = index
+                added += 1
+                if self.search_index is not None:
+                    self.search_index.add(question)
+        for key, index in touched.items():
+            self.write_shard(key, index)
+        if touched:
+            self.write_manifest()
+        return added
+
+    def delete(self, question_id: str) -> Optional[Question]:
+        key = self.locate(question_id)
+        if key is None:
+            return None
+        index = self.shard(key)
+        question = index.remove(question_id)
+        if question is not None:
+            del self.shard_of[question_id]
+            if self.search_index is not None:
+                self.search_index.remove(question_id)
+            self.write_shard(key, index)
+            self.write_manifest()
+        return question
+
+    def write_shard(self, key: str, index: QuestionIndex):
+        """Atomically rewrite one shard file and update its manifest entry (write_manifest saves it)."""
+        manifest = self.shards[key]
+        write_json_atomic(os.path.join(self.directory, manifest["file"]), [q.to_dict() for q in index])
+        manifest["count"] = len(index)
+        manifest["subjects"] = subject_counts(index)
+        self.facets.set_group(manifest["year"], manifest["difficulty"], manifest["count"], manifest["subjects"])
+
+    def write_manifest(self):
+        if self.located_all:
+            self.write_id_index()  # Otherwise shard_of is partial; the next locate_all rebuilds the index
+        write_json_atomic(os.path.join(self.directory, self.MANIFEST), {"shards": self.shards})
+
+    def save(self, wait: bool = False):
+        pass  # Every edit has already rewritten its shard
+
+
+BANK_MAGIC = b"QPBANK\r\n"  # The line ending bytes catch a bank mangled by a text-mode transfer
+BANK_VERSION = 1
+BANK_HEADER = struct.Struct("<8sIIQQQQQQ")  # magic, version, count, then offset and length of labels, records, ids, blob
+# year, difficulty code, subject bit mask, blob offset, ID length, subject count, text length, answer length
+BANK_RECORD = struct.Struct("<HHQQBBII2x")
+BANK_ID = struct.Struct("<QI")  # ID hash, record number; the table is sorted by hash
+MAX_BANK_SUBJECTS = 64  # One bit each in a record's subject mask
+
+
+def bank_id_key(question_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(question_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def write_bank(path: str, questions: Iterable[Question]) -> int:
+    """Compile questions into a bank file, atomically; returns how many were written.
+
+    Layout: header, a JSON label table (difficulty and subject names, plus the first record,
+    count and subject counts of each year and difficulty), fixed-size records grouped by year
+    and difficulty in bank order, the sorted ID hash table, then one UTF-8 blob holding each
+    question's ID, text, answer and subject codes back to back.
+    """
+    groups: Dict[Tuple[int, str], List[Question]] = {}
+    for question in questions:
+        groups.setdefault((question.year, question.difficulty), []).append(question)
+    difficulties = sorted({difficulty for _, difficulty in groups})
+    subjects = sorted({subject for members in groups.values() for question in members for subject in question.subjects})
+    if len(subjects) > MAX_BANK_SUBJECTS:
+        raise ValueError(f"a compiled bank holds at most {MAX_BANK_SUBJECTS} subjects, this one has {len(subjects)}")
+    difficulty_code = {difficulty: code for code, difficulty in enumerate(difficulties)}
+    subject_code = {subject: code for code, subject in enumerate(subjects)}
+
+    records = bytearray()
+    ids = []
+    pieces = []
+    offset = 0
+    group_table = []
+    for year, difficulty in sorted(groups):
+        members = groups[(year, difficulty)]
+        group_table.append([year, difficulty_code[difficulty], len(ids), len(members), subject_counts(members)])
+        for question in members:
+            codes = bytes(subject_code[subject] for subject in question.subjects)
+            parts = [question.id.encode("utf-8"), question.text.encode("utf-8"), question.answer.encode("utf-8"), codes]
+            mask = 0
+            for code in codes:
+                mask |= 1 << code
+            records += BANK_RECORD.pack(year, difficulty_code[difficulty], mask, offset, len(parts[0]), len(codes), len(parts[1]), len(parts[2]))
+            ids.append((bank_id_key(question.id), len(ids)))
+            pieces.extend(parts)
+            offset += sum(len(part) for part in parts)
+    labels = json.dumps({"difficulties": difficulties, "subjects": subjects, "groups": group_table}, ensure_ascii=False).encode("utf-8")
+    id_table = b"".join(BANK_ID.pack(key, number) for key, number in sorted(ids))
+
+    labels_at = BANK_HEADER.size
+    records_at = labels_at + len(labels)
+    ids_at = records_at + len(records)
+    blob_at = ids_at + len(id_table)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(BANK_HEADER.pack(BANK_MAGIC, BANK_VERSION, len(ids), labels_at, len(labels), records_at, len(records), ids_at, len(id_table)))
+        file.write(labels)
+        file.write(records)
+        file.write(id_table)
+        for piece in pieces:
+            file.write(piece)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    return len(ids)
+
+
+class MappedQuestion(Question):
+    """A question from a compiled bank: text and answer stay in the mapped file until first read."""
+
+    __slots__ = ("_bank", "_start", "_text_length", "_answer_length", "_text", "_answer")
+
+    def __init__(self, bank: mmap.mmap, question_id: str, subjects: Tuple[str, ...], difficulty: str, year: int,
+                 start: int, text_length: int, answer_length: int):
+        # Question.__init__ would intern and hash; names here are already shared from the label table
+        self.id = question_id
+        self.subjects = subjects
+        self.difficulty = difficulty
+        self.year = year
+        self._answer_key = None
+        self._reveal_plan = None
+        self._bank = bank
+        self._start = start
+        self._text_length = text_length
+        self._answer_length = answer_length
+        self._text: Optional[str] = None
+        self._answer: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self._bank[self._start:self._start + self._text_length].decode("utf-8")
+        return self._text
+
+    @property
+    def answer(self) -> str:
+        if self._answer is None:
+            start = self._start + self._text_length
+            self._answer = self._bank[start:start + self._answer_length].decode("utf-8")
+        return self._answer
+
+
+class BankJournal(QuestionJournal):
+    """The edit journal of a compiled bank; compaction writes a new bank instead of JSON."""
+
+    def write_snapshot(self, questions: List[Question]):
+        try:
+            write_bank(self.snapshot_path, questions)
+        except PermissionError:
+            return  # Windows won't replace a mapped file; the journal keeps the edits until next time
+        if os.path.exists(self.pending_path):
+            os.remove(self.pending_path)
+
+
+class CompiledQuestionStore:
+    """Question bank compiled into one binary file that is memory-mapped, never parsed whole.
+
+    Opening reads the header and label table only, which already hold the filter menu counts,
+    so startup takes the same time for any bank size. A filter reads the fixed-size records of
+    its one year and difficulty and decodes question text only when it is first displayed;
+    get() binary-searches the ID table. Edits go to a journal like the JSON store's and are
+    compiled into a fresh bank when it is compacted.
+    """
+
+    def __init__(self, path: str = "questions.bank", journal_path: Optional[str] = None):
+        self.path = path
+        with open(path, "rb") as file:
+            self.bank = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, labels_at, labels_length, self.records_at, _, self.ids_at, ids_length = BANK_HEADER.unpack_from(self.bank)
+        if magic != BANK_MAGIC or version != BANK_VERSION:
+            raise ValueError(f"{path} is not a version {BANK_VERSION} compiled question bank")
+        self.blob_at = self.ids_at + ids_length
+        labels = json.loads(self.bank[labels_at:labels_at + labels_length])
+        self.difficulties = [sys.intern(name) for name in labels["difficulties"]]
+        self.subjects = [sys.intern(name) for name in labels["subjects"]]
+        self.groups: Dict[Tuple[int, str], Tuple[int, int]] = {}  # (year, difficulty) -> (first record, count)
+        self.facets = FacetCounts()
+        for year, difficulty, first, count, subjects in labels["groups"]:
+            self.groups[(year, self.difficulties[difficulty])] = (first, count)
+            self.facets.set_group(year, self.difficulties[difficulty], count, subjects)
+
+        # Edits since the bank was compiled, replayed from the journal
+        self.journal = BankJournal(path, journal_path or path + ".journal")
+        deleted, added = self.journal.pending_changes()
+        self.deleted: Set[str] = set()  # IDs in the bank file that have been deleted
+        for question_id in deleted:
+            question = self.read_question(question_id)
+            if question is not None:
+                self.deleted.add(question_id)
+                self.facets.remove(question)
+        self.added = QuestionIndex()
+        for question in added.values():
+            if self.get(question.id) is None:
+                self.added.add(question)
+                self.facets.add(question)
+        self.journal.open()
+        self.search_index: Optional[TextSearchIndex] = None  # Built by the first search, then kept up to date
+
+    def __len__(self):
+        return self.count - len(self.deleted) + len(self.added)
+
+    def __contains__(self, question_id: str):
+        return self.get(question_id) is not None
+
+    def open_loader(self) -> Optional[QuestionLoader]:
+        return None  # Nothing to preload, records are read from the map as filters need them
+
+    def ingest(self, batch: List[Question]):
+        pass
+
+    def finish_loading(self):
+        pass
+
+    def question_at(self, number: int) -> MappedQuestion:
+        year, difficulty, _, offset, id_length, subject_count, text_length, answer_length = BANK_RECORD.unpack_from(
+            self.bank, self.records_at + number * BANK_RECORD.size)
+        return self.make_question(year, difficulty, offset, id_length, subject_count, text_length, answer_length)
+
+    def make_question(self, year: int, difficulty: int, offset: int, id_length: int, subject_count: int,
+                      text_length: int, answer_length: int) -> MappedQuestion:
+        start = self.blob_at + offset
+        text_at = start + id_length
+        codes_at = text_at + text_length + answer_length
+        subjects = tuple(self.subjects[code] for code in self.bank[codes_at:codes_at + subject_count])
+        return MappedQuestion(self.bank, self.bank[start:text_at].decode("utf-8"), subjects, self.difficulties[difficulty],
+                              year, text_at, text_length, answer_length)
+
+    def read_question(self, question_id: str) -> Optional[MappedQuestion]:
+        """The question as compiled into the bank file, deleted or not: a binary search of the ID table."""
+        key = bank_id_key(question_id)
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if BANK_ID.unpack_from(self.bank, self.ids_at + middle * BANK_ID.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        while low < self.count:
+            found_key, number = BANK_ID.unpack_from(self.bank, self.ids_at + low * BANK_ID.size)
+            if found_key != key:
+                return None
+            question = self.question_at(number)
+            if question.id == question_id:  # Two IDs can share a hash
+                return question
+            low += 1
+        return None
+
+    def filter(self, year: int, difficulty: str, subjects: Set[str]) -> List[Question]:
+        matches: List[Question] = []
+        first, count = self.groups.get((year, difficulty), (0, 0))
+        if count:
+            mask = 0
+            for subject in subjects:
+                if subject in self.subjects:
+                    mask |= 1 << self.subjects.index(subject)
+            if subjects and not mask:
+                count = 0  # None of the subjects is in the bank
+            start = self.records_at + first * BANK_RECORD.size
+            for record in BANK_RECORD.iter_unpack(self.bank[start:start + count * BANK_RECORD.size]):
+                if mask and not record[2] & mask:
+                    continue
+                question = self.make_question(record[0], record[1], *record[3:])
+                if question.id not in self.deleted:
+                    matches.append(question)
+        return matches + self.added.filter(year, difficulty, subjects)
+
+    def get(self, question_id: str) -> Optional[Question]:
+        question = self.added.get(question_id)
+        if question is None and question_id not in self.deleted:
+            question = self.read_question(question_id)
+        return question
+
+    def questions(self) -> Iterator[Question]:
+        """Every question: the bank file in record order, then questions added since."""
+        for number in range(self.count):
+            question = self.question_at(number)
+            if question.id not in self.deleted:
+                yield question
+        yield from self.added
+
+    def entries(self) -> List[Tuple[str, str]]:
+        return [(q.id, q.text) for q in self.questions()]
+
+    def entries_reader(self) -> Callable[[], List[Tuple[str, str]]]:
+        """entries() as a function another thread can call; records come from the map, edits are copied now."""
+        deleted = set(self.deleted)
+        added = list(self.added)
+
+        def read() -> List[Tuple[str, str]]:
+            entries = [(q.id, q.text) for q in map(self.question_at, range(self.count)) if q.id not in deleted]
+            return entries + [(q.id, q.text) for q in added]
+        return read
+
+    def search(self, query: str) -> List[Tuple[str, str]]:
+        if not query.strip():
+            return self.entries()
+        return [(q.id, q.text) for q in self.find(query)]
+
+    def find(self, query: str, limit: Optional[int] = None) -> List[Question]:
+        """Ranked like the JSON store; the index is built on the first search."""
+        if self.search_index is None:
+            self.search_index = TextSearchIndex()
+            for question in self.questions():
+                self.search_index.add(question)
+        found = [self.get(question_id) for question_id in self.search_index.search(query, limit)]
+        return [question for question in found if question is not None]
+
+    def add(self, question: Question) -> bool:
+        return self.add_many([question]) == 1
+
+    def add_many(self, questions: Iterable[Question]) -> int:
+        """Add many questions behind one journal fsync, returning how many were new."""
+        added = []
+        for question in questions:
+            if self.get(question.id) is None and self.added.add(question):
+                added.append(question)
+                self.facets.add(question)
+                if self.search_index is not None:
+                    self.search_index.add(question)
+        self.journal.record_adds(added)
+        self.compact_if_needed()
+        return len(added)
+
+    def delete(self, question_id: str) -> Optional[Question]:
+        question = self.get(question_id)
+        if question is None:
+            return None
+        if self.added.remove(question_id) is None:
+            self.deleted.add(question_id)
+        self.facets.remove(question)
+        if self.search_index is not None:
+            self.search_index.remove(question_id)
+        self.journal.record_delete(question)
+        self.compact_if_needed()
+        return question
+
+    def compact_if_needed(self):
+        if self.journal.needs_compaction():
+            self.save()
+
+    def save(self, wait: bool = False):
+        """Compile the bank and its edits into a new bank file, in the background unless wait.
+
+        This store keeps reading the file it mapped at startup, which stays valid after the
+        new one replaces it; the edits it already holds in memory carry over.
+        """
+        if self.journal.records or os.path.exists(self.journal.pending_path):
+            self.journal.compact(self.questions(), wait)
+
+
+def subject_counts(questions: Iterable[Question]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for question in questions:
+        for subject in question.subjects:
+            counts[subject] = counts.get(subject, 0) + 1
+    return dict(sorted(counts.items()))
+
+
+def write_json_atomic(path: str, data):
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=4, ensure_ascii=False)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def load_all(store):
+    """Load a whole bank on the calling thread and finish loading, for command-line tools.
+
+    Raises the loader's error rather than hand back part of a bank that a save would then truncate.
+    """
+    loader = store.open_loader()
+    if loader is not None:
+        loader.start()
+        while not loader.done:
+            for batch in loader.drain():
+                store.ingest(batch)
+            loader.thread.join(0.01)
+        if loader.error is not None:
+            raise loader.error
+    store.finish_loading()
+    return store
+
+
+def open_question_store():
+    """Use the SQLite bank if one has been imported, then a compiled bank, then a sharded bank, otherwise questions.json."""
+    if os.path.exists("questions.db"):
+        return SqliteQuestionStore("questions.db")
+    if os.path.exists("questions.bank"):
+        return CompiledQuestionStore("questions.bank")
+    if os.path.exists(os.path.join("questions", ShardedQuestionStore.MANIFEST)):
+        return ShardedQuestionStore("questions")
+    return JsonQuestionStore("questions.json", "questions.journal")
+
+
+def import_json_to_sqlite(json_path: str = "questions.json", journal_path: str = "questions.journal", db_path: str = "questions.db") -> int:
+    """One-shot import of questions.json (and any pending journal edits) into a SQLite bank."""
+    store = SqliteQuestionStore(db_path)
+    count = store.add_many(read_question_bank(json_path, QuestionJournal(json_path, journal_path)))
+    store.connection.close()
+    return count
+
+
+def shard_json_bank(json_path: str = "questions.json", journal_path: str = "questions.journal", directory: str = "questions") -> int:
+    """One-shot split of questions.json (and any pending journal edits) into per-year/difficulty shards."""
+    groups: Dict[str, List[Question]] = {}
+    for question in read_question_bank(json_path, QuestionJournal(json_path, journal_path)):
+        groups.setdefault(ShardedQuestionStore.shard_key(question.year, question.difficulty), []).append(question)
+    os.makedirs(directory, exist_ok=True)
+    shards = {}
+    for key, questions in groups.items():
+        write_json_atomic(os.path.join(directory, f"{key}.json"), [q.to_dict() for q in questions])
+        shards[key] = {
+            "file": f"{key}.json",
+            "year": questions[0].year,
+            "difficulty": questions[0].difficulty,
+            "count": len(questions),
+            "subjects": subject_counts(questions),
+        }
+    write_json_atomic(os.path.join(directory, ShardedQuestionStore.ID_INDEX), {"shards": {key: [q.id for q in questions] for key, questions in groups.items()}})
+    write_json_atomic(os.path.join(directory, ShardedQuestionStore.MANIFEST), {"shards": shards})
+    return sum(len(questions) for questions in groups.values())
+
+
+def compile_json_bank(json_path: str = "questions.json", journal_path: str = "questions.journal", bank_path: str = "questions.bank") -> int:
+    """One-shot compile of questions.json (and any pending journal edits) into a memory-mapped bank."""
+    return write_bank(bank_path, read_question_bank(json_path, QuestionJournal(json_path, journal_path)))
+
+
+def export_bank_to_json(json_path: str, bank_path: str = "questions.bank") -> int:
+    """Write a compiled bank, with its pending edits, back out as a questions.json-style file."""
+    store = CompiledQuestionStore(bank_path)
+    questions = [q.to_dict() for q in store.questions()]
+    store.journal.file.close()
+    write_json_atomic(json_path, questions)
+    return len(questions)
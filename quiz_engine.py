@@ -0,0 +1,877 @@
+"""Headless quiz core: questions, answer judging, filtering indexes and quiz progression.
+
+Nothing here imports Tk, so the engine loads in milliseconds and can be driven from
+tests, benchmarks or another front-end.
+"""
+import array
+import bisect
+import hashlib
+import math
+import random
+import re
+import sys
+import unicodedata
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from analytics import AttemptLog
+from review import ReviewHistory, ReviewQueue
+from sampling import Strata, sample_order
+
+ANSWER_STOPWORDS = frozenset({"a", "an", "the", "of", "and"})
+ANSWER_DIRECTIVES = ("also accept", "accept", "or")  # Leading words of an alternate inside brackets
+ANSWER_REJECTIONS = ("prompt", "do not accept", "don't accept", "reject", "anti-prompt")
+NON_ASCII = re.compile(r"[^\x00-\x7f]+")
+ROMAN_NUMERAL = re.compile(r"m{0,4}(cm|cd|d?c{0,3})(xc|xl|l?x{0,3})(ix|iv|v?i{0,3})")  # Matched against normalized words
+
+
+def fold_text(text: str) -> str:
+    """Casefold and strip accents: "Glück" -> "gluck"."""
+    if text.isascii():
+        return text.lower()  # Nothing to decompose, and lower() is casefold() for ASCII
+    decomposed = unicodedata.normalize("NFKD", text)
+    # Combining marks are never ASCII, so only the (short) non-ASCII runs need a per-character look
+    return NON_ASCII.sub(lambda run: "".join(char for char in run.group() if not unicodedata.combining(char)), decomposed).casefold()
+
+
+def normalize_answer(text: str) -> str:
+    """Casefold, strip accents and punctuation: "Louise Glück" -> "louise gluck"."""
+    folded = fold_text(text)
+    # Keep decimal points inside numbers ("12.5"), everything else that isn't a word character is a separator
+    folded = re.sub(r"(?<!\d)\.|\.(?!\d)|[^\w.]+", " ", folded)
+    return " ".join(folded.split())
+
+
+def parse_answer_alternates(answer: str) -> List[str]:
+    """Split an answer line into acceptable answers: "X [or Y; accept Z; prompt on W]" -> [X, Y, Z]."""
+    alternates = [re.sub(r"[\[(].*?[\])]", " ", answer)]
+    for clause in re.findall(r"[\[(](.*?)[\])]", answer):
+        for part in re.split(r"[;,]", clause):
+            part = part.strip()
+            lowered = part.lower()
+            if not part or lowered.startswith(ANSWER_REJECTIONS):
+                continue
+            for directive in ANSWER_DIRECTIVES:
+                if lowered.startswith(directive + " "):
+                    part = part[len(directive) + 1:]
+                    break
+            alternates.append(part)
+    return [alternate for alternate in alternates if normalize_answer(alternate)]
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    """Edit distance if it is at most limit, otherwise limit + 1.
+
+    Insertions, deletions, substitutions and swaps of two neighbouring letters ("theroy")
+    each count as one edit. Only the diagonal band of width 2 * limit + 1 is computed, and
+    the scan stops as soon as every cell in a row exceeds the limit, so the cost is
+    O(len * limit) rather than O(len^2).
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) > len(b):
+        a, b = b, a
+    over = limit + 1
+    before = None
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        low = max(1, i - limit)
+        high = min(len(b), i + limit)
+        current = [over] * (len(b) + 1)
+        current[0] = i if i <= limit else over
+        row_min = current[0]
+        char = a[i - 1]
+        for j in range(low, high + 1):
+            cost = previous[j - 1] + (char != b[j - 1])
+            cost = min(cost, previous[j] + 1, current[j - 1] + 1)
+            if before is not None and j > 1 and char == b[j - 2] and a[i - 2] == b[j - 1]:
+                cost = min(cost, before[j - 2] + 1)
+            current[j] = cost if cost <= limit else over
+            row_min = min(row_min, current[j])
+        if row_min > limit:
+            return over
+        before, previous = previous, current
+    return previous[len(b)]
+
+
+def is_number(word: str) -> bool:
+    """Whether a normalized word is a number, in digits or Roman numerals ("1914", "viii")."""
+    return any(char.isdigit() for char in word) or ROMAN_NUMERAL.fullmatch(word) is not None
+
+
+def typo_allowance(word: str) -> int:
+    """Edits forgiven for a word of this length; short words and numbers must be exact."""
+    if is_number(word):
+        return 0
+    return 0 if len(word) < 5 else 1 if len(word) < 8 else 2
+
+
+class AnswerKey:
+    """Normalized forms of a question's answer, built once and reused for every judgement.
+
+    Numbers and words under five letters must be typed exactly, longer words may have a typo
+    or two. An answer is accepted if, against any alternate, it is equal after normalization,
+    within those typos of the whole answer, or made of answer words that cover all of its
+    significant words, all but a trailing one that isn't a number, or its final word alone.
+    That accepts "Big Bang" and "big bang theroy" for "BIG BANG THEORY", and "Gluck" for
+    "LOUISE GLUCK", but not "Abraham" for "ABRAHAM LINCOLN" or "Henry VII" for "HENRY VIII".
+    """
+
+    __slots__ = ("alternates", "prompts")
+
+    def __init__(self, answer: str):
+        # (normalized answer, its significant words, edits forgiven on the whole answer)
+        self.alternates: List[Tuple[str, Tuple[str, ...], int]] = []
+        for alternate in parse_answer_alternates(answer):
+            normalized = normalize_answer(alternate)
+            words = tuple(word for word in normalized.split() if word not in ANSWER_STOPWORDS)
+            self.alternates.append((normalized, words, min(2, sum(map(typo_allowance, words)))))
+        # Answers the line says to prompt on are too incomplete to count by themselves
+        self.prompts = frozenset(normalize_answer(prompt) for prompt in re.findall(r"prompt on ([^;,\])]+)", answer, re.IGNORECASE))
+
+    def matches(self, user_answer: str) -> bool:
+        guess = normalize_answer(user_answer)
+        if not guess or guess in self.prompts:
+            return False
+        guess_words = [word for word in guess.split() if word not in ANSWER_STOPWORDS]
+        for normalized, words, limit in self.alternates:
+            if guess == normalized:
+                return True
+            # Typos that split or merge long words ("roose velt"), as long as the numbers and short words are all there
+            if (bounded_edit_distance(guess, normalized, limit) <= limit and
+                    all(word in guess_words for word in words if not typo_allowance(word))):
+                return True
+            if guess_words and self._covers(guess_words, words):
+                return True
+        return False
+
+    @staticmethod
+    def _covers(guess_words: List[str], words: Tuple[str, ...]) -> bool:
+        unmatched = list(words)
+        for guess_word in guess_words:
+            for position, word in enumerate(unmatched):
+                limit = typo_allowance(word)
+                if bounded_edit_distance(guess_word, word, limit) <= limit:
+                    del unmatched[position]
+                    break
+            else:
+                return False  # A word that isn't part of this answer
+        if not unmatched:
+            return True
+        if words[-1] in unmatched:
+            # A leading part of two words or more can leave out a final word ("Big Bang"), never a number
+            return unmatched == [words[-1]] and len(words) > 2 and not is_number(words[-1])
+        # Surnames and other final words stand for the whole answer; numbers never do, though a
+        # single letter left out before the end is an initial ("D." in "Franklin D. Roosevelt")
+        return not is_number(words[-1]) and not any(is_number(word) and len(word) > 1 for word in unmatched)
+
+
+REVEAL_WORD = re.compile(r"\s*\S+\s*")  # A word with the spaces around it, so the chunks cover the whole text
+CLOSERS = "\"'”’)]_*"  # Quotes, brackets and Markdown emphasis that can follow a clause's punctuation
+ABBREVIATIONS = frozenset({"mr.", "mrs.", "ms.", "dr.", "st.", "mt.", "jr.", "sr.", "vs.", "e.g.", "i.e.", "no.", "ca.", "c."})
+CLAUSE_PAUSE = 3  # Extra character-times of silence after a comma, semicolon, colon or dash
+SENTENCE_PAUSE = 8  # ... after the end of a sentence, which in a pyramidal question is the end of a clue
+LONG_WORD = 8  # Letters past which a word takes a little longer to say than its length
+
+
+class RevealPlan:
+    """How a question's text is paced while it is read out, worked out once per question.
+
+    The text is cut into word chunks. times[i] is when chunk i starts, in character-times
+    (multiples of the reading speed): the characters before it plus pauses after clause and
+    sentence punctuation and after long words. Each sentence is a clue; clue_starts holds
+    the offset each one starts at, so a buzz can be placed on the clue being read.
+    """
+
+    __slots__ = ("ends", "times", "clue_starts")
+
+    def __init__(self, text: str):
+        self.ends = array.array("I")  # Offset just past each chunk
+        self.times = array.array("I")  # Character-time each chunk starts at
+        self.clue_starts = array.array("I", [0])
+        time = 0
+        for match in REVEAL_WORD.finditer(text):
+            self.ends.append(match.end())
+            self.times.append(time)
+            word = match.group().strip()
+            time += match.end() - match.start() + max(0, len(word) - LONG_WORD) // 2
+            stripped = word.rstrip(CLOSERS)
+            if stripped.endswith(("?", "!")) or (stripped.endswith(".") and not self.abbreviated(stripped)):
+                time += SENTENCE_PAUSE
+                if match.end() < len(text):
+                    self.clue_starts.append(match.end())
+            elif stripped.endswith((",", ";", ":", "—", "–", "--")):
+                time += CLAUSE_PAUSE
+        if text and not self.ends:
+            self.ends.append(len(text))  # Only whitespace, revealed as one chunk
+            self.times.append(0)
+
+    @staticmethod
+    def abbreviated(word: str) -> bool:
+        """Whether a word ending in a full stop is an abbreviation or initial ("Dr.", "J.", "U.S.") rather than a sentence end."""
+        letters = word.lstrip("\"'“‘([_*")
+        return letters.lower() in ABBREVIATIONS or (len(letters) == 2 and letters[0].isupper()) or \
+            (len(letters) >= 4 and letters[-3] == "." and letters[-2].isalpha())
+
+    def __len__(self):
+        return len(self.ends)
+
+    def start(self, chunk: int) -> int:
+        return self.ends[chunk - 1] if chunk else 0
+
+    def time_at(self, position: int, chunk: int) -> int:
+        """Character-time the character at position, inside chunk, is due."""
+        return self.times[chunk] + position - self.start(chunk)
+
+    @property
+    def clue_count(self) -> int:
+        return len(self.clue_starts)
+
+    def clue_at(self, position: int) -> int:
+        """The clue, counting from 1, being read once position characters are shown."""
+        return bisect.bisect_right(self.clue_starts, max(position - 1, 0))
+
+
+class Question:
+    # No per-instance __dict__; with hundreds of thousands of questions it dominates memory
+    __slots__ = ("id", "text", "answer", "subjects", "difficulty", "year", "_answer_key", "_reveal_plan")
+
+    def __init__(self, text: str, answer: str, subjects: Iterable[str], difficulty: str, year: int, question_id: Optional[str] = None):
+        self.id = question_id or self.make_id(text, answer)
+        self.text = text
+        self.answer = answer
+        # Difficulty and subject names repeat across the whole bank, so share one copy of each
+        self.subjects = tuple(sys.intern(subject) for subject in subjects)
+        self.difficulty = sys.intern(difficulty)
+        self.year = year
+        self._answer_key: Optional[AnswerKey] = None
+        self._reveal_plan: Optional[RevealPlan] = None
+
+    @property
+    def answer_key(self) -> AnswerKey:
+        """Normalized answer forms, built on first use (the loader warms them off the Tk thread)."""
+        if self._answer_key is None:
+            self._answer_key = AnswerKey(self.answer)
+        return self._answer_key
+
+    @property
+    def reveal_plan(self) -> RevealPlan:
+        """Reveal pacing, built the first time the question is read and kept for every replay."""
+        if self._reveal_plan is None:
+            self._reveal_plan = RevealPlan(self.text)
+        return self._reveal_plan
+
+    @staticmethod
+    def make_id(text: str, answer: str) -> str:
+        """Stable ID derived from the text and answer, so re-adding the same question gives the same ID."""
+        return hashlib.sha1(f"{text}\x00{answer}".encode("utf-8")).hexdigest()[:16]
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "text": self.text,
+            "answer": self.answer,
+            "subjects": list(self.subjects),
+            "difficulty": self.difficulty,
+            "year": self.year
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict):
+        return cls(data["text"], data["answer"], data["subjects"], data["difficulty"], data["year"], data.get("id"))
+
+
+class QuestionIndex:
+    """Inverted indexes over the question bank keyed by year, difficulty and subject.
+
+    Every question gets a slot number in insertion order. Each index maps a key to
+    the set of slots holding that key, so a filter is a set intersection and the
+    result is sorted back into bank order. It also serves as the ID -> question map.
+    """
+
+    def __init__(self, questions: Iterable[Question] = ()):
+        self._next_slot = 0
+        self._slots: Dict[int, Question] = {}
+        self._slot_of: Dict[str, int] = {}  # question.id -> slot
+        self._by_year: Dict[int, Set[int]] = {}
+        self._by_difficulty: Dict[str, Set[int]] = {}
+        self._by_subject: Dict[str, Set[int]] = {}
+        for question in questions:
+            self.add(question)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, question_id: str):
+        return question_id in self._slot_of
+
+    def __iter__(self) -> Iterator[Question]:
+        return iter(self._slots.values())
+
+    def get(self, question_id: str) -> Optional[Question]:
+        slot = self._slot_of.get(question_id)
+        return self._slots[slot] if slot is not None else None
+
+    def in_bank_order(self, question_ids: Iterable[str]) -> List[Question]:
+        slots = sorted(self._slot_of[question_id] for question_id in question_ids if question_id in self._slot_of)
+        return [self._slots[slot] for slot in slots]
+
+    def add(self, question: Question) -> bool:
+        """Index a question in O(number of subjects); returns False if its ID is already indexed."""
+        if question.id in self._slot_of:
+            return False
+        slot = self._next_slot
+        self._next_slot += 1
+        self._slots[slot] = question
+        self._slot_of[question.id] = slot
+        self._by_year.setdefault(question.year, set()).add(slot)
+        self._by_difficulty.setdefault(question.difficulty, set()).add(slot)
+        for subject in question.subjects:
+            self._by_subject.setdefault(subject, set()).add(slot)
+        return True
+
+    def remove(self, question_id: str) -> Optional[Question]:
+        """Drop a question from every index in O(number of subjects), returning it."""
+        slot = self._slot_of.pop(question_id, None)
+        if slot is None:
+            return None
+        question = self._slots.pop(slot)
+        self._discard(self._by_year, question.year, slot)
+        self._discard(self._by_difficulty, question.difficulty, slot)
+        for subject in question.subjects:
+            self._discard(self._by_subject, subject, slot)
+        return question
+
+    @staticmethod
+    def _discard(index: Dict, key, slot: int):
+        slots = index.get(key)
+        if slots is not None:
+            slots.discard(slot)
+            if not slots:
+                del index[key]
+
+    def filter(self, year: int, difficulty: str, subjects: Set[str]) -> List[Question]:
+        """Return questions matching the year, difficulty and any of the subjects, in bank order."""
+        year_slots = self._by_year.get(year)
+        difficulty_slots = self._by_difficulty.get(difficulty)
+        if not year_slots or not difficulty_slots:
+            return []
+
+        # Intersect starting from the smallest set so the work is bounded by the result size
+        candidates = sorted((year_slots, difficulty_slots), key=len)
+        matches = candidates[0] & candidates[1]
+        if subjects:
+            subject_slots = set()
+            for subject in subjects:
+                subject_slots |= self._by_subject.get(subject, set())
+            matches &= subject_slots
+        return [self._slots[slot] for slot in sorted(matches)]
+
+
+class FacetCounts:
+    """Question counts per year and difficulty, and per subject within each, for the filter menus.
+
+    Stores update them on every add and delete, so menus only offer combinations that have
+    questions and an empty combination is known to be empty without running the filter.
+    """
+
+    def __init__(self, questions: Iterable[Question] = ()):
+        # (year, difficulty) -> [question count, {subject: question count}]
+        self.groups: Dict[Tuple[int, str], list] = {}
+        for question in questions:
+            self.add(question)
+
+    def add(self, question: Question):
+        group = self.groups.get((question.year, question.difficulty))
+        if group is None:
+            group = self.groups[(question.year, question.difficulty)] = [0, {}]
+        group[0] += 1
+        subjects = group[1]
+        for subject in question.subjects:
+            subjects[subject] = subjects.get(subject, 0) + 1
+
+    def remove(self, question: Question):
+        key = (question.year, question.difficulty)
+        group = self.groups.get(key)
+        if group is None:
+            return
+        group[0] -= 1
+        if group[0] <= 0:
+            del self.groups[key]
+            return
+        subjects = group[1]
+        for subject in question.subjects:
+            subjects[subject] = subjects.get(subject, 0) - 1
+            if subjects[subject] <= 0:
+                del subjects[subject]
+
+    def set_group(self, year: int, difficulty: str, count: int, subjects: Dict[str, int]):
+        """Replace one year and difficulty wholesale, for stores that count them elsewhere."""
+        if count > 0:
+            self.groups[(year, difficulty)] = [count, dict(subjects)]
+        else:
+            self.groups.pop((year, difficulty), None)
+
+    def years(self) -> List[int]:
+        return sorted({year for year, _ in self.groups})
+
+    def difficulties(self, year: Optional[int] = None) -> List[str]:
+        return sorted({difficulty for key_year, difficulty in self.groups if year is None or key_year == year})
+
+    def subjects(self, year: Optional[int] = None, difficulty: Optional[str] = None) -> List[str]:
+        return sorted({subject for (key_year, key_difficulty), (_, subjects) in self.groups.items()
+                       if (year is None or key_year == year) and (difficulty is None or key_difficulty == difficulty)
+                       for subject in subjects})
+
+    def count(self, year: int, difficulty: str, subjects: Iterable[str] = ()) -> int:
+        """Questions a filter would return; with several subjects, an upper bound that is 0 only if it is exact."""
+        group = self.groups.get((year, difficulty))
+        if group is None:
+            return 0
+        subjects = list(subjects)
+        return sum(group[1].get(subject, 0) for subject in subjects) if subjects else group[0]
+
+
+class TextSearchIndex:
+    """Inverted index from accent-folded words of question text and answers to question IDs.
+
+    Every query word is treated as a prefix, so results narrow while the last word is still
+    being typed, and a question must match every query word. Results are ranked by tf-idf:
+    rare words count for more, answer words count ANSWER_WEIGHT times a text word, and a word
+    only matched as a prefix counts half. Prefixes are expanded with a binary search over the
+    sorted vocabulary, which is only re-sorted after new words have been added.
+    """
+
+    WORD = re.compile(r"\w+")
+    ANSWER_WEIGHT = 3
+    VERSION = 3  # Bump when the layout changes, so indexes persisted by the store are rebuilt
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, int]] = {}  # word -> {question ID: weight}
+        self._words: Dict[str, Tuple[str, ...]] = {}  # question ID -> its distinct words
+        self._order: Dict[str, int] = {}  # question ID -> when it was added, to break ties
+        self._added = 0
+        self._vocabulary: Optional[List[str]] = []
+
+    def __len__(self):
+        return len(self._words)
+
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        return cls.WORD.findall(fold_text(text))
+
+    @classmethod
+    def weights(cls, question: Question) -> Dict[str, int]:
+        weights: Dict[str, int] = {}
+        for word in cls.tokenize(question.text):
+            weights[word] = weights.get(word, 0) + 1
+        for word in cls.tokenize(question.answer):
+            weights[word] = weights.get(word, 0) + cls.ANSWER_WEIGHT
+        return weights
+
+    def add(self, question: Question):
+        if question.id in self._words:
+            return
+        weights = self.weights(question)
+        self._words[question.id] = tuple(weights)
+        self._order[question.id] = self._added
+        self._added += 1
+        for word, weight in weights.items():
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = {}
+                self._vocabulary = None  # New word, re-sort on the next search
+            postings[question.id] = weight
+
+    def to_data(self) -> Dict:
+        """Plain JSON-ready data for saving: question IDs in the order added, and each one's {word: weight}."""
+        ids = sorted(self._order, key=self._order.get)
+        return {"ids": ids, "weights": [{word: self._postings[word][question_id] for word in self._words[question_id]}
+                                        for question_id in ids]}
+
+    @classmethod
+    def from_data(cls, data: Dict) -> "TextSearchIndex":
+        """Rebuild an index from to_data() output without tokenizing any text again."""
+        index = cls()
+        ids, all_weights = data["ids"], data["weights"]
+        if len(ids) != len(all_weights):
+            raise ValueError("malformed search index")
+        postings = index._postings
+        for question_id, weights in zip(ids, all_weights):
+            index._words[question_id] = tuple(weights)
+            for word, weight in weights.items():
+                word_postings = postings.get(word)
+                if word_postings is None:
+                    word_postings = postings[word] = {}
+                word_postings[question_id] = weight
+        index._order = {question_id: order for order, question_id in enumerate(index._words)}
+        index._added = len(index._order)
+        index._vocabulary = None
+        return index
+
+    def remove(self, question_id: str):
+        self._order.pop(question_id, None)
+        for word in self._words.pop(question_id, ()):
+            postings = self._postings[word]
+            del postings[question_id]
+            if not postings:
+                del self._postings[word]
+                self._vocabulary = None
+
+    def _prefix_scores(self, prefix: str) -> Dict[str, float]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        scores: Dict[str, float] = {}
+        position = bisect.bisect_left(self._vocabulary, prefix)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(prefix):
+            word = self._vocabulary[position]
+            postings = self._postings[word]
+            idf = math.log(1 + len(self._words) / len(postings))
+            if word != prefix:
+                idf /= 2
+            for question_id, weight in postings.items():
+                scores[question_id] = scores.get(question_id, 0.0) + weight * idf
+            position += 1
+        return scores
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """IDs of questions containing a word starting with each word of the query, best first."""
+        result: Optional[Dict[str, float]] = None
+        # Expand the longest (most selective) prefixes first so the intersection shrinks fast
+        for word in sorted(set(self.tokenize(query)), key=len, reverse=True):
+            scores = self._prefix_scores(word)
+            if result is None:
+                result = scores
+            else:
+                result = {question_id: score + scores[question_id] for question_id, score in result.items() if question_id in scores}
+            if not result:
+                return []
+        ranked = sorted(result or {}, key=lambda question_id: (-result[question_id], self._order[question_id]))
+        return ranked[:limit] if limit is not None else ranked
+
+    @classmethod
+    def matches(cls, question: Question, words: List[str]) -> bool:
+        """Whether a question would be found for these query words, without an index."""
+        tokens = cls.tokenize(question.text) + cls.tokenize(question.answer)
+        return all(any(token.startswith(word) for token in tokens) for word in words)
+
+
+class QuizEngine:
+    """Quiz state and rules without any UI: filters, position, score, reveal progress and judging.
+
+    Times are passed in by the caller (any monotonic clock), so a front-end drives the reveal
+    from its own event loop and tests can drive it with a fake clock.
+
+    With a ReviewHistory, the final judgement of each question (after any mark_answer
+    override) is recorded when the quiz moves off it, and with an AttemptLog it is also
+    logged with how long the answer took and how much of the question had been revealed.
+    In review mode, next_question takes the question due soonest from a ReviewQueue
+    instead of stepping through the list.
+    """
+
+    def __init__(self, store, history: Optional[ReviewHistory] = None, attempts: Optional[AttemptLog] = None):
+        self.store = store
+        self.history = history
+        self.attempts = attempts
+        self.review_mode = False
+        self.review_queue: Optional[ReviewQueue] = None
+        self.result: Optional[bool] = None  # Judgement of the current question, not yet recorded
+        self.judged_at: Tuple[float, int] = (math.nan, 0)  # (seconds into the reveal, characters shown) at the first judgement
+
+        # A randomized round draws list positions lazily instead of shuffling the list
+        self.random_order: Optional[Iterator[int]] = None  # Positions as numbered when the round started
+        self.random_removed: List[int] = []  # Sorted positions (same numbering) deleted since
+        self.random_seed: Optional[int] = None
+        self.random_balance: Optional[str] = None  # None, "subject" or "difficulty"
+        self.strata: Dict[str, Strata] = {}  # Grouping of the current list, kept until it changes
+        self.selected_year = 2024
+        self.selected_difficulty = "District"
+        self.selected_subjects: Set[str] = set()
+        self.search_query = ""  # When set, the quiz runs over search results instead of the filters
+        self.filtered_questions: List[Question] = []
+        self.question_index = 0
+
+        self.score = 0
+        self.total_questions = 0
+        self.is_correct = False
+        self.score_updated = False  # Score already adjusted by hand for the current question
+        self.submitted = False  # An answer was already submitted for the current question
+
+        self.reading_speed = 0.05  # Seconds per character
+        self.reveal_mode = "Characters"  # Reveal one character or one whole word at a time
+        self.read_index = 0
+        self.reveal_chunk = 0  # Chunk of the reveal plan holding the next character
+        self.reading_started = 0.0  # When the current reveal would have started at the current speed
+        self.reveal_started = 0.0  # When the current reveal actually started
+
+    @property
+    def current_question(self) -> Optional[Question]:
+        if not self.filtered_questions:
+            return None
+        return self.filtered_questions[self.question_index]
+
+    # Filtering
+
+    def filter_questions(self) -> bool:
+        """Re-run the search or filters and go back to the first match; returns whether anything matched."""
+        self.commit_result()
+        if self.search_query.strip():
+            self.filtered_questions = self.store.find(self.search_query)
+        elif not self.store.facets.count(self.selected_year, self.selected_difficulty, self.selected_subjects):
+            self.filtered_questions = []  # Known to be empty, no need to ask the store
+        else:
+            self.filtered_questions = self.store.filter(self.selected_year, self.selected_difficulty, self.selected_subjects)
+        self.question_index = 0
+        self.random_order = None
+        self.strata = {}
+        self.start_review()
+        return bool(self.filtered_questions)
+
+    def start_review(self, rng: Optional[random.Random] = None):
+        """Queue the filtered questions by due time and go to the first one, if in review mode."""
+        self.review_queue = None
+        if self.review_mode and self.history is not None:
+            self.review_queue = ReviewQueue(self.filtered_questions, self.history, rng)
+            position = self.review_queue.pop()
+            self.question_index = position if position is not None else 0
+
+    def matches_filters(self, question: Question) -> bool:
+        return (question.year == self.selected_year and
+                question.difficulty == self.selected_difficulty and
+                (not self.selected_subjects or any(subject in self.selected_subjects for subject in question.subjects)))
+
+    def merge_loaded(self, batch: List[Question]):
+        """Make matching questions from a freshly loaded batch reachable without moving the current one."""
+        if self.search_query.strip():
+            return  # Search results are ranked as a whole, not appended to
+        self.strata = {}
+        for question in batch:
+            if self.matches_filters(question):
+                self.filtered_questions.append(question)
+                if self.review_queue is not None:
+                    self.review_queue.positions[question.id] = len(self.filtered_questions) - 1
+                    self.review_queue.push(question.id)
+
+    def drop_question(self, question_id: str) -> bool:
+        """Remove a deleted question from the current filter; returns True if it was the current one."""
+        for position, question in enumerate(self.filtered_questions):
+            if question.id == question_id:
+                if self.random_order is not None:
+                    bisect.insort(self.random_removed, self.round_position(position))
+                del self.filtered_questions[position]
+                break
+        else:
+            return False  # Not part of the current filter
+
+        self.strata = {}
+        if self.review_queue is not None:
+            self.review_queue.reindex(self.filtered_questions)
+        if position < self.question_index:
+            self.question_index -= 1
+            return False
+        if position == self.question_index:
+            self.result = None  # Nothing to record for a deleted question
+            if self.review_queue is not None:
+                next_position = self.review_queue.pop()
+            elif self.random_order is not None:
+                next_position = self.next_random_position()
+            else:
+                next_position = None
+            if next_position is not None:
+                self.question_index = next_position
+            else:
+                self.question_index = max(0, min(self.question_index, len(self.filtered_questions) - 1))
+            return True
+        return False
+
+    # Reveal progression
+
+    def start_reveal(self, now: float):
+        self.read_index = 0
+        self.reveal_chunk = 0
+        self.reading_started = now
+        self.reveal_started = now
+
+    def set_reading_speed(self, speed: float, now: float):
+        # Re-anchor the schedule so the text already shown stays put and the rest follows the new speed
+        self.reading_started = now - self.reveal_time() * speed
+        self.reading_speed = speed
+
+    def reveal_time(self) -> int:
+        """Character-time the next character is due at, counted from the start of the reveal."""
+        question = self.current_question
+        if question is None or self.read_index >= len(question.text):
+            return self.read_index
+        return question.reveal_plan.time_at(self.read_index, self.reveal_chunk)
+
+    @property
+    def reveal_finished(self) -> bool:
+        question = self.current_question
+        return question is None or self.read_index >= len(question.text)
+
+    def reveal_due(self, now: float) -> str:
+        """Advance the reveal to everything due by now and return the newly revealed text.
+
+        Working from the elapsed time rather than counting ticks means a stalled event loop
+        catches up in one step instead of falling further behind. The question's reveal plan
+        is walked a chunk at a time, so a tick costs the same however long the question is.
+        """
+        question = self.current_question
+        text = question.text
+        if self.read_index >= len(text):
+            return ""
+        plan = question.reveal_plan
+        elapsed = (now - self.reading_started) / self.reading_speed
+        chunk = self.reveal_chunk
+        times, ends = plan.times, plan.ends
+        last = len(ends) - 1
+        while chunk < last and times[chunk + 1] <= elapsed:
+            chunk += 1  # Whole chunks that came due since the last tick
+        end = ends[chunk]
+        if self.reveal_mode == "Words":
+            target = end
+        else:
+            target = min(end, plan.start(chunk) + max(0, int(elapsed - times[chunk])) + 1)
+        target = max(self.read_index + 1, target)
+        if target >= end and chunk < last:
+            chunk += 1
+        chunk_text = text[self.read_index:target]
+        self.read_index = target
+        self.reveal_chunk = chunk
+        return chunk_text
+
+    def next_reveal_time(self) -> float:
+        """When the next character is due."""
+        return self.reading_started + self.reveal_time() * self.reading_speed
+
+    def current_clue(self) -> Tuple[int, int]:
+        """(clue being read, counting from 1; clues in the question) at the current point of the reveal."""
+        plan = self.current_question.reveal_plan
+        return plan.clue_at(self.read_index), plan.clue_count
+
+    # Judging and scoring
+
+    def check_answer(self, user_answer: str, now: Optional[float] = None) -> Optional[bool]:
+        """Judge an answer for the current question; None if there is nothing to judge.
+
+        now, on the clock given to start_reveal, times the answer for the attempt log.
+        """
+        if not self.filtered_questions or self.submitted:
+            return None
+        self.is_correct = self.current_question.answer_key.matches(user_answer)
+        if self.is_correct:
+            self.score += 1  # Only the numerator; next_question moves the denominator
+        self.submitted = True
+        self.judge(self.is_correct, now)
+        return self.is_correct
+
+    def mark_answer(self, correct: bool, now: Optional[float] = None) -> bool:
+        """Let the player overrule the judgement once per question; returns whether it applied."""
+        if not self.filtered_questions or self.score_updated:
+            return False
+        self.score_updated = True
+        self.score += 1 if correct else -1
+        self.judge(correct, now)
+        return True
+
+    def judge(self, correct: bool, now: Optional[float]):
+        if self.result is None:
+            # An override keeps the timing of the answer it overrules
+            self.judged_at = (now - self.reveal_started if now is not None else math.nan, self.read_index)
+        self.result = correct
+
+    def commit_result(self):
+        """Record the current question's judgement in the history, and requeue it in review mode."""
+        question = self.current_question
+        if question is not None and self.history is not None and self.result is not None:
+            self.history.record(question.id, self.result)
+        if question is not None and self.attempts is not None and self.result is not None:
+            self.attempts.record(question, self.result, *self.judged_at)
+        if question is not None and self.review_queue is not None:
+            self.review_queue.push(question.id)  # Unjudged questions go back at their old due time
+        self.result = None
+
+    def next_question(self) -> bool:
+        """Advance to the next question (the one due soonest in review mode), returns False at the end."""
+        if not self.filtered_questions:
+            return False
+        if self.review_queue is not None:
+            self.commit_result()
+            position = self.review_queue.pop()
+            if position is None:
+                return False
+        elif self.random_order is not None:
+            position = self.next_random_position()
+            if position is None:
+                return False
+            self.commit_result()
+        elif self.question_index >= len(self.filtered_questions) - 1:
+            return False
+        else:
+            self.commit_result()
+            position = self.question_index + 1
+        self.question_index = position
+        self.score_updated = False
+        self.submitted = False
+        self.total_questions += 1
+        return True
+
+    def randomize(self, seed: Optional[int] = None, balance: Optional[str] = None) -> int:
+        """Start a random round over the current list and return its seed, so it can be replayed.
+
+        With balance "subject" or "difficulty", each draw first picks a stratum with equal
+        weight, so small subjects show up as often as big ones until they run out. Only the
+        positions actually drawn are generated; the list itself is left in place.
+        """
+        self.commit_result()
+        self.random_seed = random.randrange(2 ** 32) if seed is None else seed
+        self.random_balance = balance
+        if self.review_queue is not None:
+            # Due times still decide; the seed only orders questions that are equally due
+            self.start_review(random.Random(self.random_seed))
+            return self.random_seed
+        strata = None
+        if balance is not None:
+            strata = self.strata.get(balance)
+            if strata is None:
+                strata = self.strata[balance] = Strata(self.filtered_questions, balance)
+        self.random_order = sample_order(self.filtered_questions, self.random_seed, balance, strata=strata)
+        self.random_removed = []
+        position = self.next_random_position()
+        self.question_index = position if position is not None else 0
+        return self.random_seed
+
+    def next_random_position(self) -> Optional[int]:
+        """The next drawn position still in the list, renumbered past the deletions since the round began."""
+        for drawn in self.random_order:
+            removed_before = bisect.bisect_left(self.random_removed, drawn)
+            if removed_before < len(self.random_removed) and self.random_removed[removed_before] == drawn:
+                continue  # Deleted since the round started
+            return drawn - removed_before
+        return None
+
+    def round_position(self, position: int) -> int:
+        """Inverse of the renumbering in next_random_position: a current position in round numbering."""
+        for removed in self.random_removed:
+            if removed > position:
+                break
+            position += 1
+        return position
+
+    def reset(self):
+        """Start over with the same questions; a random round restarts in the same order."""
+        self.commit_result()
+        self.question_index = 0
+        self.score = 0
+        self.total_questions = 0
+        if self.random_order is not None:
+            self.randomize(self.random_seed, self.random_balance)
+        else:
+            self.start_review()
+
+    def finish(self):
+        """Record the last judgement and close the history, when the quiz is closed."""
+        self.commit_result()
+        if self.history is not None:
+            self.history.close()
+        if self.attempts is not None:
+            self.attempts.close()
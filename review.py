@@ -0,0 +1,131 @@
+"""Spaced repetition: persistent per-question review history and an SM-2 due-time queue.
+
+Every judged answer is appended to a JSON Lines log as [question ID, unix time, 1 or 0].
+Loading replays the log into one small Card per question, so the file stays the single
+source of truth and a torn last line from a crash only loses that one result.
+"""
+import heapq
+import itertools
+import json
+import os
+import random
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DAY = 86400
+RELEARN_DELAY = 600  # A missed question comes back after ten minutes, within the same session
+CORRECT_GRADE = 4  # SM-2 quality for a correct answer ("correct after some hesitation")
+INCORRECT_GRADE = 1
+
+
+class Card:
+    """SM-2 scheduling state of one question."""
+
+    __slots__ = ("ease", "interval", "repetitions", "lapses", "due")
+
+    def __init__(self):
+        self.ease = 2.5
+        self.interval = 0  # Days until the next review after a correct answer
+        self.repetitions = 0  # Correct answers in a row
+        self.lapses = 0
+        self.due = 0.0  # Unix time; never-seen questions are due immediately
+
+    def review(self, correct: bool, now: float):
+        grade = CORRECT_GRADE if correct else INCORRECT_GRADE
+        self.ease = max(1.3, self.ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+        if correct:
+            self.interval = 1 if self.repetitions == 0 else 6 if self.repetitions == 1 else round(self.interval * self.ease)
+            self.repetitions += 1
+            self.due = now + self.interval * DAY
+        else:
+            self.repetitions = 0
+            self.interval = 1
+            self.lapses += 1
+            self.due = now + RELEARN_DELAY
+
+
+class ReviewHistory:
+    """Cards for every question ever judged, plus all-time totals, backed by an append-only log."""
+
+    def __init__(self, path: str = "history.jsonl"):
+        self.path = path
+        self.cards: Dict[str, Card] = {}
+        self.attempts = 0
+        self.correct = 0
+        self.file = None
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        question_id, when, correct = json.loads(line)
+                    except (json.JSONDecodeError, ValueError):
+                        break  # A torn final write; nothing valid can follow it
+                    self._apply(question_id, bool(correct), when)
+
+    def _apply(self, question_id: str, correct: bool, now: float) -> Card:
+        card = self.cards.get(question_id)
+        if card is None:
+            card = self.cards[question_id] = Card()
+        card.review(correct, now)
+        self.attempts += 1
+        self.correct += correct
+        return card
+
+    def record(self, question_id: str, correct: bool, now: Optional[float] = None) -> Card:
+        """Schedule the question's next review and append the result to the log."""
+        now = time.time() if now is None else now
+        card = self._apply(question_id, correct, now)
+        if self.file is None:
+            self.file = open(self.path, "a", encoding="utf-8")
+        # Flushed but not fsynced: losing the last few results in a power cut is acceptable here
+        self.file.write(json.dumps([question_id, round(now, 3), int(correct)]) + "\n")
+        self.file.flush()
+        return card
+
+    def due(self, question_id: str) -> float:
+        card = self.cards.get(question_id)
+        return card.due if card is not None else 0.0
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class ReviewQueue:
+    """Min-heap of (due time, tiebreak, question ID) over one filtered question list.
+
+    Building it is O(N); taking the next question and rescheduling one are O(log N).
+    A rescheduled question just gets a new entry, and entries whose due time no longer
+    matches the history are skipped when they reach the top.
+    """
+
+    def __init__(self, questions: List, history: ReviewHistory, rng: Optional[random.Random] = None):
+        self.history = history
+        self.positions: Dict[str, int] = {}
+        self.reindex(questions)
+        # Ties (new questions all have due 0) keep the filtered order, or a random one given rng;
+        # questions pushed back later count on from there, so they queue behind every tie
+        ranks = list(range(len(questions)))
+        if rng is not None:
+            rng.shuffle(ranks)
+        self.counter = itertools.count(len(ranks))
+        self.heap: List[Tuple[float, int, str]] = [(history.due(question.id), rank, question.id) for rank, question in zip(ranks, questions)]
+        heapq.heapify(self.heap)
+
+    def reindex(self, questions: Iterable):
+        """Refresh the ID -> list position map after the list itself changed."""
+        self.positions = {question.id: position for position, question in enumerate(questions)}
+
+    def push(self, question_id: str):
+        if question_id in self.positions:
+            heapq.heappush(self.heap, (self.history.due(question_id), next(self.counter), question_id))
+
+    def pop(self) -> Optional[int]:
+        """List position of the question due soonest, removing it until it is pushed again."""
+        while self.heap:
+            due, _, question_id = heapq.heappop(self.heap)
+            position = self.positions.get(question_id)
+            if position is not None and due == self.history.due(question_id):
+                return position
+        return None
@@ -0,0 +1,138 @@
+"""Random question orders without shuffling the question list.
+
+LazyPermutation yields a uniformly random order of range(n) one position at a time, and
+StratifiedSampler draws positions across subjects or difficulties in proportion to weights
+(equal by default, which balances a round). Both take a seed, so a round can be replayed,
+and neither copies the list: drawing k questions costs O(k), whatever the size of the bank.
+"""
+import random
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+STRATA = {
+    "subject": lambda question: question.subjects[0] if question.subjects else "",
+    "difficulty": lambda question: question.difficulty,
+}
+
+
+class LazyPermutation:
+    """A random permutation of range(n), produced one element at a time.
+
+    Fisher-Yates over a virtual array: only slots that have been swapped are remembered,
+    so k draws cost O(k) time and memory instead of O(n) for a shuffled copy.
+    """
+
+    def __init__(self, n: int, rng: random.Random):
+        self.n = n
+        self.rng = rng
+        self.drawn = 0
+        self.swaps: Dict[int, int] = {}
+
+    def __len__(self):
+        return self.n - self.drawn
+
+    def __iter__(self) -> Iterator[int]:
+        return self
+
+    def __next__(self) -> int:
+        if self.drawn >= self.n:
+            raise StopIteration
+        i = self.drawn
+        j = self.rng.randrange(i, self.n)
+        value = self.swaps.pop(j, j)
+        if j != i:
+            self.swaps[j] = self.swaps.pop(i, i)
+        else:
+            self.swaps.pop(i, None)
+        self.drawn += 1
+        return value
+
+
+class AliasTable:
+    """Vose's alias method: O(n) to build, then O(1) per weighted draw of an index."""
+
+    def __init__(self, weights: Sequence[float]):
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("weights must have a positive sum")
+        n = len(weights)
+        scaled = [weight * n / total for weight in weights]
+        self.probability = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, weight in enumerate(scaled) if weight < 1]
+        large = [i for i, weight in enumerate(scaled) if weight >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+        # Whatever is left over is 1 up to rounding error and keeps probability 1
+
+    def draw(self, rng: random.Random) -> int:
+        column = rng.randrange(len(self.probability))
+        return column if rng.random() < self.probability[column] else self.alias[column]
+
+
+class Strata:
+    """List positions grouped by a stratum key such as subject or difficulty."""
+
+    def __init__(self, questions: Sequence, by: str):
+        key: Callable = STRATA[by]
+        groups: Dict[str, List[int]] = {}
+        for position, question in enumerate(questions):
+            groups.setdefault(key(question), []).append(position)
+        self.by = by
+        self.keys = sorted(groups)
+        self.members = [groups[name] for name in self.keys]
+
+
+class StratifiedSampler:
+    """Draw positions without replacement: a stratum by weight, then a random member of it.
+
+    The alias table is only rebuilt when a stratum runs out, so at most once per stratum.
+    """
+
+    def __init__(self, strata: Strata, rng: random.Random, weights: Optional[Dict[str, float]] = None):
+        self.rng = rng
+        self.strata = strata
+        self.weights = [weights.get(name, 0.0) if weights else 1.0 for name in strata.keys]
+        self.orders = [LazyPermutation(len(members), rng) for members in strata.members]
+        self.live = [i for i, weight in enumerate(self.weights) if weight > 0 and strata.members[i]]
+        self.table = AliasTable([self.weights[i] for i in self.live]) if self.live else None
+
+    def __iter__(self) -> Iterator[int]:
+        return self
+
+    def __next__(self) -> int:
+        while self.live:
+            stratum = self.live[self.table.draw(self.rng)]
+            order = self.orders[stratum]
+            if len(order):
+                return self.strata.members[stratum][next(order)]
+            self.live.remove(stratum)
+            self.table = AliasTable([self.weights[i] for i in self.live]) if self.live else None
+        raise StopIteration
+
+
+def sample_order(questions: Sequence, seed: Optional[int] = None, balance: Optional[str] = None,
+                 weights: Optional[Dict[str, float]] = None, strata: Optional[Strata] = None) -> Iterator[int]:
+    """Positions of questions in random order: uniform, or stratified by subject or difficulty.
+
+    Pass strata built earlier for the same list to skip regrouping it.
+    """
+    rng = random.Random(seed)
+    if balance is None:
+        return LazyPermutation(len(questions), rng)
+    return StratifiedSampler(strata if strata is not None else Strata(questions, balance), rng, weights)
+
+
+def practice_round(questions: Sequence, size: int, seed: Optional[int] = None, balance: Optional[str] = "subject",
+                   weights: Optional[Dict[str, float]] = None) -> List:
+    """Up to size distinct questions drawn with sample_order."""
+    order = sample_order(questions, seed, balance, weights)
+    picked = []
+    for position in order:
+        if len(picked) >= size:
+            break
+        picked.append(questions[position])
+    return picked
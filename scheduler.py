@@ -0,0 +1,45 @@
+"""Deadline-based scheduling of callbacks on the Tk event loop."""
+import time
+from typing import Callable, Dict
+
+
+class TkScheduler:
+    """Named root.after chains, each with at most one pending callback.
+
+    Callbacks are scheduled for absolute time.monotonic() deadlines, so a late tick shortens
+    the next delay instead of pushing every later tick back. Scheduling a chain cancels the
+    callback still pending under that name, which guarantees a single live reveal or timer
+    chain no matter how quickly questions change.
+
+    With a profiler attached, each callback also records how long after its deadline it ran,
+    which is how far behind the event loop was.
+    """
+
+    def __init__(self, root, clock: Callable[[], float] = time.monotonic, profiler=None):
+        self.root = root
+        self.clock = clock
+        self.profiler = profiler
+        self.pending: Dict[str, str] = {}  # chain name -> after ID
+
+    def call_at(self, name: str, deadline: float, callback: Callable, *args):
+        """Run callback(*args) at the clock deadline, replacing whatever the chain had pending."""
+        self.cancel(name)
+        delay_ms = max(0, round((deadline - self.clock()) * 1000))
+        self.pending[name] = self.root.after(delay_ms, self._fire, name, deadline, callback, args)
+
+    def call_later(self, name: str, delay: float, callback: Callable, *args):
+        self.call_at(name, self.clock() + delay, callback, *args)
+
+    def _fire(self, name: str, deadline: float, callback: Callable, args):
+        del self.pending[name]
+        if self.profiler is not None:
+            self.profiler.record("lag", name, self.profiler.clock(), max(0.0, self.clock() - deadline))
+        callback(*args)
+
+    def cancel(self, name: str):
+        after_id = self.pending.pop(name, None)
+        if after_id is not None:
+            self.root.after_cancel(after_id)
+
+    def active(self, name: str) -> bool:
+        return name in self.pending
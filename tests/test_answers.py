@@ -0,0 +1,55 @@
+"""AnswerKey judging: accents, partial answers and typos, without giving away near-miss numbers or words."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz_engine import AnswerKey, bounded_edit_distance  # noqa: E402
+
+ACCEPTED = [
+    ("Louise Glück", "LOUISE GLUCK"),
+    ("Gluck", "LOUISE GLUCK"),
+    ("Big Bang", "BIG BANG THEORY"),
+    ("big bang theroy", "BIG BANG THEORY"),
+    ("Roosevelt", "FRANKLIN D. ROOSEVELT"),
+    ("Franklin Roosvelt", "FRANKLIN D. ROOSEVELT"),
+    ("Lincoln", "ABRAHAM LINCOLN"),
+    ("Henry VIII", "HENRY VIII"),
+    ("World War I", "WORLD WAR I [accept First World War]"),
+    ("first world war", "WORLD WAR I [accept First World War]"),
+]
+
+REJECTED = [
+    ("Henry VII", "HENRY VIII"),
+    ("Henry", "HENRY VIII"),
+    ("Louis XV", "LOUIS XIV"),
+    ("World War II", "WORLD WAR I"),
+    ("World War", "WORLD WAR I"),
+    ("Ion", "IRON"),
+    ("Bold", "GOLD"),
+    ("Home", "ROME"),
+    ("Abraham", "ABRAHAM LINCOLN"),
+    ("George", "GEORGE WASHINGTON"),
+    ("big bant theory", "BIG BANG THEORY"),
+    ("Bang Theory Big Crunch", "BIG BANG THEORY"),
+    ("Kepler", "KEPLER [prompt on Kepler]"),
+]
+
+
+@pytest.mark.parametrize("guess, answer", ACCEPTED)
+def test_accepted(guess, answer):
+    assert AnswerKey(answer).matches(guess)
+
+
+@pytest.mark.parametrize("guess, answer", REJECTED)
+def test_rejected(guess, answer):
+    assert not AnswerKey(answer).matches(guess)
+
+
+def test_swapped_letters_are_one_edit():
+    assert bounded_edit_distance("theroy", "theory", 1) == 1
+    assert bounded_edit_distance("theroy", "theory", 0) == 1
+    assert bounded_edit_distance("kitten", "sitting", 3) == 3
+    assert bounded_edit_distance("kitten", "sitting", 2) == 3
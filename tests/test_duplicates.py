@@ -0,0 +1,44 @@
+"""DuplicateChecker builds from each store's entries_reader() on its own thread."""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from duplicates import DuplicateChecker  # noqa: E402
+from question_store import (CompiledQuestionStore, JsonQuestionStore, Question, ShardedQuestionStore,  # noqa: E402
+                            SqliteQuestionStore, compile_json_bank, import_json_to_sqlite, load_all, shard_json_bank)
+
+JSON_PATH = os.path.join(ROOT, "questions.json")
+
+
+def open_store(kind: str, tmp_path):
+    journal = str(tmp_path / "questions.journal")
+    if kind == "json":
+        return load_all(JsonQuestionStore(JSON_PATH, journal, str(tmp_path / "questions.search")))
+    if kind == "sqlite":
+        import_json_to_sqlite(JSON_PATH, journal, str(tmp_path / "questions.db"))
+        return SqliteQuestionStore(str(tmp_path / "questions.db"))
+    if kind == "sharded":
+        shard_json_bank(JSON_PATH, journal, str(tmp_path / "questions"))
+        return ShardedQuestionStore(str(tmp_path / "questions"))
+    compile_json_bank(JSON_PATH, journal, str(tmp_path / "questions.bank"))
+    return CompiledQuestionStore(str(tmp_path / "questions.bank"), str(tmp_path / "questions.bank.journal"))
+
+
+@pytest.mark.parametrize("kind", ["json", "sqlite", "sharded", "compiled"])
+def test_checker_reads_entries_on_its_thread(kind, tmp_path):
+    store = open_store(kind, tmp_path)
+    removed_id = store.entries()[0][0]
+    store.delete(removed_id)
+    expected = store.entries()
+    checker = DuplicateChecker(store.entries_reader())
+    # Edits from this thread while it builds are queued, not read from under it
+    added = Question(expected[0][1] + " Again.", "An answer", ["Science"], "Regional", 2024)
+    store.add(added)
+    checker.add(added.id, added.text)
+    index = checker.ready(wait=True)
+    assert set(index.signatures) == {question_id for question_id, _ in expected} | {added.id}
+    assert removed_id not in index
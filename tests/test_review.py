@@ -0,0 +1,33 @@
+"""ReviewQueue ordering in review mode, on the repository's question bank."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from question_store import JsonQuestionStore, load_all  # noqa: E402
+from quiz_engine import QuizEngine  # noqa: E402
+from review import ReviewHistory  # noqa: E402
+
+
+def make_engine(tmp_path) -> QuizEngine:
+    store = load_all(JsonQuestionStore(os.path.join(ROOT, "questions.json"), str(tmp_path / "questions.journal"),
+                                       str(tmp_path / "questions.search")))
+    engine = QuizEngine(store, ReviewHistory(str(tmp_path / "history.jsonl")))
+    engine.review_mode = True
+    engine.selected_year, engine.selected_difficulty = 2024, "Regional"
+    engine.filter_questions()
+    return engine
+
+
+def test_skipped_question_goes_behind_equally_due_ones(tmp_path):
+    for seed in (None, 5):
+        engine = make_engine(tmp_path)
+        if seed is not None:
+            engine.randomize(seed)
+        seen = [engine.question_index]
+        while len(seen) < len(engine.filtered_questions) and engine.next_question():
+            seen.append(engine.question_index)
+        # Nothing was judged, so every question comes up once before any comes round again
+        assert len(seen) == len(set(seen)) == len(engine.filtered_questions)
+        assert engine.next_question() and engine.question_index == seen[0]
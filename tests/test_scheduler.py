@@ -0,0 +1,119 @@
+"""TkScheduler on the simulated event loop from benchmarks/bench_scheduler.py.
+
+Checks that deadline chains don't drift under load, and that however fast the player
+skips, randomizes or answers, ContentView never has more than one reveal or timer
+callback pending. The ContentView methods run for real against stand-in widgets.
+"""
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_scheduler import SimulatedLoop, deadline_chain, fixed_delay_chain  # noqa: E402
+from gui import ContentView  # noqa: E402
+from question_store import JsonQuestionStore, load_all  # noqa: E402
+from quiz_engine import QuizEngine  # noqa: E402
+from review import ReviewHistory  # noqa: E402
+from scheduler import TkScheduler  # noqa: E402
+
+INTERVAL = 0.05
+TICKS = 2000
+
+
+class Widget:
+    """Accepts the calls ContentView makes on its Text, Label and Entry widgets."""
+
+    def config(self, **options):
+        pass
+
+    def insert(self, *args):
+        pass
+
+    def delete(self, *args):
+        pass
+
+    def get(self):
+        return "an answer"
+
+
+def test_deadlines_do_not_drift():
+    loop = SimulatedLoop(1)
+    fired = deadline_chain(loop, TICKS, INTERVAL)
+    worst_stall = loop.stall[1] + loop.work[1]
+    # However long the run, the last tick is at most one stall behind its deadline
+    assert 0 <= fired[-1] - TICKS * INTERVAL <= worst_stall
+    lateness = sorted(t - (n + 1) * INTERVAL for n, t in enumerate(fired))
+    assert lateness[len(lateness) // 2] < loop.work[1]
+    # Whereas fixed delays pile every stall and every callback's cost onto the next tick
+    fixed = fixed_delay_chain(SimulatedLoop(1), TICKS, INTERVAL)
+    assert fixed[-1] - TICKS * INTERVAL > 10 * worst_stall
+
+
+def live_callbacks(loop: SimulatedLoop, name: str) -> int:
+    """How many callbacks of a scheduler chain are queued on the loop and not cancelled."""
+    return sum(1 for _, after_id, _, args in loop.queue if after_id not in loop.cancelled and args[0] == name)
+
+
+def make_view(loop: SimulatedLoop, tmp_path) -> ContentView:
+    store = load_all(JsonQuestionStore(os.path.join(ROOT, "questions.json"), str(tmp_path / "questions.journal"),
+                                       str(tmp_path / "questions.search")))
+    view = ContentView.__new__(ContentView)  # The quiz state and callbacks of a ContentView, without a window
+    view.engine = QuizEngine(store, ReviewHistory(str(tmp_path / "history.jsonl")))
+    view.scheduler = TkScheduler(loop, clock=loop.clock)
+    view.buzzer = None
+    view.question_text = view.timer_label = view.score_label = view.answer_entry = Widget()
+    view.reading_active = view.timer_running = view.buzz_paused = view.show_answer = False
+    view.timer_enabled = True
+    view.timer_seconds = 5
+    view.timer_deadline = 0.0
+    view.next_question_cooldown = False
+    view.first_question_reported = True
+    view.user_answer = ""
+    view.engine.selected_year, view.engine.selected_difficulty = 2024, "Regional"
+    view.engine.filter_questions()
+    return view
+
+
+def test_one_live_reveal_and_timer_chain(tmp_path):
+    loop = SimulatedLoop(7)
+    view = make_view(loop, tmp_path)
+    rng = random.Random(7)
+
+    def randomize():
+        # randomize_questions without its message box
+        view.engine.randomize(rng.randrange(1000))
+        view.start_reading()
+
+    def skip():
+        view.next_question_cooldown = False
+        view.next_question()
+
+    starts = [view.start_reading, skip, randomize]
+    stops = [view.check_answer, view.reveal_question, view.stop_reading]
+    checked = []
+
+    def act():
+        action = rng.choice(starts + stops)
+        judging = action == view.check_answer and not view.engine.submitted  # A second submit is ignored
+        action()
+        for name in ("reveal", "timer"):
+            live = live_callbacks(loop, name)
+            assert live <= 1, f"{live} {name} callbacks pending"
+            assert live == view.scheduler.active(name)
+        if action in stops and (judging or action != view.check_answer):
+            assert not view.scheduler.active("reveal") and not view.scheduler.active("timer")
+        elif view.engine.current_question is not None and not view.engine.reveal_finished:
+            assert not view.scheduler.active("timer")  # The previous question's countdown was cancelled
+        checked.append(loop.now)
+        if len(checked) < 500:
+            # Mostly faster than a tick, sometimes long enough for a reveal to finish and the timer to run
+            loop.after(rng.choice([0, 1, 10, 40, 2000, 30000]), act)
+
+    view.start_reading()
+    loop.after(0, act)
+    loop.run()
+    assert len(checked) == 500
+    assert not view.scheduler.pending
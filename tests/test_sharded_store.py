@@ -0,0 +1,53 @@
+"""ShardedQuestionStore lookups by ID through the ID index kept next to the manifest."""
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from question_store import Question, ShardedQuestionStore, shard_json_bank  # noqa: E402
+
+
+def make_bank(tmp_path) -> str:
+    directory = str(tmp_path / "questions")
+    shard_json_bank(os.path.join(ROOT, "questions.json"), str(tmp_path / "questions.journal"), directory)
+    return directory
+
+
+def test_lookups_read_no_shards(tmp_path, monkeypatch):
+    directory = make_bank(tmp_path)
+    first = Question.from_dict(json.load(open(os.path.join(ROOT, "questions.json"), encoding="utf-8"))[0])
+    store = ShardedQuestionStore(directory)
+    read = []
+    real_read_shard = store.read_shard
+    monkeypatch.setattr(store, "read_shard", lambda key: read.append(key) or real_read_shard(key))
+    assert "no such question" not in store
+    assert store.locate(first.id) == store.shard_key(first.year, first.difficulty)
+    assert not read
+
+
+def test_edits_keep_the_index_current(tmp_path):
+    directory = make_bank(tmp_path)
+    store = ShardedQuestionStore(directory)
+    deleted = store.entries()[0][0]
+    question = Question.from_dict(dict(store.get(deleted).to_dict(), id="added"))
+    assert store.add(question) and not store.add(question)
+    assert store.delete(deleted) is not None
+    reopened = ShardedQuestionStore(directory)
+    assert "added" in reopened and deleted not in reopened
+    assert reopened.read_id_index() is not None
+
+
+def test_missing_or_stale_index_is_rebuilt(tmp_path):
+    directory = make_bank(tmp_path)
+    os.remove(os.path.join(directory, ShardedQuestionStore.ID_INDEX))
+    assert "no such question" not in ShardedQuestionStore(directory)
+    reopened = ShardedQuestionStore(directory)
+    assert reopened.read_id_index() is not None
+    assert all(question_id in reopened for question_id, _ in reopened.entries())
+    manifest_path = os.path.join(directory, ShardedQuestionStore.MANIFEST)
+    manifest = json.load(open(manifest_path, encoding="utf-8"))
+    next(iter(manifest["shards"].values()))["count"] += 1
+    json.dump(manifest, open(manifest_path, "w", encoding="utf-8"))
+    assert ShardedQuestionStore(directory).read_id_index() is None